@@ -1,12 +1,13 @@
-import multiprocessing as mp
 import sys
 import tracemalloc
+from functools import partial
 from pathlib import Path
 
 from tabulate import tabulate
 
 sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
-from lift_utils.demos import lexical_units_from_lift
+from lift_utils.demos import lexical_unit_texts
+from lift_utils.lexicon import Lexicon
 
 
 def main():
@@ -16,10 +17,11 @@ def main():
         "~/lift/Gbanu FLEx LIFT export/FLEx LIFT export.lift",
     ]
     cawls = [f"{n:04d}" for n in range(1, 1701)]  # CAWL numbers, 0001 to 1700
-    with mp.Pool(3) as p:  # use multiprocessing to handle 3 files at once
-        lus_by_lex = p.starmap(
-            lexical_units_from_lift, ((lift, cawls) for lift in lifts)
-        )  # noqa: E501
+    # Handle the 3 files at once in worker processes. Their identical ranges
+    # files are only parsed once, and only the lexical units are sent back.
+    lus_by_lex = Lexicon.load_many(
+        lifts, func=partial(lexical_unit_texts, cawls=cawls), workers=3, lazy=True
+    )
     table = zip(cawls, *lus_by_lex)  # convert "columns" to "rows" for table
     print(tabulate(table))
 
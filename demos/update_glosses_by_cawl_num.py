@@ -14,9 +14,9 @@ def main():
     # Get Sango lexical-unit text from Sango LIFT.
     sango_glosses = {f"{n:04d}": None for n in range(1, 1701)}
     sango_lex = Lexicon(sango_lift)
-    for cawl in sango_glosses.keys():
+    senses_by_cawl = sango_lex.find_many(sango_glosses.keys(), field="CAWL")
+    for cawl, senses in senses_by_cawl.items():
         glosses = []
-        senses = sango_lex.find_all(cawl, field="CAWL", match_type="exact")
         for s in senses:
             entry = s.parent_item
             if not isinstance(entry, lift_utils.lexicon.Entry):
@@ -1,14 +1,192 @@
 """Manipulate base linguistic elements."""
 
+import io
+import mmap
+import pickle
+import re
 import sys
+from collections.abc import MutableSequence
+from operator import attrgetter
+from types import MappingProxyType
 from typing import List, Optional
 
 from lxml import etree
 
 from . import config
 from .datatypes import URL, DateTime, Key, Lang, PCData
-from .errors import RequiredValueError
-from .utils import etree_to_xmlstring
+from .errors import AmbiguousTextError, RequiredValueError
+from .utils import (
+    compression_suffix,
+    etree_to_xmlbytes,
+    etree_to_xmlstring,
+    open_file,
+    write_xml,
+)
+
+# Node classes by name, so that schemas can refer to classes that are defined
+# later in the same module (or to the class being defined).
+NODE_CLASSES = dict()
+# Schemas by (node class, LIFT version).
+_SCHEMAS = dict()
+# Attribute types whose values repeat many times in a lexicon (language codes,
+# field types, trait names and values, etc.). Each lexicon keeps one object
+# per distinct value; IDs are unique, so they are left out.
+INTERNED_CLASSES = (Key, Lang)
+
+
+class NodeSchema:
+    """The XML attributes and elements of a node class for one LIFT version.
+    Schemas are immutable and shared by all nodes of the same class and
+    version.
+
+    :ivar type node_class: The node class.
+    :ivar str version: The LIFT version.
+    :ivar tuple attributes_required: Names of required XML attributes.
+    :ivar tuple attributes_optional: Names of optional XML attributes.
+    :ivar tuple elements_required: Names of required XML elements.
+    :ivar tuple elements_optional: Names of optional XML elements.
+    :ivar MappingProxyType tag_classes: The Python class used for each XML
+        attribute or element name.
+    :ivar MappingProxyType py_names: The Python property name used for each
+        XML attribute or element name.
+    :ivar tuple attributes: ``(xml_name, py_name, py_class)`` for each XML
+        attribute, in declaration order.
+    :ivar tuple elements: ``(xml_name, py_name, py_class)`` for each XML
+        element, in declaration order.
+    :ivar frozenset interned_attributes: Names of the XML attributes whose
+        values are interned; see ``LIFTContext.intern``.
+    :ivar MappingProxyType child_handlers: ``(py_name, py_class, is_list)`` for
+        each XML child element tag; "pcdata" and "tail" are not included.
+    """
+
+    def __init__(self, node_class, version):
+        overrides = dict()
+        if version == config.LIFT_VERSION_FIELDWORKS:
+            overrides = node_class.__dict__.get("_FIELDWORKS_SCHEMA", overrides)
+        self.node_class = node_class
+        self.version = version
+        self.attributes_required = overrides.get(
+            "attributes_required", node_class._ATTRIBUTES_REQUIRED
+        )
+        self.attributes_optional = overrides.get(
+            "attributes_optional", node_class._ATTRIBUTES_OPTIONAL
+        )
+        self.elements_required = overrides.get(
+            "elements_required", node_class._ELEMENTS_REQUIRED
+        )
+        self.elements_optional = overrides.get(
+            "elements_optional", node_class._ELEMENTS_OPTIONAL
+        )
+        # Tag classes are cumulative: a subclass's classes are added to, or
+        # replace, those of its superclasses.
+        tag_classes = dict()
+        for cls in reversed(node_class.__mro__):
+            tag_classes.update(cls.__dict__.get("_TAG_CLASSES", {}))
+        tag_classes.update(overrides.get("tag_classes", {}))
+        for name, py_cls in tag_classes.items():
+            if isinstance(py_cls, str):
+                tag_classes[name] = NODE_CLASSES[py_cls]
+        self.tag_classes = MappingProxyType(tag_classes)
+
+        # Python names are cumulative in the same way as tag classes.
+        name_exceptions = dict()
+        for cls in reversed(node_class.__mro__):
+            name_exceptions.update(cls.__dict__.get("_PY_NAMES", {}))
+        name_exceptions.update(overrides.get("py_names", {}))
+        self._name_exceptions = name_exceptions
+        self._xml_py_names = node_class.XML_PY_NAMES
+
+        attribs = self.attributes_required + self.attributes_optional
+        elems = self.elements_required + self.elements_optional
+        self.py_names = MappingProxyType({n: self.py_name(n) for n in attribs + elems})
+        self.attributes = tuple(
+            (n, self.py_names[n], tag_classes.get(n)) for n in attribs
+        )
+        self.elements = tuple((n, self.py_names[n], tag_classes.get(n)) for n in elems)
+        self.interned_attributes = frozenset(
+            n for n in attribs if tag_classes.get(n) in INTERNED_CLASSES and n != "id"
+        )
+        self.child_handlers = MappingProxyType(
+            {
+                n: (py_name, py_cls, py_name.endswith("_items"))
+                for n, py_name, py_cls in self.elements
+                if n not in ("pcdata", "tail")
+            }
+        )
+
+    def __reduce__(self):
+        # Schemas are shared, so pickled nodes refer to them by class and
+        # version rather than copying them.
+        return (self.node_class._get_schema, (self.version,))
+
+    def py_name(self, xml_name):
+        """Return the Python property name for the given XML attribute or
+        element name."""
+        name = self._name_exceptions.get(xml_name)
+        if name is None:
+            name = self._xml_py_names.get(xml_name, xml_name)
+        return name
+
+
+def build_schemas(versions):
+    """Build the schemas of all node classes for the given LIFT versions."""
+    for node_class in NODE_CLASSES.values():
+        for version in versions:
+            node_class._get_schema(version)
+
+
+class LIFTContext:
+    """Settings shared by all the nodes of one lexicon.
+    Nodes get their context from their parent node, so lexicons of different
+    LIFT versions can be loaded and used side by side, even from different
+    threads. Nodes created without a parent use the context for
+    ``config.LIFT_VERSION``.
+
+    :ivar str version: The LIFT version of the nodes.
+    :ivar bool interning: Whether repeated attribute values are shared; see
+        ``intern``.
+    """
+
+    def __init__(self, version: Optional[str] = None, interning: bool = True):
+        self.version = version
+        self.interning = interning
+        self._interned = dict()
+
+    def get_schema(self, node_class):
+        """Return the schema of the given node class for this context's
+        LIFT version."""
+        return node_class._get_schema(self.version)
+
+    @property
+    def is_fieldworks(self):
+        return self.version == config.LIFT_VERSION_FIELDWORKS
+
+    def intern(self, py_cls, value):
+        """Return ``py_cls(value)``, reusing the object already made for an
+        equal value in this context, if any."""
+        if not self.interning:
+            return py_cls(value)
+        key = (py_cls, value)
+        obj = self._interned.get(key)
+        if obj is None:
+            obj = self._interned.setdefault(key, py_cls(value))
+        return obj
+
+
+# Contexts for nodes created without a parent, by LIFT version.
+_DEFAULT_CONTEXTS = dict()
+
+
+def get_default_context(version=None):
+    """Return the shared context for nodes of the given LIFT version that
+    don't belong to a lexicon. Values aren't interned, since these contexts
+    last as long as the process."""
+    context = _DEFAULT_CONTEXTS.get(version)
+    if context is None:
+        context = _DEFAULT_CONTEXTS.setdefault(
+            version, LIFTContext(version, interning=False)
+        )
+    return context
 
 
 class LIFTUtilsBase:
@@ -17,7 +195,22 @@ class LIFTUtilsBase:
     :ivar etree._Element xml_tree: The node's current data.
     """
 
+    __slots__ = ("_context", "_schema", "parent_item", "xml_tree")
+
     XML_TAG = None
+    # A node's XML attributes and elements are declared once per class; see
+    # ``NodeSchema``. Values of ``_TAG_CLASSES`` can be given by class name
+    # if the class isn't defined yet. Differences for LIFT v0.13 (FieldWorks)
+    # are declared in a ``_FIELDWORKS_SCHEMA`` dict. XML names are converted
+    # to Python names with ``XML_PY_NAMES``, except where a class declares
+    # otherwise in ``_PY_NAMES``.
+    _ATTRIBUTES_REQUIRED = ()
+    _ATTRIBUTES_OPTIONAL = ()
+    _ELEMENTS_REQUIRED = ()
+    _ELEMENTS_OPTIONAL = ()
+    _TAG_CLASSES = {
+        "tail": PCData,
+    }
     XML_PY_NAMES = {
         # keys are LIFT XML tags; values are Python object properties
         "abbrev": "abbrev_items",
@@ -55,24 +248,65 @@ class LIFTUtilsBase:
         "writing-system": "writing_system",
     }
 
-    def __init__(self, parent_item=None, xml_tree: etree._Element = None):
-        # Initialize property values.
-        self._attributes_required = set()
-        self._attributes_optional = set()
-        self._elements_required = set()
-        self._elements_optional = set()
-        # Store a cumulative dict of key="tag name," value="Python class". This
-        # can't be defined declaratively because classes must be defined first,
-        # but this also needs to be referred to before all classes are defined.
-        config.TAG_CLASSES.update({"tail": PCData})
+    def __init__(
+        self,
+        parent_item=None,
+        xml_tree: etree._Element = None,
+        context: Optional[LIFTContext] = None,
+    ):
+        if context is None:
+            if parent_item is not None:
+                context = parent_item._context
+            else:
+                context = get_default_context(config.LIFT_VERSION)
+        self._context = context
+        self._schema = context.get_schema(self.__class__)
         # Link to parent node for tree traversal.
         self.parent_item = parent_item
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        NODE_CLASSES[cls.__name__] = cls
+
+    @property
+    def _attributes_required(self):
+        return self._schema.attributes_required
+
+    @property
+    def _attributes_optional(self):
+        return self._schema.attributes_optional
+
+    @property
+    def _elements_required(self):
+        return self._schema.elements_required
+
+    @property
+    def _elements_optional(self):
+        return self._schema.elements_optional
+
+    @classmethod
+    def _get_schema(cls, version):
+        schema = _SCHEMAS.get((cls, version))
+        if schema is None:
+            schema = NodeSchema(cls, version)
+            _SCHEMAS[(cls, version)] = schema
+        return schema
+
     def print(self, _format="xml"):
-        """Print the node's data to stdout; as XML by default."""
+        """Print the node's data to stdout; as XML by default. The XML is
+        written as UTF-8, one child element at a time; see ``_write_xml``.
+        """
         try:
             if _format == "xml":
-                print(self._to_xml(), flush=True)
+                stdout = getattr(sys.stdout, "buffer", None)
+                if stdout is None:
+                    # E.g. stdout has been replaced by a text stream.
+                    print(self._to_xml(), flush=True)
+                    return
+                sys.stdout.flush()
+                self._write_xml(stdout)
+                stdout.write(b"\n")
+                stdout.flush()
             else:
                 raise NotImplementedError
         except BrokenPipeError:
@@ -81,44 +315,36 @@ class LIFTUtilsBase:
     def prop_name_from_xml_name(self, xml_name):
         """Return the object property name from the given XML attribute or
         element name."""
-
-        name = None
-        exc = {
-            "description": (
-                "FieldDefinition",
-                "Header",
-                "Range",
-                "Range13",
-            ),
-            "form": ("Etymology",),
-            "label": (
-                "FieldDefinition",
-                "URLRef",
-            ),
-        }
-        for x_name, classes in exc.items():
-            if self.__class__.__name__ in classes and xml_name == x_name:
-                # Exceptional situations where "description" is the python attrib
-                # rather than "description_items", so the XML_PY_NAMES conversion
-                # dict should not be used.
-                name = xml_name
+        name = self._schema.py_names.get(xml_name)
         if name is None:
-            name = self.XML_PY_NAMES.get(xml_name, xml_name)
-        if config.LIFT_VERSION == config.LIFT_VERSION_FIELDWORKS:
-            if self.__class__.__name__ == "Field" and name == "name":
-                name = "type"
-        else:
-            if self.__class__.__name__ == "Field" and name == "type":
-                name = "name"
+            name = self._schema.py_name(xml_name)
         return name
 
+    def get_properties(self):
+        """Return a dict of the object's public properties that have been set.
+        Nodes store their properties in ``__slots__``, so this takes the place
+        of ``vars()``.
+        """
+        props = dict()
+        for cls in reversed(self.__class__.__mro__):
+            for name in cls.__dict__.get("__slots__", ()):
+                # A value kept in a private slot behind a property.
+                if isinstance(cls.__dict__.get(name[1:]), property):
+                    name = name[1:]
+                if not name.startswith("_") and hasattr(self, name):
+                    props[name] = getattr(self, name)
+        for name, value in getattr(self, "__dict__", {}).items():
+            if not name.startswith("_"):
+                props[name] = value
+        return props
+
     def show(self):
         """Print an overview of the object in the terminal window."""
-        for k, v in self.__dict__.items():
-            if not k.startswith("_"):
-                print(f"{k}: {v}")
+        for k, v in self.get_properties().items():
+            print(f"{k}: {v}")
 
     def _add_list_item(self, _name, _class, **kwargs):
+        self._set_modified()
         new_obj = _class(parent_item=self, **kwargs)
         if getattr(self, _name) is None:
             setattr(self, _name, [new_obj])
@@ -127,46 +353,57 @@ class LIFTUtilsBase:
         return new_obj
 
     def _from_xml_tree(self, xml_tree):
+        schema = self._schema
         # Convert XML attributes to python properties.
-        attribs = [a for a in self._attributes_required]
-        attribs.extend([a for a in self._attributes_optional])
-        for xml_name in attribs:
-            py_name = self.prop_name_from_xml_name(xml_name)
-            py_cls = config.TAG_CLASSES.get(xml_name)
-            if xml_name in xml_tree.attrib.keys():
-                setattr(
-                    self,
-                    py_name,
-                    py_cls(xml_tree.attrib.get(xml_name)),
-                )
-
-        # Convert properties to XML elements.
-        elems = [e for e in self._elements_required]
-        elems.extend([e for e in self._elements_optional])
-        for xml_name in elems:
-            py_name = self.prop_name_from_xml_name(xml_name)
-            py_cls = config.TAG_CLASSES.get(xml_name)
+        interned = schema.interned_attributes
+        for xml_name, py_name, py_cls in schema.attributes:
+            value = xml_tree.get(xml_name)
+            if value is not None:
+                if xml_name in interned:
+                    setattr(self, py_name, self._context.intern(py_cls, value))
+                else:
+                    setattr(self, py_name, py_cls(value))
+
+        # Convert text and tail to python properties.
+        for xml_name, py_name, py_cls in schema.elements:
             if xml_name == "pcdata":
                 if xml_tree.text:
                     setattr(self, py_name, py_cls(xml_tree.text))
-                continue
             elif xml_name == "tail":
                 if xml_tree.tail:
                     setattr(self, py_name, py_cls(xml_tree.tail))
-                continue
 
-            # Handle child elements.
-            for c in xml_tree.getchildren():
-                if c.tag == xml_name:
-                    if py_name.endswith("_items"):  # list-like obj/elem
-                        if not getattr(self, py_name):
-                            # Instantiate list-like object.
-                            setattr(self, py_name, list())
-                        getattr(self, py_name).append(
-                            py_cls(xml_tree=c, parent_item=self)
-                        )
-                    else:  # single element
-                        setattr(self, py_name, py_cls(xml_tree=c, parent_item=self))
+        # Handle child elements in a single pass, in document order.
+        handlers = schema.child_handlers
+        for c in xml_tree:
+            handler = handlers.get(c.tag)
+            if handler is None:
+                continue
+            py_name, py_cls, is_list = handler
+            if is_list:  # list-like obj/elem
+                items = getattr(self, py_name)
+                if not items:
+                    # Instantiate list-like object.
+                    items = list()
+                    setattr(self, py_name, items)
+                items.append(py_cls(xml_tree=c, parent_item=self))
+            else:  # single element
+                setattr(self, py_name, py_cls(xml_tree=c, parent_item=self))
+
+    def _set_modified(self):
+        """Forget what was kept of the node's entry and lexicon as they were:
+        the XML that the entry was read from, so that the entry is converted
+        to XML again when it's saved, and the lexicon's search index; see
+        ``Lexicon``'s ``keep_xml`` and ``search_index``. The ``add_*`` and
+        ``set_*`` methods call this.
+        """
+        node = self
+        while node is not None:
+            if getattr(node, "_source_xml", None) is not None:
+                node._source_xml = None
+            if getattr(node, "_search_index", None) is not None:
+                node._search_index = None
+            node = node.parent_item
 
     def _to_xml_tree(self, tag=None):
         # TODO: Why isn't self.XML_TAG sufficient in every case here?
@@ -177,45 +414,551 @@ class LIFTUtilsBase:
         xml_tree = etree.Element(xml_tag)
 
         # Convert properties to XML attributes.
-        attribs = [a for a in self._attributes_required]
-        attribs.extend([a for a in self._attributes_optional])
-        for xml_name in attribs:
+        for xml_name, py_name, _ in self._schema.attributes:
             # Get attribute's value from attribute's XML name, which might be
             # different from the Python name.
-            val = getattr(self, self.prop_name_from_xml_name(xml_name))
+            val = getattr(self, py_name)
             if val is not None:
                 xml_tree.set(xml_name, str(val))
 
         # Convert properties to XML elements.
-        elems = [e for e in self._elements_required]
-        elems.extend([e for e in self._elements_optional])
-        for xml_name in elems:
-            py_name = self.prop_name_from_xml_name(xml_name)
+        for xml_name, py_name, _ in self._schema.elements:
             val = getattr(self, py_name)
             if not val:
                 continue
             if hasattr(val, "append"):  # list-like child element
-                for o in getattr(self, py_name):
+                for o in val:
                     xml_tree.append(o._to_xml_tree(tag=xml_name))
             elif py_name == "pcdata":  # special text element
                 xml_tree.text = val
             elif py_name == "tail":  # special tail element
                 xml_tree.tail = val
             else:  # single child element
-                o = getattr(self, py_name)
-                xml_tree.append(o._to_xml_tree(tag=xml_name))
+                xml_tree.append(val._to_xml_tree(tag=xml_name))
         return xml_tree
 
+    def _write_xml(self, f, tag=None):
+        """Write the same XML as ``_to_xml`` to a binary file object, encoded
+        as UTF-8, without building the XML of the whole node: each of the
+        node's child elements is built and written in turn; see
+        ``utils.write_xml``.
+        """
+        for _, py_name, _ in self._schema.elements:
+            if py_name in ("pcdata", "tail") and getattr(self, py_name):
+                # Text can't be written one child element at a time.
+                f.write(etree_to_xmlbytes(self._to_xml_tree(tag=tag)))
+                return
+        attrib = dict()
+        for xml_name, py_name, _ in self._schema.attributes:
+            val = getattr(self, py_name)
+            if val is not None:
+                attrib[xml_name] = str(val)
+        write_xml(f, tag or self.XML_TAG, attrib, self._iter_child_xml_trees())
+
+    def _iter_child_xml_trees(self):
+        """Yield the XML element of each of the node's child elements, in the
+        same order as ``_to_xml_tree``, each built only when it's needed."""
+        for xml_name, py_name, _ in self._schema.elements:
+            val = getattr(self, py_name)
+            if not val:
+                continue
+            if hasattr(val, "append"):  # list-like child element
+                for o in val:
+                    yield o._to_xml_tree(tag=xml_name)
+            else:
+                yield val._to_xml_tree(tag=xml_name)
+
     def _to_xml(self, xml_tree=None):
         if xml_tree is None:
             xml_tree = self._to_xml_tree()
         return etree_to_xmlstring(xml_tree)
 
 
+class NodePickler(pickle.Pickler):
+    """Pickle nodes of one lexicon, e.g. to send them to another process.
+    The lexicon, its context and its interned values are referred to rather
+    than copied; ``NodeUnpickler`` replaces them with those of the lexicon
+    that receives the nodes.
+    """
+
+    def __init__(self, file, root: LIFTUtilsBase):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._root = root
+        self._context = root._context
+
+    def reducer_override(self, obj):
+        # Unlike ``persistent_id``, this isn't called for plain strings,
+        # numbers and containers, which most of a node's values are.
+        if obj is self._root:
+            return (_persistent_load, ("root",))
+        if obj is self._context:
+            return (_persistent_load, ("context",))
+        py_cls = obj.__class__
+        if py_cls in INTERNED_CLASSES:
+            key = (py_cls, obj)
+            if self._context._interned.get(key) is obj:
+                return (_persistent_load, (("interned", py_cls, str(obj)),))
+        return NotImplemented
+
+
+class NodeUnpickler(pickle.Unpickler):
+    """Unpickle nodes pickled by ``NodePickler`` into the given lexicon."""
+
+    def __init__(self, file, root: LIFTUtilsBase):
+        super().__init__(file)
+        self._root = root
+        self._context = root._context
+
+    def find_class(self, module, name):
+        if module == __name__ and name == "_persistent_load":
+            return self.persistent_load
+        return super().find_class(module, name)
+
+    def persistent_load(self, pid):
+        if pid == "root":
+            return self._root
+        if pid == "context":
+            return self._context
+        if pid[0] == "interned":
+            return self._context.intern(pid[1], pid[2])
+        raise pickle.UnpicklingError(f"unsupported persistent id: {pid}")
+
+
+def _persistent_load(pid):
+    """Stand in for ``NodeUnpickler.persistent_load`` in pickles made by
+    ``NodePickler``; other unpicklers can't tell which lexicon to use."""
+    raise pickle.UnpicklingError(f"unpickle {pid!r} with a NodeUnpickler")
+
+
+def dump_nodes(nodes, root: LIFTUtilsBase) -> bytes:
+    """Pickle the given nodes of ``root``; see ``NodePickler``."""
+    f = io.BytesIO()
+    NodePickler(f, root).dump(nodes)
+    return f.getvalue()
+
+
+def dump_each_node(nodes, root: LIFTUtilsBase) -> List[bytes]:
+    """Pickle each of the given nodes of ``root`` on its own, so that each
+    can be unpickled separately by ``load_nodes``; see ``NodePickler``."""
+    f = io.BytesIO()
+    pickler = NodePickler(f, root)
+    data = []
+    for node in nodes:
+        pickler.clear_memo()
+        pickler.dump(node)
+        data.append(f.getvalue())
+        f.seek(0)
+        f.truncate()
+    return data
+
+
+def load_nodes(data: bytes, root: LIFTUtilsBase):
+    """Unpickle nodes pickled by ``dump_nodes`` into ``root``."""
+    return NodeUnpickler(io.BytesIO(data), root).load()
+
+
+class LazyItemList(MutableSequence):
+    """A list of nodes that are built from their XML elements on first access.
+    Once built, each node is cached in place of its XML element, so later
+    access returns the same object.
+
+    :var type item_class: The node class used to build each item.
+    :var list xml_elements: The source ``etree._Element`` for each item.
+    :var Optional[LIFTUtilsBase] parent_item: The parent node of each item.
+    :var Optional[Callable] build: A function that builds an item from its
+        source, if not ``item_class``. The sources can then be other than XML
+        elements, e.g. pickled nodes.
+    """
+
+    def __init__(self, item_class, xml_elements, parent_item=None, build=None):
+        self._item_class = item_class
+        self._items = list(xml_elements)
+        self._parent_item = parent_item
+        self._build = build
+
+    def __delitem__(self, index):
+        del self._items[index]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._get(i) for i in range(*index.indices(len(self._items)))]
+        return self._get(index)
+
+    def __getstate__(self):
+        # XML elements can't be pickled, so unbuilt items are pickled as XML.
+        state = self.__dict__.copy()
+        state["_items"] = list(self._items)
+        state["_xml_indexes"] = []
+        for i, item in enumerate(self._items):
+            if isinstance(item, etree._Element):
+                state["_items"][i] = etree.tostring(item)
+                state["_xml_indexes"].append(i)
+        return state
+
+    def __iter__(self):
+        for i in range(len(self._items)):
+            yield self._get(i)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __setitem__(self, index, value):
+        self._items[index] = value
+
+    def __setstate__(self, state):
+        for i in state.pop("_xml_indexes"):
+            state["_items"][i] = etree.fromstring(state["_items"][i], config.XML_PARSER)
+        self.__dict__.update(state)
+
+    def insert(self, index, value):
+        self._items.insert(index, value)
+
+    def is_built(self, index) -> bool:
+        """Return ``True`` if the item at ``index`` has already been built."""
+        return isinstance(self._items[index], LIFTUtilsBase)
+
+    def iter_raw(self):
+        """Yield each item without building it; i.e. either the item's node
+        object or its source, usually an XML element.
+        """
+        yield from self._items
+
+    def _get(self, index):
+        item = self._items[index]
+        if not isinstance(item, LIFTUtilsBase):
+            if self._build is not None:
+                item = self._build(item)
+            else:
+                item = self._item_class(xml_tree=item, parent_item=self._parent_item)
+            self._items[index] = item
+        return item
+
+
+# The attribute that keeps whitespace, and the characters that libxml2
+# counts as whitespace.
+_XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+_BLANK_CHARS = " \t\n\r"
+# Text that can come from predefined entities, which don't make whitespace
+# significant; see ``_OpenElement``. The last three can also be plain text.
+_ENTITY_CHARS = frozenset("&<>\"'")
+_AMBIGUOUS_CHARS = frozenset(">\"'")
+_NO_ATTRIBUTES = MappingProxyType({})
+# Character references to whitespace are always kept, and character
+# references don't make whitespace significant, but their text can't be told
+# from plain text.
+_AMBIGUOUS_REFS = re.compile(
+    rb"&#(?:0*(?:9|10|13|32)|[xX]0*(?:9|[aAdD]|20));|>(?:&#?\w+;)*&#\w+;"
+)
+
+
+class _OpenElement:
+    """What ``NodeBuilder`` needs to know about an element that is still
+    being parsed to decide, as libxml2 does, whether blank text is kept.
+    Blank text right before markup is removed, unless it's all of the
+    element's content, it follows other text, the element starts with
+    text, or whitespace is significant in the element.
+
+    :ivar Optional[int] space: 1 if whitespace is significant
+        (``xml:space="preserve"``), 0 if not (``xml:space="default"``), -1
+        if not yet, or -2 if it is because the element has had text; None
+        if it's either -1 or -2, since the element's only text might have
+        come from predefined entities.
+    :ivar bool has_children: Whether the element has child elements,
+        comments, or processing instructions so far.
+    :ivar bool has_text: Whether the element has had any text kept so far.
+    :ivar bool first_is_text: Whether the element starts with text.
+    :ivar bool last_is_text: Whether the element's last node is text.
+    """
+
+    __slots__ = ("space", "has_children", "has_text", "first_is_text", "last_is_text")
+
+    def __init__(self, space):
+        self.space = space
+        self.has_children = False
+        self.has_text = False
+        self.first_is_text = False
+        self.last_is_text = False
+
+
+class _StartTag:
+    """The parts of an XML element that are known from its start tag, for
+    ``LIFTUtilsBase._from_xml_tree``; its text and children come later."""
+
+    __slots__ = ("get",)
+    text = None
+    tail = None
+
+    def __init__(self, attrib):
+        self.get = attrib.get
+
+    def __iter__(self):
+        return iter(())
+
+
+class NodeBuilder:
+    """An lxml parser target that builds nodes directly from the parser's
+    events, without building an XML tree of the whole document first.
+    The nodes are the same as those built by ``_from_xml_tree`` from a tree
+    parsed with ``config.XML_PARSER``, so blank text is removed as libxml2
+    does for ``remove_blank_text``, which doesn't apply to parser targets.
+    If the events don't tell whether some blank text would be removed,
+    ``AmbiguousTextError`` is raised. The elements of nodes whose class
+    overrides ``_from_xml_tree`` are collected into an XML tree, and the
+    node is built from that.
+
+    :var LIFTUtilsBase root: The node of the document's root element; its
+        attributes and children are set as the document is parsed.
+    """
+
+    def __init__(self, root: LIFTUtilsBase):
+        self.root = root
+        self._elements = []
+        # The node of each open element, or None if it isn't part of a node.
+        self._nodes = []
+        # The text since the last start, end, comment, or processing
+        # instruction, as given by the parser.
+        self._chunks = []
+        # The last node whose element ended, until its tail is known.
+        self._tail_node = None
+        # The open element of a node that is built from an XML tree.
+        self._tree = None
+        self._tree_depth = 0
+
+    @staticmethod
+    def can_build(filepath) -> bool:
+        """Return ``False`` if the given XML file has text that this builder
+        can't tell from the parser's events: CDATA sections and some
+        character references. Other text is checked while parsing.
+        """
+        if compression_suffix(filepath):
+            return NodeBuilder._can_build_stream(filepath)
+        with open(filepath, "rb") as f:
+            try:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # The file is empty.
+                return True
+        with data:
+            return NodeBuilder._can_build_data(data)
+
+    def close(self):
+        return self.root
+
+    def comment(self, text):
+        if self._elements:
+            self._add_child()
+            if self._tree is not None:
+                self._tree.comment(text)
+
+    def data(self, data):
+        self._chunks.append(data)
+
+    def end(self, tag):
+        if self._chunks:
+            self._flush_text(closing=True)
+        self._elements.pop()
+        if self._tree is not None:
+            self._tree.end(tag)
+            self._tree_depth -= 1
+            if self._tree_depth:
+                return
+            xml_tree = self._tree.close()
+            self._tree = None
+            parent = self._nodes[-1]
+            py_cls = parent._schema.child_handlers[tag][1]
+            node = py_cls(xml_tree=xml_tree, parent_item=parent)
+        else:
+            node = self._nodes.pop()
+            if node is None or not self._nodes:
+                self._tail_node = None
+                return
+            parent = self._nodes[-1]
+        py_name, _, is_list = parent._schema.child_handlers[tag]
+        if is_list:
+            items = getattr(parent, py_name)
+            if not items:
+                items = list()
+                setattr(parent, py_name, items)
+            items.append(node)
+        else:
+            setattr(parent, py_name, node)
+        self._tail_node = node
+
+    def pi(self, target, data=None):
+        if self._elements:
+            self._add_child()
+            if self._tree is not None:
+                self._tree.pi(target, data)
+
+    def start(self, tag, attrib):
+        if self._elements:
+            space = self._add_child().space
+            if space is None or space == -2:
+                space = -1
+        else:
+            space = -1
+        if attrib:
+            xml_space = attrib.get(_XML_SPACE)
+            if xml_space == "preserve":
+                space = 1
+            elif xml_space == "default":
+                space = 0
+        else:
+            attrib = _NO_ATTRIBUTES
+        self._elements.append(_OpenElement(space))
+
+        if self._tree is not None:
+            self._tree.start(tag, attrib)
+            self._tree_depth += 1
+            return
+        if not self._nodes:
+            # Only the root's attributes; its children are built from the
+            # events that follow.
+            LIFTUtilsBase._from_xml_tree(self.root, _StartTag(attrib))
+            self._nodes.append(self.root)
+            return
+        parent = self._nodes[-1]
+        handler = None
+        if parent is not None:
+            handler = parent._schema.child_handlers.get(tag)
+        if handler is None:
+            self._nodes.append(None)
+            return
+        py_cls = handler[1]
+        if py_cls._from_xml_tree is not LIFTUtilsBase._from_xml_tree:
+            self._tree = etree.TreeBuilder()
+            self._tree.start(tag, attrib)
+            self._tree_depth = 1
+            return
+        self._nodes.append(py_cls(xml_tree=_StartTag(attrib), parent_item=parent))
+
+    def _add_child(self):
+        """Update the open element for a new child, and return it."""
+        if self._chunks:
+            self._flush_text()
+        else:
+            self._tail_node = None
+        element = self._elements[-1]
+        element.has_children = True
+        element.last_is_text = False
+        return element
+
+    @staticmethod
+    def _can_build_data(data):
+        if data.find(b"<![CDATA[") != -1:
+            return False
+        return data.find(b"&#") == -1 or not _AMBIGUOUS_REFS.search(data)
+
+    @staticmethod
+    def _can_build_stream(filepath):
+        """Check a compressed file as it is decompressed, in blocks. Each
+        block ends before a "<", since neither pattern can span one, except
+        at its start."""
+        rest = b""
+        with open_file(filepath) as f:
+            while True:
+                block = f.read(1 << 20)
+                if not block:
+                    return NodeBuilder._can_build_data(rest)
+                data = rest + block
+                end = data.rfind(b"<")
+                if end == -1:
+                    rest = data
+                    continue
+                if not NodeBuilder._can_build_data(data[:end]):
+                    return False
+                rest = data[end:]
+
+    def _flush_text(self, closing=False):
+        """Pass on the text since the last event, either to the open
+        element's text or to the tail of its last child."""
+        tail_node = self._tail_node
+        self._tail_node = None
+        element = self._elements[-1]
+        chunks = self._chunks
+        last = len(chunks) - 1
+        kept = []
+        for i, chunk in enumerate(chunks):
+            # Blank text is only removed right before markup, or before a
+            # line break that was "\r\n".
+            if (
+                (i == last or chunks[i + 1][0] == "\n")
+                and element.space != 1
+                and element.space != -2
+                and not chunk.strip(_BLANK_CHARS)
+            ):
+                if element.has_children or element.has_text:
+                    keep = element.last_is_text or element.first_is_text
+                else:
+                    keep = closing and i == last
+                if not keep:
+                    if element.space is None:
+                        raise AmbiguousTextError(chunk)
+                    continue
+            if element.space == -1:
+                if chunk in _AMBIGUOUS_CHARS:
+                    element.space = None
+                elif chunk not in _ENTITY_CHARS:
+                    element.space = -2
+            elif element.space is None and chunk not in _ENTITY_CHARS:
+                element.space = -2
+            if not (element.has_children or element.has_text):
+                element.first_is_text = True
+            element.has_text = True
+            element.last_is_text = True
+            kept.append(chunk)
+        chunks.clear()
+        if not kept:
+            return
+        text = "".join(kept)
+        if self._tree is not None:
+            self._tree.data(text)
+            return
+        if element.has_children:
+            node = tail_node
+            xml_name = "tail"
+        else:
+            node = self._nodes[-1]
+            xml_name = "pcdata"
+        if node is None:
+            return
+        for name, py_name, py_cls in node._schema.elements:
+            if name == xml_name:
+                setattr(node, py_name, py_cls(text))
+                break
+
+
+def _modifying_property(slot):
+    """Return a property that stores a node's value in the given slot, and
+    that calls ``_set_modified`` when a value that is already set is
+    replaced, e.g. a form's text; see ``Lexicon``'s ``search_index``. Setting
+    the value for the first time, as the node is built, doesn't.
+    """
+
+    def set_value(node, value):
+        if getattr(node, slot, None) is not None:
+            node._set_modified()
+        setattr(node, slot, value)
+
+    return property(attrgetter(slot), set_value)
+
+
 class Span(LIFTUtilsBase):
     """A Unicode string marked with language and formatting information."""
 
     XML_TAG = "span"
+    __slots__ = ("lang", "href", "class_", "pcdata", "tail", "span_items")
+    _ATTRIBUTES_REQUIRED = ()
+    _ATTRIBUTES_OPTIONAL = ("class", "href", "lang")
+    _ELEMENTS_REQUIRED = ("pcdata",)
+    _ELEMENTS_OPTIONAL = ("span", "tail")
+    _TAG_CLASSES = {
+        "lang": Lang,
+        "href": URL,
+        "class": str,
+        "pcdata": PCData,
+        "span": "Span",
+    }
 
     def __init__(
         self,
@@ -228,19 +971,6 @@ class Span(LIFTUtilsBase):
         **kwargs,
     ):
         super().__init__(**kwargs)
-        self._attributes_required = set()
-        self._attributes_optional = set(("class", "href", "lang"))
-        self._elements_required = set(("pcdata",))
-        self._elements_optional = set(("span", "tail"))
-        config.TAG_CLASSES.update(
-            {
-                "lang": Lang,
-                "href": URL,
-                "class": str,
-                "pcdata": PCData,
-                "span": Span,
-            }
-        )
 
         # attributes
         self.lang: Optional[Lang] = None
@@ -283,6 +1013,17 @@ class Trait(LIFTUtilsBase):
     """
 
     XML_TAG = "trait"
+    __slots__ = ("name", "value", "id", "annotation_items")
+    _ATTRIBUTES_REQUIRED = ("name", "value")
+    _ATTRIBUTES_OPTIONAL = ("id",)
+    _ELEMENTS_REQUIRED = ()
+    _ELEMENTS_OPTIONAL = ("annotation",)
+    _TAG_CLASSES = {
+        "name": Key,
+        "value": Key,
+        "id": Key,
+        "annotation": "Annotation",
+    }
 
     def __init__(
         self,
@@ -293,18 +1034,6 @@ class Trait(LIFTUtilsBase):
         **kwargs,
     ):
         super().__init__(**kwargs)
-        self._attributes_required = set(("name", "value"))
-        self._attributes_optional = set(("id",))
-        self._elements_required = set()
-        self._elements_optional = set(("annotation",))
-        config.TAG_CLASSES.update(
-            {
-                "name": Key,
-                "value": Key,
-                "id": Key,
-                "annotation": Annotation,
-            }
-        )
 
         # attributes
         self.name: Key = None
@@ -335,6 +1064,8 @@ class Flag(Trait):
         not defined; assumed to be equivalent to ``Trait``.
     """
 
+    __slots__ = ()
+
     def __init__(self, xml_tree: Optional[etree._Element] = None, **kwargs):
         super().__init__(**kwargs)
 
@@ -343,6 +1074,15 @@ class Text(LIFTUtilsBase):
     """Contains textual data mixed with ``span`` elements only."""
 
     XML_TAG = "text"
+    __slots__ = ("_pcdata", "span_items")
+    _ATTRIBUTES_REQUIRED = ()
+    _ATTRIBUTES_OPTIONAL = ()
+    _ELEMENTS_REQUIRED = ("pcdata",)
+    _ELEMENTS_OPTIONAL = ("span",)
+    _TAG_CLASSES = {
+        "pcdata": PCData,
+        "span": Span,
+    }
 
     def __init__(
         self,
@@ -352,16 +1092,6 @@ class Text(LIFTUtilsBase):
         **kwargs,
     ):
         super().__init__(**kwargs)
-        self._attributes_required = set()
-        self._attributes_optional = set()
-        self._elements_required = set(("pcdata",))
-        self._elements_optional = set(("span",))
-        config.TAG_CLASSES.update(
-            {
-                "pcdata": PCData,
-                "span": Span,
-            }
-        )
 
         # elements
         self.pcdata: PCData = None
@@ -376,6 +1106,8 @@ class Text(LIFTUtilsBase):
         else:
             raise RequiredValueError(("text",))
 
+    pcdata = _modifying_property("_pcdata")
+
     def __str__(self):
         if self.span_items:
             s = f"{str(self.pcdata)}{''.join(str(s) for s in self.span_items)}"
@@ -390,6 +1122,16 @@ class Form(LIFTUtilsBase):
     """
 
     XML_TAG = "form"
+    __slots__ = ("lang", "_text", "annotation_items")
+    _ATTRIBUTES_REQUIRED = ("lang",)
+    _ATTRIBUTES_OPTIONAL = ()
+    _ELEMENTS_REQUIRED = ("text",)
+    _ELEMENTS_OPTIONAL = ("annotation",)
+    _TAG_CLASSES = {
+        "lang": Lang,
+        "text": Text,
+        "annotation": "Annotation",
+    }
 
     def __init__(
         self,
@@ -399,17 +1141,6 @@ class Form(LIFTUtilsBase):
         **kwargs,
     ):
         super().__init__(**kwargs)
-        self._attributes_required = set(("lang",))
-        self._attributes_optional = set()
-        self._elements_required = set(("text",))
-        self._elements_optional = set(("annotation",))
-        config.TAG_CLASSES.update(
-            {
-                "lang": Lang,
-                "text": Text,
-                "annotation": Annotation,
-            }
-        )
 
         # attributes
         self.lang: Lang = None
@@ -423,10 +1154,12 @@ class Form(LIFTUtilsBase):
             self._from_xml_tree(xml_tree)
         elif lang is not None and text is not None:
             self.lang = Lang(lang)
-            self.text = Text(text=text)
+            self.text = Text(text=text, parent_item=self)
         else:
             raise RequiredValueError(("lang", "text"))
 
+    text = _modifying_property("_text")
+
     def __str__(self):
         return str(self.text)
 
@@ -435,6 +1168,18 @@ class URLRef(LIFTUtilsBase):
     """This is a URL with a caption."""
 
     XML_TAG = "urlref"
+    __slots__ = ("href", "label")
+    _ATTRIBUTES_REQUIRED = ("href",)
+    _ATTRIBUTES_OPTIONAL = ()
+    _ELEMENTS_REQUIRED = ()
+    _ELEMENTS_OPTIONAL = ("label",)
+    _TAG_CLASSES = {
+        "href": URL,
+        "label": "Multitext",
+    }
+    _PY_NAMES = {
+        "label": "label",
+    }
 
     def __init__(
         self,
@@ -444,16 +1189,6 @@ class URLRef(LIFTUtilsBase):
         **kwargs,
     ):
         super().__init__(**kwargs)
-        self._attributes_required = set(("href",))
-        self._attributes_optional = set()
-        self._elements_required = set()
-        self._elements_optional = set(("label",))
-        config.TAG_CLASSES.update(
-            {
-                "href": URL,
-                "label": Multitext,
-            }
-        )
 
         # attributes
         self.href: URL = None
@@ -474,7 +1209,8 @@ class URLRef(LIFTUtilsBase):
     def set_label(self, label_dict):
         if not isinstance(label_dict, dict):
             raise RequiredValueError(("dict of {{lang: text}} pairs",))
-        self.label = Multitext(label_dict)
+        self._set_modified()
+        self.label = Multitext(label_dict, parent_item=self)
 
     def __str__(self):
         return str(self.href)
@@ -488,6 +1224,15 @@ class Multitext(Text):
     # Multitext is only used as a super class for other classes, so it
     # doesn't have it's own XML tag.
     XML_TAG = None
+    __slots__ = ("form_items", "trait_items")
+    _ATTRIBUTES_REQUIRED = ()
+    _ATTRIBUTES_OPTIONAL = ()
+    _ELEMENTS_REQUIRED = ()
+    _ELEMENTS_OPTIONAL = ("form", "pcdata", "span", "trait")
+    _TAG_CLASSES = {
+        "form": Form,
+        "trait": Trait,
+    }
 
     def __init__(
         self,
@@ -500,16 +1245,6 @@ class Multitext(Text):
             xml_tree=False,
             **kwargs,
         )
-        self._attributes_required = set()
-        self._attributes_optional = set()
-        self._elements_required = set()
-        self._elements_optional = set(("form", "pcdata", "span", "trait"))
-        config.TAG_CLASSES.update(
-            {
-                "form": Form,
-                "trait": Trait,
-            }
-        )
 
         # elements
         self.form_items: Optional[List[Form]] = None
@@ -542,9 +1277,10 @@ class Multitext(Text):
                 return f
 
     def set_form_items(self, form_dict):
+        self._set_modified()
         self.form_items = []
         for lg, tx in form_dict.items():
-            self.form_items.append(Form(lang=lg, text=tx))
+            self.form_items.append(Form(lang=lg, text=tx, parent_item=self))
 
 
 class Gloss(Form):
@@ -554,6 +1290,14 @@ class Gloss(Form):
     """
 
     XML_TAG = "gloss"
+    __slots__ = ("trait_items",)
+    _ATTRIBUTES_REQUIRED = ("lang",)
+    _ATTRIBUTES_OPTIONAL = ()
+    _ELEMENTS_REQUIRED = ("text",)
+    _ELEMENTS_OPTIONAL = ("annotation", "trait")
+    _TAG_CLASSES = {
+        "trait": Trait,
+    }
 
     def __init__(
         self,
@@ -563,15 +1307,6 @@ class Gloss(Form):
         **kwargs,
     ):
         super().__init__(xml_tree=False, **kwargs)
-        self._attributes_required = set(("lang",))
-        self._attributes_optional = set()
-        self._elements_required = set(("text",))
-        self._elements_optional = set(("annotation", "trait"))
-        config.TAG_CLASSES.update(
-            {
-                "trait": Trait,
-            }
-        )
 
         # elements
         self.trait_items: Optional[List[Trait]] = None
@@ -580,7 +1315,7 @@ class Gloss(Form):
             self._from_xml_tree(xml_tree)
         elif lang is not None and text is not None:
             self.lang = Lang(lang)
-            self.text = Text(text=text)
+            self.text = Text(text=text, parent_item=self)
         else:
             raise RequiredValueError(("lang", "text"))
 
@@ -588,17 +1323,31 @@ class Gloss(Form):
         return f"{self.text} ({self.lang})"
 
     def set_trait_items(self, trait_dict):
+        self._set_modified()
         self.trait_items = []
         for name, data in trait_dict.items():
             value = data.get("value")
             trait_id = data.get("trait_id")
-            self.trait_items.append(Trait(name=name, value=value, trait_id=trait_id))
+            self.trait_items.append(
+                Trait(name=name, value=value, trait_id=trait_id, parent_item=self)
+            )
 
 
 class Annotation(Multitext):
     """Provides a mechanism for adding meta-information to almost any element."""
 
     XML_TAG = "annotation"
+    __slots__ = ("name", "value", "who", "when")
+    _ATTRIBUTES_REQUIRED = ("name", "value")
+    _ATTRIBUTES_OPTIONAL = ("when", "who")
+    _ELEMENTS_REQUIRED = ()
+    _ELEMENTS_OPTIONAL = ("form", "pcdata", "span", "trait")
+    _TAG_CLASSES = {
+        "name": Key,
+        "value": Key,
+        "who": Key,
+        "when": DateTime,
+    }
 
     def __init__(
         self,
@@ -610,18 +1359,6 @@ class Annotation(Multitext):
         **kwargs,
     ):
         super().__init__(**kwargs)
-        self._attributes_required = set(("name", "value"))
-        self._attributes_optional = set(("when", "who"))
-        self._elements_required = set()
-        self._elements_optional = set(("form", "pcdata", "span", "trait"))
-        config.TAG_CLASSES.update(
-            {
-                "name": Key,
-                "value": Key,
-                "who": Key,
-                "when": DateTime,
-            }
-        )
 
         # attributes
         self.name: Key = None
@@ -649,6 +1386,27 @@ class Field(Multitext):
     """
 
     XML_TAG = "field"
+    __slots__ = ("name", "type", "date_created", "date_modified", "annotation_items")
+    _ATTRIBUTES_REQUIRED = ("name",)
+    _ATTRIBUTES_OPTIONAL = ("dateCreated", "dateModified")
+    _ELEMENTS_REQUIRED = ()
+    _ELEMENTS_OPTIONAL = ("annotation", "form", "pcdata", "span", "trait")
+    _TAG_CLASSES = {
+        "type": Key,
+        "name": Key,
+        "dateCreated": DateTime,
+        "dateModified": DateTime,
+        "annotation": Annotation,
+        "trait": Trait,
+    }
+    # The "name" attribute is called "type" in LIFT v0.13 (FieldWorks).
+    _PY_NAMES = {
+        "type": "name",
+    }
+    _FIELDWORKS_SCHEMA = {
+        "attributes_required": ("type",),
+        "py_names": {"name": "type", "type": "type"},
+    }
 
     def __init__(
         self,
@@ -658,32 +1416,16 @@ class Field(Multitext):
         **kwargs,
     ):
         super().__init__(**kwargs)
-        self._attributes_required = set(("name",))
-        if config.LIFT_VERSION == config.LIFT_VERSION_FIELDWORKS:
-            self._attributes_required = set(("type",))
-        self._attributes_optional = set(("dateCreated", "dateModified"))
-        self._elements_required = set()
-        self._elements_optional = set(("annotation", "form", "pcdata", "span", "trait"))
-        config.TAG_CLASSES.update(
-            {
-                "type": Key,
-                "name": Key,
-                "dateCreated": DateTime,
-                "dateModified": DateTime,
-                "annotation": Annotation,
-                "trait": Trait,
-            }
-        )
 
         # attributes
-        if config.LIFT_VERSION == config.LIFT_VERSION_FIELDWORKS:
+        if self._context.is_fieldworks:
             self.type: Key = None
         else:
             self.name: Key = None
         self.date_created: Optional[DateTime] = None
         self.date_modified: Optional[DateTime] = None
         # elements
-        if config.LIFT_VERSION == config.LIFT_VERSION_FIELDWORKS:
+        if self._context.is_fieldworks:
             # self.trait_items: Optional[List[Flag]] = None
             self.trait_items: Optional[List[Trait]] = None
             # NOTE: I think there must be a typo in the docs. I think the
@@ -698,7 +1440,7 @@ class Field(Multitext):
             self._from_xml_tree(xml_tree)
 
         missing_required_attrib = None
-        if config.LIFT_VERSION == config.LIFT_VERSION_FIELDWORKS:
+        if self._context.is_fieldworks:
             if field_type is not None:
                 self.type = Key(field_type)
             elif xml_tree is None:
@@ -713,46 +1455,38 @@ class Field(Multitext):
             raise RequiredValueError((missing_required_attrib,))
 
 
-class Extensible(LIFTUtilsBase):
-    """Used to provide certain extra information in a controlled way.
-
-    :ivar Optional[DateTime] date_created: Contains a date/timestamp saying
-        when the element was added to the dictionary.
-    :ivar Optional[DateTime] date_modified: Contains a date/timestamp saying
-        when the element was last changed.
-    :ivar Optional[List[Field]] field_items: Holds extra textual information.
-    :ivar Optional[List[Trait]] trait_items: Adds type or constraint
-        information.
-    :ivar Optional[List[Annotation]] annotation: Adds meta-information
-        describing the element.
+class ExtensibleMixin(LIFTUtilsBase):
+    """The properties and methods of ``Extensible``, without its slots.
+    Classes that are also ``Multitext`` use this instead of ``Extensible``
+    and declare the slots themselves, because a class can't have two bases
+    that both add slots.
     """
 
     # Extensible is only used as a super class for other classes, so it
     # doesn't need its own XML tag.
     XML_TAG = None
+    __slots__ = ()
+    _ATTRIBUTES_REQUIRED = ()
+    _ATTRIBUTES_OPTIONAL = ("dateCreated", "dateModified")
+    _ELEMENTS_REQUIRED = ()
+    _ELEMENTS_OPTIONAL = ("annotation", "field", "trait")
+    _TAG_CLASSES = {
+        "dateCreated": DateTime,
+        "dateModified": DateTime,
+        "field": Field,
+        "trait": Trait,
+        "annotation": Annotation,
+    }
 
     def __init__(self, xml_tree: Optional[etree._Element] = None, **kwargs):
         super().__init__(**kwargs)
-        self._attributes_required = set()
-        self._attributes_optional = set(("dateCreated", "dateModified"))
-        self._elements_required = set()
-        self._elements_optional = set(("annotation", "field", "trait"))
-        config.TAG_CLASSES.update(
-            {
-                "dateCreated": DateTime,
-                "dateModified": DateTime,
-                "field": Field,
-                "trait": Trait,
-                "annotation": Annotation,
-            }
-        )
 
         # attributes
         self.date_created: Optional[DateTime] = None
         self.date_modified: Optional[DateTime] = None
         # elements
         self.field_items: Optional[List[Field]] = None
-        if config.LIFT_VERSION == config.LIFT_VERSION_FIELDWORKS:
+        if self._context.is_fieldworks:
             # TODO: Find definition of "Flag" in v0.13?
             # self.trait_items: Optional[List[Flag]] = None
             self.trait_items: Optional[List[Trait]] = None
@@ -774,7 +1508,7 @@ class Extensible(LIFTUtilsBase):
         )
 
     def add_field(self, name=None):
-        if config.LIFT_VERSION == config.LIFT_VERSION_FIELDWORKS:
+        if self._context.is_fieldworks:
             kwargs = {"field_type": name}
         else:
             kwargs = {"name": name}
@@ -790,7 +1524,32 @@ class Extensible(LIFTUtilsBase):
         )
 
     def set_date_created(self):
+        self._set_modified()
         self.date_created = DateTime()
 
     def set_date_modified(self):
+        self._set_modified()
         self.date_modified = DateTime()
+
+
+class Extensible(ExtensibleMixin):
+    """Used to provide certain extra information in a controlled way.
+
+    :ivar Optional[DateTime] date_created: Contains a date/timestamp saying
+        when the element was added to the dictionary.
+    :ivar Optional[DateTime] date_modified: Contains a date/timestamp saying
+        when the element was last changed.
+    :ivar Optional[List[Field]] field_items: Holds extra textual information.
+    :ivar Optional[List[Trait]] trait_items: Adds type or constraint
+        information.
+    :ivar Optional[List[Annotation]] annotation: Adds meta-information
+        describing the element.
+    """
+
+    __slots__ = (
+        "date_created",
+        "date_modified",
+        "field_items",
+        "trait_items",
+        "annotation_items",
+    )
@@ -8,6 +8,10 @@ LIFT_VERSION_LATEST = "0.15"
 LIFT_VERSION_DEFAULT = LIFT_VERSION_FIELDWORKS
 LIFT_VERSION = None
 
-TAG_CLASSES = dict()
-
 XML_PARSER = etree.XMLParser(remove_blank_text=True)
+
+# The XML of external LIFT-RANGES files is kept for the life of the process,
+# by file content, so that lexicons that use the same ranges don't parse them
+# again. Only the current content of each file is kept. Each lexicon builds
+# its own ranges from the XML on first access.
+RANGES_CACHE = True
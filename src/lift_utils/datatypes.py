@@ -6,6 +6,8 @@ from .utils import get_current_timestamp
 
 
 class PCData(str):
+    __slots__ = ()
+
     def __new__(cls, text=None):
         if text is not None:
             return super().__new__(cls, text)
@@ -14,6 +16,8 @@ class PCData(str):
 class DateTime(str):
     # format (str): YYYY-MM-DDTHH:MM:SSZZZZZZ
     # ZZZZZZ: +/-, H, H, :, M, M (offset from GMT)
+    __slots__ = ()
+
     def __new__(cls, text=None):
         if text is not None:
             return super().__new__(cls, text)
@@ -22,6 +26,8 @@ class DateTime(str):
 
 
 class Key(str):
+    __slots__ = ()
+
     def __new__(cls, text=None):
         if text is not None:
             return super().__new__(cls, text)
@@ -29,6 +35,8 @@ class Key(str):
 
 class Lang(str):
     # format (str): ISO[-SCRIPT[-x-PRIVATE]]
+    __slots__ = ()
+
     def __new__(cls, text=None):
         if text is not None:
             return super().__new__(cls, text)
@@ -36,6 +44,8 @@ class Lang(str):
 
 class RefId(str):
     # format (HEX GUID): xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx
+    __slots__ = ()
+
     def __new__(cls, text=None):
         if text is not None:
             return super().__new__(cls, text)
@@ -44,6 +54,8 @@ class RefId(str):
 
 
 class URL(str):
+    __slots__ = ()
+
     def __new__(cls, text=None):
         if text is not None:
             return super().__new__(cls, text)
@@ -1,17 +1,58 @@
 """Functions needed to run demo scripts."""
 
 from .lexicon import Lexicon
+from .utils import form_text
 
 
 def lexical_units_from_lift(lift, cawls):
-    lex = Lexicon(lift)
-    lexical_units = []
-    for cawl in cawls:
-        lexical_unit = None
-        item = lex.find(cawl, field="CAWL", match_type="exact")
-        if item and item.id:
-            parent = item.parent_item
-            if parent:
-                lexical_unit = parent.lexical_unit
-        lexical_units.append(lexical_unit)
-    return lexical_units
+    # Entries are streamed from the file, so only the entry currently being
+    # searched is held in memory.
+    return _find_lexical_units(Lexicon.iter_entries(lift), cawls)
+
+
+def lexical_unit_texts(lexicon, cawls):
+    # Return text rather than nodes, which would bring their whole lexicon
+    # with them when sent back from a worker process.
+    lexical_units = _find_lexical_units(lexicon.entry_items or (), cawls)
+    return [str(lu) if lu is not None else None for lu in lexical_units]
+
+
+def _find_lexical_units(entries, cawls):
+    found = dict()
+    pending = set(cawls)
+    for entry in entries:
+        if not pending:
+            break
+        # Look up the entry's own CAWL values, rather than searching the entry
+        # for each pending CAWL.
+        for item, cawl in _iter_cawls(entry):
+            if cawl not in pending:
+                continue
+            pending.discard(cawl)
+            lexical_unit = None
+            if item.id:
+                parent = item.parent_item
+                if parent:
+                    lexical_unit = parent.lexical_unit
+            found[cawl] = lexical_unit
+    return [found.get(cawl) for cawl in cawls]
+
+
+def _iter_cawls(entry):
+    # Yield each CAWL value of the entry's senses and subsenses, then of the
+    # entry itself, with the item that has it, in the order in which
+    # ``Lexicon.find`` searches them.
+    if not entry.sense_items:
+        return
+    for sense in entry.sense_items:
+        yield from _iter_item_cawls(sense)
+        for subsense in sense.subsense_items or ():
+            yield from _iter_item_cawls(subsense)
+    yield from _iter_item_cawls(entry)
+
+
+def _iter_item_cawls(item):
+    for field_item in item.field_items or ():
+        if field_item.type == "CAWL":
+            for form in field_item.form_items or ():
+                yield item, form_text(form)
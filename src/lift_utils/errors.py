@@ -1,9 +1,21 @@
+class AmbiguousTextError(Exception):
+    def __init__(self, text):
+        message = f"Can't tell from parser events whether text is kept: {text!r}"
+        super().__init__(message)
+
+
 class InvalidExtensionError(Exception):
     def __init__(self, filename):
         message = f"File has an invalid extension: {filename}"
         super().__init__(message)
 
 
+class InvalidSnapshotError(Exception):
+    def __init__(self, filename):
+        message = f"File is not a usable LIFT-Utils snapshot: {filename}"
+        super().__init__(message)
+
+
 class RequiredValueError(Exception):
     def __init__(self, values):
         message = f"Required value(s) missing: {', '.join(values)}"
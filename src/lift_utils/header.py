@@ -1,11 +1,10 @@
 """Manipulate the header section."""
 
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
 from lxml import etree
 
-from . import config
-from .base import Extensible, LIFTUtilsBase, Multitext
+from .base import Extensible, LazyItemList, LIFTUtilsBase, Multitext
 from .datatypes import URL, Key
 
 
@@ -18,20 +17,19 @@ class FieldDefn(Multitext):
     """
 
     XML_TAG = "field"
+    __slots__ = ("tag",)
+    _ATTRIBUTES_REQUIRED = ("tag",)
+    _ATTRIBUTES_OPTIONAL = ()
+    _ELEMENTS_REQUIRED = ()
+    _ELEMENTS_OPTIONAL = ("form", "pcdata", "span", "trait")
+    _TAG_CLASSES = {
+        "tag": Key,
+    }
 
     def __init__(
         self, tag: Key = None, xml_tree: Optional[etree._Element] = None, **kwargs
     ):
         super().__init__(**kwargs)
-        self._attributes_required = set(("tag",))
-        self._attributes_optional = set()
-        self._elements_required = set()
-        self._elements_optional = set(("form", "pcdata", "span", "trait"))
-        config.TAG_CLASSES.update(
-            {
-                "tag": Key,
-            }
-        )
 
         # attributes
         self.tag = tag
@@ -51,26 +49,35 @@ class FieldDefinition(LIFTUtilsBase):
     """
 
     XML_TAG = "field"
+    __slots__ = (
+        "name",
+        "class_",
+        "type",
+        "option_range",
+        "writing_system",
+        "label",
+        "description",
+    )
+    _ATTRIBUTES_REQUIRED = ("name",)
+    _ATTRIBUTES_OPTIONAL = ("class", "option-range", "type", "writing-system")
+    _ELEMENTS_REQUIRED = ()
+    _ELEMENTS_OPTIONAL = ("label", "description")
+    _TAG_CLASSES = {
+        "name": Key,
+        "class": str,
+        "option-range": Key,
+        "type": str,
+        "writing-system": str,
+        "label": Multitext,
+        "description": Multitext,
+    }
+    _PY_NAMES = {
+        "description": "description",
+        "label": "label",
+    }
 
     def __init__(self, xml_tree: Optional[etree._Element] = None, **kwargs):
         super().__init__(**kwargs)
-        self._attributes_required = set(("name",))
-        self._attributes_optional = set(
-            ("class", "option-range", "type", "writing-system")
-        )
-        self._elements_required = set()
-        self._elements_optional = set(("label", "description"))
-        config.TAG_CLASSES.update(
-            {
-                "name": Key,
-                "class": str,
-                "option-range": Key,
-                "type": str,
-                "writing-system": str,
-                "label": Multitext,
-                "description": Multitext,
-            }
-        )
 
         # attributes
         self.name: Key = None
@@ -96,18 +103,17 @@ class FieldDefns(LIFTUtilsBase):
     """
 
     XML_TAG = "fields"
+    __slots__ = ("field_items",)
+    _ATTRIBUTES_REQUIRED = ()
+    _ATTRIBUTES_OPTIONAL = ()
+    _ELEMENTS_REQUIRED = ()
+    _ELEMENTS_OPTIONAL = ("field",)
+    _TAG_CLASSES = {
+        "field": FieldDefn,
+    }
 
     def __init__(self, xml_tree: Optional[etree._Element] = None, **kwargs):
         super().__init__(**kwargs)
-        self._attributes_required = set()
-        self._attributes_optional = set()
-        self._elements_required = set()
-        self._elements_optional = set(("field",))
-        config.TAG_CLASSES.update(
-            {
-                "field": FieldDefn,
-            }
-        )
 
         # elements
         self.field_items: Optional[List[FieldDefn]] = None
@@ -121,18 +127,17 @@ class Fields(LIFTUtilsBase):
 
     # FIXME: Should this class have an XML tag?
     XML_TAG = None
+    __slots__ = ("field_items",)
+    _ATTRIBUTES_REQUIRED = ()
+    _ATTRIBUTES_OPTIONAL = ()
+    _ELEMENTS_REQUIRED = ()
+    _ELEMENTS_OPTIONAL = ("field",)
+    _TAG_CLASSES = {
+        "field": FieldDefinition,
+    }
 
     def __init__(self, xml_tree: Optional[etree._Element] = None, **kwargs):
         super().__init__(**kwargs)
-        self._attributes_required = set()
-        self._attributes_optional = set()
-        self._elements_required = set()
-        self._elements_optional = set(("field",))
-        config.TAG_CLASSES.update(
-            {
-                "field": FieldDefinition,
-            }
-        )
 
         # elements
         self.field_items: Optional[List[FieldDefinition]] = None
@@ -145,31 +150,31 @@ class RangeElement13(LIFTUtilsBase):
     """The description of a particular range element found in a ``range``."""
 
     XML_TAG = "range-element"
+    __slots__ = (
+        "id",
+        "parent",
+        "guid",
+        "description_items",
+        "label_items",
+        "abbrev_items",
+    )
+    _ATTRIBUTES_REQUIRED = ("id",)
+    _ATTRIBUTES_OPTIONAL = ("guid", "parent")
+    _ELEMENTS_REQUIRED = ()
+    _ELEMENTS_OPTIONAL = ("abbrev", "description", "label")
+    _TAG_CLASSES = {
+        "id": Key,
+        "guid": str,
+        "parent": Key,
+        "abbrev": Multitext,
+        "description": Multitext,
+        "label": Multitext,
+    }
 
     def __init__(
         self, elem_id: Key = None, xml_tree: Optional[etree._Element] = None, **kwargs
     ):
         super().__init__(**kwargs)
-        self._attributes_required = set(("id",))
-        self._attributes_optional = set(("guid", "parent"))
-        self._elements_required = set()
-        self._elements_optional = set(
-            (
-                "abbrev",
-                "description",
-                "label",
-            )
-        )
-        config.TAG_CLASSES.update(
-            {
-                "id": Key,
-                "guid": str,
-                "parent": Key,
-                "abbrev": Multitext,
-                "description": Multitext,
-                "label": Multitext,
-            }
-        )
 
         # attributes
         self.id = elem_id
@@ -191,36 +196,38 @@ class RangeElement(Extensible):
     """
 
     XML_TAG = "range-element"
+    __slots__ = (
+        "id",
+        "parent",
+        "guid",
+        "description_items",
+        "label_items",
+        "abbrev_items",
+    )
+    _ATTRIBUTES_REQUIRED = ("id",)
+    _ATTRIBUTES_OPTIONAL = ("dateCreated", "dateModified", "guid", "parent")
+    _ELEMENTS_REQUIRED = ()
+    _ELEMENTS_OPTIONAL = (
+        "annotation",
+        "abbrev",
+        "description",
+        "field",
+        "label",
+        "trait",
+    )
+    _TAG_CLASSES = {
+        "id": Key,
+        "guid": str,
+        "parent": Key,
+        "abbrev": Multitext,
+        "description": Multitext,
+        "label": Multitext,
+    }
 
     def __init__(
         self, elem_id: Key = None, xml_tree: Optional[etree._Element] = None, **kwargs
     ):
         super().__init__(**kwargs)
-        self._attributes_required = set(("id",))
-        self._attributes_optional = set(
-            ("dateCreated", "dateModified", "guid", "parent")
-        )
-        self._elements_required = set()
-        self._elements_optional = set(
-            (
-                "annotation",
-                "abbrev",
-                "description",
-                "field",
-                "label",
-                "trait",
-            )
-        )
-        config.TAG_CLASSES.update(
-            {
-                "id": Key,
-                "guid": str,
-                "parent": Key,
-                "abbrev": Multitext,
-                "description": Multitext,
-                "label": Multitext,
-            }
-        )
 
         # attributes
         self.id = elem_id
@@ -242,32 +249,36 @@ class Range13(LIFTUtilsBase):
     """
 
     XML_TAG = "range"
+    __slots__ = (
+        "id",
+        "guid",
+        "href",
+        "range_element_items",
+        "abbrev_items",
+        "description",
+        "label_items",
+    )
+    _ATTRIBUTES_REQUIRED = ("id",)
+    _ATTRIBUTES_OPTIONAL = ("guid", "href")
+    _ELEMENTS_REQUIRED = ("range-element",)
+    _ELEMENTS_OPTIONAL = ("abbrev", "description", "label")
+    _TAG_CLASSES = {
+        "id": Key,
+        "guid": str,
+        "href": URL,
+        "range-element": RangeElement13,
+        "abbrev": Multitext,
+        "description": Multitext,
+        "label": Multitext,
+    }
+    _PY_NAMES = {
+        "description": "description",
+    }
 
     def __init__(
         self, range_id: Key = None, xml_tree: Optional[etree._Element] = None, **kwargs
     ):
         super().__init__(**kwargs)
-        self._attributes_required = set(("id",))
-        self._attributes_optional = set(("guid", "href"))
-        self._elements_required = set(("range-element",))
-        self._elements_optional = set(
-            (
-                "abbrev",
-                "description",
-                "label",
-            )
-        )
-        config.TAG_CLASSES.update(
-            {
-                "id": Key,
-                "guid": str,
-                "href": URL,
-                "range-element": RangeElement13,
-                "abbrev": Multitext,
-                "description": Multitext,
-                "label": Multitext,
-            }
-        )
 
         # attributes
         self.id = range_id
@@ -290,28 +301,43 @@ class Range(Extensible):
     """
 
     XML_TAG = "range"
+    __slots__ = (
+        "id",
+        "guid",
+        "href",
+        "range_element_items",
+        "abbrev_items",
+        "description",
+        "label_items",
+    )
+    _ATTRIBUTES_REQUIRED = ("id",)
+    _ATTRIBUTES_OPTIONAL = ("dateCreated", "dateModified", "guid", "href")
+    _ELEMENTS_REQUIRED = ("range-element",)
+    _ELEMENTS_OPTIONAL = (
+        "abbrev",
+        "annotation",
+        "description",
+        "field",
+        "label",
+        "trait",
+    )
+    _TAG_CLASSES = {
+        "id": Key,
+        "guid": str,
+        "href": URL,
+        "range-element": RangeElement,
+        "abbrev": Multitext,
+        "description": Multitext,
+        "label": Multitext,
+    }
+    _PY_NAMES = {
+        "description": "description",
+    }
 
     def __init__(
         self, range_id: Key = None, xml_tree: Optional[etree._Element] = None, **kwargs
     ):
         super().__init__(**kwargs)
-        self._attributes_required = set(("id",))
-        self._attributes_optional = set(("dateCreated", "dateModified", "guid", "href"))
-        self._elements_required = set(("range-element",))
-        self._elements_optional = set(
-            ("abbrev", "annotation", "description", "field", "label", "trait")
-        )
-        config.TAG_CLASSES.update(
-            {
-                "id": Key,
-                "guid": str,
-                "href": URL,
-                "range-element": RangeElement,
-                "abbrev": Multitext,
-                "description": Multitext,
-                "label": Multitext,
-            }
-        )
 
         # attributes
         self.id = range_id
@@ -328,25 +354,31 @@ class Range(Extensible):
 
 
 class Ranges(LIFTUtilsBase):
-    """The root element in a Lift Ranges file."""
+    """The root element in a Lift Ranges file.
+    Each range is only built from its XML the first time it is accessed in
+    ``range_items``.
+    """
 
     XML_TAG = "ranges"
+    __slots__ = ("range_items", "_hrefs")
+    _ATTRIBUTES_REQUIRED = ()
+    _ATTRIBUTES_OPTIONAL = ()
+    _ELEMENTS_REQUIRED = ("range",)
+    _ELEMENTS_OPTIONAL = ()
+    _TAG_CLASSES = {
+        "range": Range,
+    }
+    _FIELDWORKS_SCHEMA = {
+        "tag_classes": {"range": Range13},
+    }
 
     def __init__(self, xml_tree: Optional[etree._Element] = None, **kwargs):
         super().__init__(**kwargs)
-        self._attributes_required = set()
-        self._attributes_optional = set()
-        self._elements_required = set(("range",))
-        self._elements_optional = set()
-        config.TAG_CLASSES.update(
-            {
-                "range": Range,
-            }
-        )
 
+        # The hrefs of ranges whose data comes from an external file, by id.
+        self._hrefs = dict()
         # elements
-        if config.LIFT_VERSION == config.LIFT_VERSION_FIELDWORKS:
-            config.TAG_CLASSES["range"] = Range13
+        if self._context.is_fieldworks:
             self.range_items: List[Range13] = None
         else:
             self.range_items: List[Range] = None
@@ -354,6 +386,98 @@ class Ranges(LIFTUtilsBase):
         if xml_tree is not None:
             self._from_xml_tree(xml_tree)
 
+    def get_range_ids(self) -> Iterator[Key]:
+        """Yield the id of each range, without building any range."""
+        for item in self._iter_raw_ranges():
+            if isinstance(item, etree._Element):
+                yield Key(item.attrib.get("id"))
+            else:
+                yield item.id
+
+    def get_range_element_ids(self, range_id: str) -> Iterator[Key]:
+        """Yield the id of each ``range-element`` of the given range, without
+        building the range.
+
+        :var str range_id: The ``id`` attribute of the range.
+        """
+        for item in self._iter_raw_ranges():
+            if isinstance(item, etree._Element):
+                if item.attrib.get("id") == range_id:
+                    for elem in item.iterfind("range-element"):
+                        yield Key(elem.attrib.get("id"))
+            elif item.id == range_id:
+                for elem in item.range_element_items or ():
+                    yield elem.id
+
+    def _build_range(self, xml_tree):
+        range_class = self._schema.child_handlers["range"][1]
+        _range = range_class(xml_tree=xml_tree, parent_item=self)
+        if _range.id in self._hrefs:
+            _range.href = self._hrefs[_range.id]
+        return _range
+
+    def _from_xml_tree(self, xml_tree):
+        elements = xml_tree.findall("range")
+        if elements:
+            self.range_items = LazyItemList(
+                None, elements, parent_item=self, build=self._build_range
+            )
+
+    def _iter_raw_ranges(self):
+        """Yield each range without building it; i.e. either the range's node
+        object or its source XML element."""
+        if isinstance(self.range_items, LazyItemList):
+            yield from self.range_items.iter_raw()
+        elif self.range_items:
+            yield from self.range_items
+
+    def _restore_external_ranges(self):
+        """Put back the header's reference to the external file of each
+        external range that hasn't been built."""
+        for i, item in enumerate(list(self._iter_raw_ranges())):
+            if not isinstance(item, etree._Element):
+                continue
+            range_id = item.attrib.get("id")
+            if range_id in self._hrefs:
+                self.range_items[i] = etree.Element(
+                    "range", id=range_id, href=self._hrefs[range_id]
+                )
+
+    def _to_stub_xml_tree(self, tag=None):
+        """Return the ranges' XML as written in a LIFT file whose ranges are
+        in a LIFT-RANGES file, i.e. with only the ``id`` and ``href`` of each
+        range. No range is built."""
+        xml_tree = etree.Element(tag or self.XML_TAG)
+        for item in self._iter_raw_ranges():
+            if isinstance(item, etree._Element):
+                range_id = item.attrib.get("id")
+                href = self._hrefs.get(range_id, item.attrib.get("href"))
+            else:
+                range_id = item.id
+                href = item.href
+            stub = etree.SubElement(xml_tree, "range")
+            if range_id is not None:
+                stub.set("id", str(range_id))
+            if href is not None:
+                stub.set("href", str(href))
+        return xml_tree
+
+    def _use_external_ranges(self, xml_elements, href: URL):
+        """Take the data of each range from the given XML elements, by range
+        id. The XML elements are never modified, so they can be shared."""
+        for i, item in enumerate(list(self._iter_raw_ranges())):
+            if isinstance(item, etree._Element):
+                range_id = item.attrib.get("id")
+            else:
+                range_id = item.id
+            if range_id not in xml_elements:
+                continue
+            self._hrefs[range_id] = URL(href)
+            if isinstance(self.range_items, LazyItemList):
+                self.range_items[i] = xml_elements[range_id]
+            else:
+                self.range_items[i] = self._build_range(xml_elements[range_id])
+
 
 class Header(LIFTUtilsBase):
     """The header information for a LIFT file.
@@ -369,26 +493,30 @@ class Header(LIFTUtilsBase):
     """
 
     XML_TAG = "header"
+    __slots__ = ("description", "ranges", "fields")
+    _ATTRIBUTES_REQUIRED = ()
+    _ATTRIBUTES_OPTIONAL = ()
+    _ELEMENTS_REQUIRED = ("description", "fields", "ranges")
+    _ELEMENTS_OPTIONAL = ()
+    _TAG_CLASSES = {
+        "description": Multitext,
+        "fields": Fields,
+        "ranges": Ranges,
+    }
+    _PY_NAMES = {
+        "description": "description",
+    }
+    _FIELDWORKS_SCHEMA = {
+        "tag_classes": {"fields": FieldDefns},
+    }
 
     def __init__(self, xml_tree: Optional[etree._Element] = None, **kwargs):
         super().__init__(**kwargs)
-        self._attributes_required = set()
-        self._attributes_optional = set()
-        self._elements_required = set(("description", "fields", "ranges"))
-        self._elements_optional = set()
-        config.TAG_CLASSES.update(
-            {
-                "description": Multitext,
-                "fields": Fields,
-                "ranges": Ranges,
-            }
-        )
 
         # elements
         self.description: Optional[Multitext] = None
         self.ranges: Optional[Ranges] = None
-        if config.LIFT_VERSION == config.LIFT_VERSION_FIELDWORKS:
-            config.TAG_CLASSES["fields"] = FieldDefns
+        if self._context.is_fieldworks:
             self.fields: Optional[FieldDefns] = None
         else:
             self.fields: Optional[Fields] = None
@@ -405,3 +533,17 @@ class Header(LIFTUtilsBase):
         if self.fields:
             s += f", {len(self.fields)} fields"
         return s
+
+    def _to_lift_xml_tree(self, tag=None):
+        """Return the header's XML as written in a LIFT file whose ranges are
+        in a LIFT-RANGES file; see ``Ranges._to_stub_xml_tree``."""
+        xml_tree = etree.Element(tag or self.XML_TAG)
+        for xml_name, py_name, _ in self._schema.elements:
+            val = getattr(self, py_name)
+            if not val:
+                continue
+            if py_name == "ranges":
+                xml_tree.append(val._to_stub_xml_tree(tag=xml_name))
+            else:
+                xml_tree.append(val._to_xml_tree(tag=xml_name))
+        return xml_tree
@@ -0,0 +1,230 @@
+"""Index the searchable fields of a lexicon's entries and senses."""
+
+import re
+from bisect import bisect_left, bisect_right
+from operator import is_
+
+from .utils import form_text
+
+ENTRY_FIELDS = ("lexical-unit", "variant")
+SENSE_FIELDS = ("gloss", "definition", "grammatical-info")
+# Fields that are always searched as if ``match_type`` were "contains".
+CONTAINS_FIELDS = ("gloss", "grammatical-info")
+
+
+class FieldIndex:
+    """The values of one searchable field of a lexicon, in the order in which
+    ``Lexicon.find_all`` searches them, so that they can be searched without
+    walking the lexicon's nodes. Results are the same as those of
+    ``utils.search_entry``: each group of values that matches, e.g. the forms
+    of one ``field`` item, gives its entry or sense once.
+
+    :var Iterable[Entry] entries: The lexicon's entries.
+    :var str field: The field to index.
+    :var List[str] header_fields: The fields defined in the lexicon's
+        header.
+    """
+
+    # Values are joined with a character that can't appear in XML text, so
+    # that a substring search of the joined text finds matches in any value.
+    SEPARATOR = "\x00"
+
+    def __init__(self, entries, field, header_fields):
+        self.field = field
+        # The indexed entries, and the number of groups after each of them.
+        self.entries = []
+        self.entry_ends = []
+        # The entry or sense of each group of values.
+        self.items = []
+        # The values, and the group that each belongs to.
+        self.values = []
+        self.value_groups = []
+        self._add_groups(_iter_value_groups(entries, field, header_fields))
+        self._exact = None
+        self._joined = None
+        self._offsets = None
+
+    def refresh(self, entries, header_fields):
+        """Return the index of the field for the given entries, e.g. after
+        ``Lexicon.refresh``. The values of entries that this index already
+        has, as the same objects, are taken from it; only the other entries
+        are searched for values.
+
+        :var Iterable[Entry] entries: The lexicon's entries.
+        :var List[str] header_fields: The fields defined in the lexicon's
+            header.
+        """
+        positions = {id(entry): i for i, entry in enumerate(self.entries)}
+        index = FieldIndex((), self.field, header_fields)
+        # The positions in this index of consecutive entries still to copy.
+        run = None
+        for entry in entries:
+            i = positions.get(id(entry))
+            if run is not None and i == run[1]:
+                run[1] += 1
+                continue
+            if run is not None:
+                index._copy_entries(self, *run)
+                run = None
+            if i is None:
+                index._add_groups(
+                    _iter_value_groups((entry,), self.field, header_fields)
+                )
+            else:
+                run = [i, i + 1]
+        if run is not None:
+            index._copy_entries(self, *run)
+        return index
+
+    def covers(self, entries):
+        """Return whether the index was made from the given entries, as the
+        same objects and in the same order.
+
+        :var Sequence[Entry] entries: The lexicon's entries.
+        """
+        if len(entries) != len(self.entries):
+            return False
+        if isinstance(entries, list):
+            # Entries don't define ``__eq__``, so lists of them are compared
+            # by identity, more quickly than one by one.
+            return entries == self.entries
+        return all(map(is_, entries, self.entries))
+
+    def find(self, text, match_type="contains", get_all=False):
+        """Return the first matching item, or, if ``get_all`` is ``True``,
+        all matching items; see ``Lexicon.find``."""
+        items = self.iter_find(text, match_type=match_type)
+        if get_all:
+            return list(items)
+        return next(items, None)
+
+    def iter_find(self, text, match_type="contains"):
+        """Yield each matching item in turn; see ``Lexicon.iter_find``."""
+        if self.field in CONTAINS_FIELDS:
+            match_type = "contains"
+        if match_type == "contains":
+            if text and self.SEPARATOR not in text:
+                groups = self._iter_contains(text)
+            else:
+                groups = self._iter_matching(lambda value: text in value)
+        elif match_type == "exact":
+            groups = iter(self._find_exact(text))
+        elif match_type == "regex":
+            groups = self._iter_matching(re.compile(text).match)
+        else:
+            groups = iter(())
+        return (self.items[g] for g in groups)
+
+    def _iter_contains(self, text):
+        if self._joined is None:
+            self._joined = self.SEPARATOR.join(self.values)
+            self._offsets = []
+            offset = 0
+            for value in self.values:
+                self._offsets.append(offset)
+                offset += len(value) + 1
+        last = None
+        start = self._joined.find(text)
+        while start != -1:
+            i = bisect_right(self._offsets, start) - 1
+            group = self.value_groups[i]
+            if group != last:
+                yield group
+                last = group
+            # Go on from the next value; each value matches only once.
+            if i + 1 == len(self._offsets):
+                break
+            start = self._joined.find(text, self._offsets[i + 1])
+
+    def _add_groups(self, groups):
+        for item, values in groups:
+            if values is None:
+                self.entries.append(item)
+                self.entry_ends.append(len(self.items))
+                continue
+            for value in values:
+                self.values.append(value)
+                self.value_groups.append(len(self.items))
+            self.items.append(item)
+
+    def _copy_entries(self, other, start, stop):
+        """Add the groups of the entries of another index from ``start`` to
+        ``stop``."""
+        group_start = other.entry_ends[start - 1] if start else 0
+        group_stop = other.entry_ends[stop - 1]
+        value_start = bisect_left(other.value_groups, group_start)
+        value_stop = bisect_left(other.value_groups, group_stop)
+        offset = len(self.items) - group_start
+        self.items.extend(other.items[group_start:group_stop])
+        self.values.extend(other.values[value_start:value_stop])
+        self.value_groups.extend(
+            group + offset for group in other.value_groups[value_start:value_stop]
+        )
+        self.entries.extend(other.entries[start:stop])
+        self.entry_ends.extend(end + offset for end in other.entry_ends[start:stop])
+
+    def _find_exact(self, text):
+        if self._exact is None:
+            self._exact = dict()
+            for value, group in zip(self.values, self.value_groups):
+                groups = self._exact.setdefault(value, [])
+                if not groups or groups[-1] != group:
+                    groups.append(group)
+        return self._exact.get(text, ())
+
+    def _iter_matching(self, match):
+        last = None
+        for value, group in zip(self.values, self.value_groups):
+            if group != last and match(value):
+                yield group
+                last = group
+
+
+def _iter_value_groups(entries, field, header_fields):
+    """Yield each entry or sense that ``utils.search_entry`` would test for
+    the given field, with each group of values that it would test, in the
+    same order; and after those of each entry, the entry with ``None``."""
+    search_senses = field not in ENTRY_FIELDS
+    search_entries = field not in SENSE_FIELDS
+    for entry in entries:
+        if search_senses:
+            if not entry.sense_items:
+                yield entry, None
+                continue
+            for sense in entry.sense_items:
+                yield from _iter_sense_value_groups(sense, field, header_fields)
+                for subsense in sense.subsense_items or ():
+                    yield from _iter_sense_value_groups(subsense, field, header_fields)
+        if search_entries:
+            if field == "lexical-unit":
+                if entry.lexical_unit and entry.lexical_unit.form_items:
+                    yield entry, _form_texts(entry.lexical_unit.form_items)
+            elif field == "variant":
+                for variant in entry.variant_items or ():
+                    if variant.form_items:
+                        yield entry, _form_texts(variant.form_items)
+            elif field in header_fields:
+                for field_item in entry.field_items or ():
+                    if field_item.type == field and field_item.form_items:
+                        yield entry, _form_texts(field_item.form_items)
+        yield entry, None
+
+
+def _iter_sense_value_groups(sense, field, header_fields):
+    if field == "gloss":
+        for gloss in sense.gloss_items or ():
+            yield sense, (str(gloss.text),)
+    elif field == "definition":
+        if sense.definition and sense.definition.form_items:
+            yield sense, _form_texts(sense.definition.form_items)
+    elif field == "grammatical-info":
+        if sense.grammatical_info:
+            yield sense, (str(sense.grammatical_info),)
+    elif field in header_fields:
+        for field_item in sense.field_items or ():
+            if field_item.type == field and field_item.form_items:
+                yield sense, _form_texts(field_item.form_items)
+
+
+def _form_texts(form_items):
+    return [form_text(form) for form in form_items]
@@ -1,7 +1,16 @@
 """Manipulate lexicon entries and their dependent elements."""
 
+import hashlib
+import math
+import multiprocessing
+import os
+import pickle
+import shutil
+from contextlib import closing
+from functools import partial
+from itertools import islice
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
 from urllib.parse import unquote, urlparse
 
 from lxml import etree
@@ -9,24 +18,40 @@ from lxml import etree
 from . import config, utils
 from .base import (
     Extensible,
+    ExtensibleMixin,
     Form,
     Gloss,
+    LazyItemList,
+    LIFTContext,
     LIFTUtilsBase,
     Multitext,
+    NodeBuilder,
     Trait,
     URLRef,
+    build_schemas,
+    dump_each_node,
+    load_nodes,
 )
 from .datatypes import URL, DateTime, Key, RefId
-from .errors import InvalidExtensionError
-from .header import Header, Range, Range13
+from .errors import AmbiguousTextError, InvalidExtensionError, InvalidSnapshotError
+from .header import Header
+from .index import FieldIndex
 from .utils import (
+    compression_suffix,
     get_writing_systems_from_entry,
+    iter_xml_fragments,
+    iterparse_elements,
+    open_file,
     search_entry,
+    strip_compression_suffix,
+    write_xml,
+    write_xml_fragments,
+    xml_has_id,
     xmlfile_to_etree,
 )
 
 
-class Note(Multitext, Extensible):
+class Note(Multitext, ExtensibleMixin):
     """For storing descriptive information of many kinds.
     It can include comments, bibliographic information and domain specific
     notes.
@@ -36,35 +61,26 @@ class Note(Multitext, Extensible):
     """
 
     XML_TAG = "note"
+    __slots__ = (
+        # Extensible's slots; Multitext already has trait_items.
+        "date_created",
+        "date_modified",
+        "field_items",
+        "annotation_items",
+        "type",
+    )
+    _ATTRIBUTES_REQUIRED = ()
+    _ATTRIBUTES_OPTIONAL = ("dateCreated", "dateModified", "type")
+    _ELEMENTS_REQUIRED = ()
+    _ELEMENTS_OPTIONAL = ("annotation", "field", "form", "pcdata", "span", "trait")
+    _TAG_CLASSES = {
+        "type": Key,
+    }
 
     def __init__(self, xml_tree: Optional[etree._Element] = None, **kwargs):
         # TODO: Can we just use super().__init__() here and elsewhere?
-        Extensible.__init__(self, **kwargs)
+        ExtensibleMixin.__init__(self, **kwargs)
         Multitext.__init__(self, **kwargs)
-        self._attributes_required = set()
-        self._attributes_optional = set(
-            (
-                "dateCreated",
-                "dateModified",
-                "type",
-            )
-        )
-        self._elements_required = set()
-        self._elements_optional = set(
-            (
-                "annotation",
-                "field",
-                "form",
-                "pcdata",
-                "span",
-                "trait",
-            )
-        )
-        config.TAG_CLASSES.update(
-            {
-                "type": Key,
-            }
-        )
 
         # attributes
         self.type: Optional[Key] = None
@@ -76,7 +92,7 @@ class Note(Multitext, Extensible):
         return super().__str__()
 
 
-class Phonetic(Multitext, Extensible):
+class Phonetic(Multitext, ExtensibleMixin):
     """This represents a single pronunciation in phonetic form.
 
     :ivar Optional[List[URLRef]] media_items: Stores an audio representation of
@@ -87,34 +103,33 @@ class Phonetic(Multitext, Extensible):
     """
 
     XML_TAG = "pronunciation"
+    __slots__ = (
+        # Extensible's slots; Multitext already has trait_items.
+        "date_created",
+        "date_modified",
+        "field_items",
+        "annotation_items",
+        "media_items",
+    )
+    _ATTRIBUTES_REQUIRED = ()
+    _ATTRIBUTES_OPTIONAL = ("dateCreated", "dateModified")
+    _ELEMENTS_REQUIRED = ()
+    _ELEMENTS_OPTIONAL = (
+        "annotation",
+        "field",
+        "form",
+        "media",
+        "pcdata",
+        "span",
+        "trait",
+    )
+    _TAG_CLASSES = {
+        "media": URLRef,
+    }
 
     def __init__(self, xml_tree: Optional[etree._Element] = None, **kwargs):
-        Extensible.__init__(self, **kwargs)
+        ExtensibleMixin.__init__(self, **kwargs)
         Multitext.__init__(self, **kwargs)
-        self._attributes_required = set()
-        self._attributes_optional = set(
-            (
-                "dateCreated",
-                "dateModified",
-            )
-        )
-        self._elements_required = set()
-        self._elements_optional = set(
-            (
-                "annotation",
-                "field",
-                "form",
-                "media",
-                "pcdata",
-                "span",
-                "trait",
-            )
-        )
-        config.TAG_CLASSES.update(
-            {
-                "media": URLRef,
-            }
-        )
 
         # elements
         self.media_items: Optional[List[URLRef]] = None
@@ -174,6 +189,20 @@ class Etymology(Extensible):
     """
 
     XML_TAG = "etymology"
+    __slots__ = ("type", "source", "gloss_items", "form")
+    _ATTRIBUTES_REQUIRED = ("source", "type")
+    _ATTRIBUTES_OPTIONAL = ("dateCreated", "dateModified")
+    _ELEMENTS_REQUIRED = ()
+    _ELEMENTS_OPTIONAL = ("annotation", "field", "form", "gloss", "trait")
+    _TAG_CLASSES = {
+        "type": Key,
+        "source": str,
+        "form": Form,
+        "gloss": Gloss,
+    }
+    _PY_NAMES = {
+        "form": "form",
+    }
 
     def __init__(
         self,
@@ -183,26 +212,6 @@ class Etymology(Extensible):
         **kwargs,
     ):
         super().__init__(**kwargs)
-        self._attributes_required = set(("source", "type"))
-        self._attributes_optional = set(("dateCreated", "dateModified"))
-        self._elements_required = set()
-        self._elements_optional = set(
-            (
-                "annotation",
-                "field",
-                "form",
-                "gloss",
-                "trait",
-            )
-        )
-        config.TAG_CLASSES.update(
-            {
-                "type": Key,
-                "source": str,
-                "form": Form,
-                "gloss": Gloss,
-            }
-        )
 
         # attributes
         self.type = etym_type
@@ -235,21 +244,20 @@ class GrammaticalInfo(LIFTUtilsBase):
     """
 
     XML_TAG = "grammatical-info"
+    __slots__ = ("value", "trait_items")
+    _ATTRIBUTES_REQUIRED = ("value",)
+    _ATTRIBUTES_OPTIONAL = ()
+    _ELEMENTS_REQUIRED = ()
+    _ELEMENTS_OPTIONAL = ("trait",)
+    _TAG_CLASSES = {
+        "value": Key,
+        "trait": Trait,
+    }
 
     def __init__(
         self, value: Key = None, xml_tree: Optional[etree._Element] = None, **kwargs
     ):
         super().__init__(**kwargs)
-        self._attributes_required = set(("value",))
-        self._attributes_optional = set()
-        self._elements_required = set()
-        self._elements_optional = set(("trait",))
-        config.TAG_CLASSES.update(
-            {
-                "value": Key,
-                "trait": Trait,
-            }
-        )
 
         # attributes
         self.value = None
@@ -281,29 +289,19 @@ class Reversal(Multitext):
     """
 
     XML_TAG = "reversal"
+    __slots__ = ("type", "main", "grammatical_info")
+    _ATTRIBUTES_REQUIRED = ()
+    _ATTRIBUTES_OPTIONAL = ("type",)
+    _ELEMENTS_REQUIRED = ()
+    _ELEMENTS_OPTIONAL = ("form", "grammatical-info", "main", "pcdata", "span", "trait")
+    _TAG_CLASSES = {
+        "type": Key,
+        "grammatical-info": GrammaticalInfo,
+        "main": "Reversal",
+    }
 
     def __init__(self, xml_tree: Optional[etree._Element] = None, **kwargs):
         super().__init__(**kwargs)
-        self._attributes_required = set()
-        self._attributes_optional = set(("type",))
-        self._elements_required = set()
-        self._elements_optional = set(
-            (
-                "form",
-                "grammatical-info",
-                "main",
-                "pcdata",
-                "span",
-                "trait",
-            )
-        )
-        config.TAG_CLASSES.update(
-            {
-                "type": Key,
-                "grammatical-info": GrammaticalInfo,
-                "main": Reversal,
-            }
-        )
 
         # attributes
         self.type: Optional[Key] = None
@@ -322,25 +320,17 @@ class Translation(Multitext):
     """
 
     XML_TAG = "translation"
+    __slots__ = ("type",)
+    _ATTRIBUTES_REQUIRED = ()
+    _ATTRIBUTES_OPTIONAL = ("type",)
+    _ELEMENTS_REQUIRED = ()
+    _ELEMENTS_OPTIONAL = ("form", "pcdata", "span", "trait")
+    _TAG_CLASSES = {
+        "type": Key,
+    }
 
     def __init__(self, xml_tree: Optional[etree._Element] = None, **kwargs):
         super().__init__(**kwargs)
-        self._attributes_required = set()
-        self._attributes_optional = set(("type",))
-        self._elements_required = set()
-        self._elements_optional = set(
-            (
-                "form",
-                "pcdata",
-                "span",
-                "trait",
-            )
-        )
-        config.TAG_CLASSES.update(
-            {
-                "type": Key,
-            }
-        )
 
         # attributes
         self.type: Optional[Key] = None
@@ -349,7 +339,7 @@ class Translation(Multitext):
             self._from_xml_tree(xml_tree)
 
 
-class Example(Multitext, Extensible):
+class Example(Multitext, ExtensibleMixin):
     """Gives an example sentence or phrase.
     It is given in the language and glosses of that example in other languages.
 
@@ -362,47 +352,56 @@ class Example(Multitext, Extensible):
     """
 
     XML_TAG = "example"
+    __slots__ = (
+        # Extensible's slots; Multitext already has trait_items.
+        "date_created",
+        "date_modified",
+        "field_items",
+        "annotation_items",
+        "source",
+        "translation_items",
+        "note_items",
+    )
+    _ATTRIBUTES_REQUIRED = ()
+    _ATTRIBUTES_OPTIONAL = ("dateCreated", "dateModified", "source")
+    _ELEMENTS_REQUIRED = ()
+    _ELEMENTS_OPTIONAL = (
+        "annotation",
+        "field",
+        "form",
+        "note",
+        "pcdata",
+        "span",
+        "trait",
+        "translation",
+    )
+    _TAG_CLASSES = {
+        "source": Key,
+        "translation": Translation,
+        "note": Note,
+    }
+    _FIELDWORKS_SCHEMA = {
+        "elements_optional": (
+            "annotation",
+            "field",
+            "form",
+            "pcdata",
+            "span",
+            "trait",
+            "translation",
+        ),
+    }
 
     def __init__(self, xml_tree: Optional[etree._Element] = None, **kwargs):
         # TODO: Consider replacing these two __inits__ with super().__init__.
-        Extensible.__init__(self, **kwargs)
+        ExtensibleMixin.__init__(self, **kwargs)
         Multitext.__init__(self, **kwargs)
-        self._attributes_required = set()
-        self._attributes_optional = set(
-            (
-                "dateCreated",
-                "dateModified",
-                "source",
-            )
-        )
-        self._elements_required = set()
-        self._elements_optional = set(
-            (
-                "annotation",
-                "field",
-                "form",
-                "note",
-                "pcdata",
-                "span",
-                "trait",
-                "translation",
-            )
-        )
-        if config.LIFT_VERSION == config.LIFT_VERSION_FIELDWORKS:
-            self._elements_optional.discard("note")
-        config.TAG_CLASSES.update(
-            {
-                "source": Key,
-                "translation": Translation,
-                "note": Note,
-            }
-        )
 
         # attributes
         self.source: Optional[Key] = None
         # elements
         self.translation_items: Optional[List[Translation]] = None
-        if config.LIFT_VERSION == config.LIFT_VERSION_FIELDWORKS:
+        if self._context.is_fieldworks:
             if hasattr(self, "note_items"):
                 del self.note_items
         else:
@@ -425,6 +424,17 @@ class Relation(Extensible):
     """
 
     XML_TAG = "relation"
+    __slots__ = ("type", "ref", "order", "usage_items")
+    _ATTRIBUTES_REQUIRED = ("ref", "type")
+    _ATTRIBUTES_OPTIONAL = ("dateCreated", "dateModified", "order")
+    _ELEMENTS_REQUIRED = ()
+    _ELEMENTS_OPTIONAL = ("annotation", "field", "trait", "usage")
+    _TAG_CLASSES = {
+        "type": Key,
+        "ref": RefId,
+        "order": int,
+        "usage": Multitext,
+    }
 
     def __init__(
         self,
@@ -434,31 +444,6 @@ class Relation(Extensible):
         **kwargs,
     ):
         super().__init__(**kwargs)
-        self._attributes_required = set(("ref", "type"))
-        self._attributes_optional = set(
-            (
-                "dateCreated",
-                "dateModified",
-                "order",
-            )
-        )
-        self._elements_required = set()
-        self._elements_optional = set(
-            (
-                "annotation",
-                "field",
-                "trait",
-                "usage",
-            )
-        )
-        config.TAG_CLASSES.update(
-            {
-                "type": Key,
-                "ref": RefId,
-                "order": int,
-                "usage": Multitext,
-            }
-        )
 
         # attributes
         self.type = rel_type
@@ -474,7 +459,7 @@ class Relation(Extensible):
         return f"{self.type}: {self.ref}"
 
 
-class Variant(Multitext, Extensible):
+class Variant(Multitext, ExtensibleMixin):
     """``Variant`` elements are used for all sorts of variation.
 
     :ivar Optional[RefId] ref: Gives the variation as a reference to another
@@ -489,38 +474,38 @@ class Variant(Multitext, Extensible):
     """
 
     XML_TAG = "variant"
+    __slots__ = (
+        # Extensible's slots; Multitext already has trait_items.
+        "date_created",
+        "date_modified",
+        "field_items",
+        "annotation_items",
+        "ref",
+        "pronunciation_items",
+        "relation_items",
+    )
+    _ATTRIBUTES_REQUIRED = ()
+    _ATTRIBUTES_OPTIONAL = ("dateCreated", "dateModified", "ref")
+    _ELEMENTS_REQUIRED = ()
+    _ELEMENTS_OPTIONAL = (
+        "annotation",
+        "field",
+        "form",
+        "pcdata",
+        "pronunciation",
+        "relation",
+        "span",
+        "trait",
+    )
+    _TAG_CLASSES = {
+        "ref": RefId,
+        "pronunciation": Phonetic,
+        "relation": Relation,
+    }
 
     def __init__(self, xml_tree: Optional[etree._Element] = None, **kwargs):
-        Extensible.__init__(self, **kwargs)
+        ExtensibleMixin.__init__(self, **kwargs)
         Multitext.__init__(self, **kwargs)
-        self._attributes_required = set()
-        self._attributes_optional = set(
-            (
-                "dateCreated",
-                "dateModified",
-                "ref",
-            )
-        )
-        self._elements_required = set()
-        self._elements_optional = set(
-            (
-                "annotation",
-                "field",
-                "form",
-                "pcdata",
-                "pronunciation",
-                "relation",
-                "span",
-                "trait",
-            )
-        )
-        config.TAG_CLASSES.update(
-            {
-                "ref": RefId,
-                "pronunciation": Phonetic,
-                "relation": Relation,
-            }
-        )
 
         # attributes
         self.ref: Optional[RefId] = None
@@ -562,50 +547,55 @@ class Sense(Extensible):
     """
 
     XML_TAG = "sense"
+    __slots__ = (
+        "id",
+        "order",
+        "definition",
+        "example_items",
+        "gloss_items",
+        "grammatical_info",
+        "illustration_items",
+        "note_items",
+        "relation_items",
+        "reversal_items",
+        "subsense_items",
+    )
+    _ATTRIBUTES_REQUIRED = ()
+    _ATTRIBUTES_OPTIONAL = ("dateCreated", "dateModified", "id", "order")
+    _ELEMENTS_REQUIRED = ()
+    _ELEMENTS_OPTIONAL = (
+        "annotation",
+        "definition",
+        "example",
+        "field",
+        "gloss",
+        "grammatical-info",
+        "illustration",
+        "note",
+        "relation",
+        "reversal",
+        "subsense",
+        "trait",
+    )
+    _TAG_CLASSES = {
+        "id": RefId,
+        "order": int,
+        "definition": Multitext,
+        "example": Example,
+        "gloss": Gloss,
+        "grammatical-info": GrammaticalInfo,
+        "illustration": URLRef,
+        "note": Note,
+        "relation": Relation,
+        "reversal": Reversal,
+        "subsense": "Sense",
+    }
+    _FIELDWORKS_SCHEMA = {
+        "tag_classes": {"gloss": Form},
+    }
 
     def __init__(self, xml_tree: Optional[etree._Element] = None, **kwargs):
         super().__init__(**kwargs)
-        self._attributes_required = set()
-        self._attributes_optional = set(
-            (
-                "dateCreated",
-                "dateModified",
-                "id",
-                "order",
-            )
-        )
-        self._elements_required = set()
-        self._elements_optional = set(
-            (
-                "annotation",
-                "definition",
-                "example",
-                "field",
-                "gloss",
-                "grammatical-info",
-                "illustration",
-                "note",
-                "relation",
-                "reversal",
-                "subsense",
-                "trait",
-            )
-        )
-        config.TAG_CLASSES.update(
-            {
-                "id": RefId,
-                "order": int,
-                "definition": Multitext,
-                "example": Example,
-                "gloss": Gloss,
-                "grammatical-info": GrammaticalInfo,
-                "illustration": URLRef,
-                "note": Note,
-                "relation": Relation,
-                "reversal": Reversal,
-                "subsense": Sense,
-            }
-        )
 
         # attributes
         self.id: Optional[RefId] = None
@@ -613,8 +603,7 @@ class Sense(Extensible):
         # elements
         self.definition: Optional[Multitext] = None
         self.example_items: Optional[List[Example]] = None
-        if config.LIFT_VERSION == config.LIFT_VERSION_FIELDWORKS:
-            config.TAG_CLASSES["gloss"] = Form
+        if self._context.is_fieldworks:
             self.gloss_items: Optional[List[Form]] = None
         else:
             self.gloss_items: Optional[List[Gloss]] = None
@@ -717,7 +706,7 @@ class Sense(Extensible):
             values are the text for each definition.
         """
         self.set_date_modified()
-        self.definition = Multitext(forms_dict)
+        self.definition = Multitext(forms_dict, parent_item=self)
 
     def set_grammatical_info(self, value: str):
         """Set the sense's ``GrammaticalInfo``.
@@ -726,7 +715,7 @@ class Sense(Extensible):
             range.
         """
         self.set_date_modified()
-        self.grammatical_info = GrammaticalInfo(value=value)
+        self.grammatical_info = GrammaticalInfo(value=value, parent_item=self)
 
     def _summary_line(self, lang="en"):
         """Return a one-line summary of the entry's data for a given language.
@@ -764,45 +753,63 @@ class Entry(Extensible):
     """
 
     XML_TAG = "entry"
+    __slots__ = (
+        "id",
+        "guid",
+        "date_deleted",
+        "order",
+        "citation",
+        "etymology_items",
+        "lexical_unit",
+        "note_items",
+        "pronunciation_items",
+        "relation_items",
+        "sense_items",
+        "variant_items",
+        # The entry's XML as read from its file, while it's unmodified; see
+        # ``Lexicon``'s ``keep_xml``.
+        "_source_xml",
+    )
+    _ATTRIBUTES_REQUIRED = ()
+    _ATTRIBUTES_OPTIONAL = (
+        "dateCreated",
+        "dateDeleted",
+        "dateModified",
+        "guid",
+        "id",
+        "order",
+    )
+    _ELEMENTS_REQUIRED = ()
+    _ELEMENTS_OPTIONAL = (
+        "annotation",
+        "citation",
+        "etymology",
+        "field",
+        "lexical-unit",
+        "note",
+        "pronunciation",
+        "relation",
+        "sense",
+        "trait",
+        "variant",
+    )
+    _TAG_CLASSES = {
+        "guid": str,
+        "id": RefId,
+        "dateDeleted": DateTime,
+        "order": int,
+        "citation": Multitext,
+        "etymology": Etymology,
+        "lexical-unit": Multitext,
+        "note": Note,
+        "pronunciation": Phonetic,
+        "relation": Relation,
+        "sense": Sense,
+        "variant": Variant,
+    }
 
     def __init__(self, xml_tree: Optional[etree._Element] = None, **kwargs):
         super().__init__(**kwargs)
-        self._attributes_required = set()
-        self._attributes_optional = set(
-            ("dateCreated", "dateDeleted", "dateModified", "guid", "id", "order")
-        )
-        self._elements_required = set()
-        self._elements_optional = set(
-            (
-                "annotation",
-                "citation",
-                "etymology",
-                "field",
-                "lexical-unit",
-                "note",
-                "pronunciation",
-                "relation",
-                "sense",
-                "trait",
-                "variant",
-            )
-        )
-        config.TAG_CLASSES.update(
-            {
-                "guid": str,
-                "id": RefId,
-                "dateDeleted": DateTime,
-                "order": int,
-                "citation": Multitext,
-                "etymology": Etymology,
-                "lexical-unit": Multitext,
-                "note": Note,
-                "pronunciation": Phonetic,
-                "relation": Relation,
-                "sense": Sense,
-                "variant": Variant,
-            }
-        )
 
         # attributes
         self.id: Optional[RefId] = None
@@ -818,6 +825,7 @@ class Entry(Extensible):
         self.relation_items: Optional[List[Relation]] = None
         self.sense_items: Optional[List[Sense]] = None
         self.variant_items: Optional[List[Variant]] = None
+        self._source_xml: Optional[bytes] = None
 
         if xml_tree is not None:
             self._from_xml_tree(xml_tree)
@@ -888,7 +896,7 @@ class Entry(Extensible):
             values are the text descriptions of the ``Citation``.
         """
         self.set_date_modified()
-        self.citation = Multitext(forms_dict)
+        self.citation = Multitext(forms_dict, parent_item=self)
 
     def set_lexical_unit(self, forms_dict=None):
         """Set the entry's ``LexicalUnit``.
@@ -897,7 +905,7 @@ class Entry(Extensible):
             values are text descriptions of the ``LexicalUnit``.
         """
         self.set_date_modified()
-        self.lexical_unit = Multitext(forms_dict)
+        self.lexical_unit = Multitext(forms_dict, parent_item=self)
 
     def _summary_line(self, lang="en"):
         """Return a one-line summary of the entry's data for a given language.
@@ -911,7 +919,8 @@ class Entry(Extensible):
 
 class Lexicon(LIFTUtilsBase):
     """This is the main class of the lexicon.
-    It contains the header and all the entries in the database.
+    It contains the header and all the entries in the database. The XML of
+    external LIFT-RANGES files is cached; see ``config.RANGES_CACHE``.
 
     :ivar str version: Specifies the lift language version number.
     :ivar Optional[str] producer: Identifies the particular producer of this
@@ -920,57 +929,148 @@ class Lexicon(LIFTUtilsBase):
         database.
     :ivar Optional[List[Entry]] entry_items: Each of the entries in the
         lexicon.
-    :ivar Optional[Path] path: File path to a LIFT file to import.
+    :ivar Optional[Path] path: File path to a LIFT file to import. The file
+        may be compressed, e.g. "lexicon.lift.gz"; see
+        ``utils.COMPRESSION_OPENERS``.
+    :var bool lazy: If ``True``, each ``Entry`` is only built from its XML
+        the first time it is accessed in ``entry_items``.
+    :var int workers: If greater than 1, entries are built in parallel by
+        this many worker processes; the header and ranges are still parsed
+        once, in the calling process. Each entry is pickled back to the
+        calling process on its own, and only unpickled the first time it is
+        accessed in ``entry_items``. Pickling an entry costs about as much
+        as building it, so this only pays off with at least three CPUs.
+        Ignored if ``lazy`` is ``True``.
+    :var bool load_ranges: If ``False``, external LIFT-RANGES files aren't
+        read, and the header's ranges only have their ``id`` and ``href``.
+    :var bool parser_target: If ``True``, nodes are built from the XML
+        parser's events, without first building an XML tree of the whole
+        file, which lowers peak memory use; see ``NodeBuilder``. Ignored if
+        ``lazy`` or ``keep_xml`` is ``True`` or ``workers`` is greater than
+        1, or if the file has text that only the XML tree gives reliably.
+    :var bool keep_xml: If ``True``, each entry keeps the XML it was read
+        from, which ``to_lift`` then writes again as it is, instead of
+        converting the entry to XML, until the entry is modified by one of
+        the ``add_*`` or ``set_*`` methods of its nodes, such as
+        ``set_date_modified``. Other changes to an entry, e.g. setting its
+        nodes' properties or editing their lists, aren't noticed; call
+        ``set_date_modified`` on the entry after making them. The XML takes
+        about as much memory as the file's size.
+    :var bool search_index: If ``True``, ``find`` and ``find_all`` search an
+        index of each field's values, built on the first search of the
+        field, instead of walking all entries and senses each time; see
+        ``index.FieldIndex``. Searches whose ``match_type`` is "exact" always
+        use the index, unless the lexicon is ``lazy``. The index is dropped
+        when an entry is modified by one of the ``add_*`` or ``set_*``
+        methods of its nodes, or when the ``text`` of one of its forms is
+        replaced; after other changes, call ``set_date_modified`` on the
+        entry. It's updated when entries are added to, removed from or
+        replaced in ``entry_items``.
     """
 
     XML_TAG = "lift"
+    # Lexicon doesn't declare __slots__: there's only one per file, and it
+    # also holds file paths and other state that isn't part of the LIFT data.
+    _ATTRIBUTES_REQUIRED = ("version",)
+    _ATTRIBUTES_OPTIONAL = ("producer",)
+    _ELEMENTS_REQUIRED = ()
+    _ELEMENTS_OPTIONAL = ("entry", "header")
+    _TAG_CLASSES = {
+        "version": str,
+        "producer": str,
+        "entry": Entry,
+        "header": Header,
+    }
 
     def __init__(
         self,
         path: Optional[Union[Path, str]] = None,
         version: str = None,
         xml_tree: Optional[etree._Element] = None,
+        lazy: bool = False,
+        workers: int = 1,
+        load_ranges: bool = True,
+        parser_target: bool = False,
+        keep_xml: bool = False,
+        search_index: bool = False,
         **kwargs,
     ):
         super().__init__(**kwargs)
-        self._attributes_required = set(("version",))
-        self._attributes_optional = set(("producer",))
-        self._elements_required = set()
-        self._elements_optional = set(("entry", "header"))
-        config.TAG_CLASSES.update(
-            {
-                "version": str,
-                "producer": str,
-                "entry": Entry,
-                "header": Header,
-            }
-        )
+        # Each lexicon has its own context, which is shared by all its nodes.
+        self._context = LIFTContext()
 
         self.lift_xml_tree = None
         self.ranges_xml_tree = None
-        self.analysis_writing_systems = None
-        self.vernacular_writing_systems = None
+        self._analysis_writing_systems = None
+        self._vernacular_writing_systems = None
+        self._lazy = lazy
+        self._workers = workers
+        self._load_external_ranges = load_ranges
+        self._parser_target = parser_target
+        self._keep_xml = keep_xml
+        self._use_search_index = search_index
+        # The index of each field that has been searched; see ``_find``.
+        self._search_index = None
+        # Content hashes of entries without a dateModified; see ``refresh``.
+        self._entry_digests = dict()
+        # The content hash and range ids of each external ranges file, by
+        # href, when it was read; see ``to_lift``.
+        self._ranges_sources = dict()
         # attributes
         self.version = version
-        # Make version accessible globally.
-        config.LIFT_VERSION = self.version
         self.producer: str = f"LIFT-Utils {config.LIB_VERSION}"
         # elements
         self.header: Optional[Header] = None
         self.entry_items: Optional[List[Entry]] = None
         if path:
             self.path = Path(path).expanduser()
-            if self.path.suffix == ".lift":
+            if strip_compression_suffix(self.path).suffix == ".lift":
                 self._from_lift(self.path)
             else:
                 raise InvalidExtensionError(self.path.name)
         elif xml_tree is not None:
             self._from_xml_tree(xml_tree)
-            self._find_writing_systems()
+            if not self._lazy:
+                self._find_writing_systems()
 
     def __str__(self):
         return f"LIFT lexicon v{self.version}; produced by {self.producer}"
 
+    @property
+    def version(self):
+        """The LIFT version of the lexicon and all its nodes."""
+        return self._context.version
+
+    @version.setter
+    def version(self, value):
+        self._context.version = value
+        self._schema = self._context.get_schema(self.__class__)
+        # Nodes created outside of a lexicon default to the version of the
+        # most recent lexicon. The lexicon's own nodes don't depend on this.
+        config.LIFT_VERSION = value
+
+    @property
+    def analysis_writing_systems(self):
+        """The language codes of the lexicon's analysis writing systems."""
+        if self._analysis_writing_systems is None and self._lazy:
+            self._find_writing_systems()
+        return self._analysis_writing_systems
+
+    @analysis_writing_systems.setter
+    def analysis_writing_systems(self, value):
+        self._analysis_writing_systems = value
+
+    @property
+    def vernacular_writing_systems(self):
+        """The language codes of the lexicon's vernacular writing systems."""
+        if self._vernacular_writing_systems is None and self._lazy:
+            self._find_writing_systems()
+        return self._vernacular_writing_systems
+
+    @vernacular_writing_systems.setter
+    def vernacular_writing_systems(self, value):
+        self._vernacular_writing_systems = value
+
     def add_entry(self) -> Entry:
         """Add an empty ``Entry`` to the lexicon.
         Returns the ``Entry`` object, which can then be used to add data to it.
@@ -996,7 +1096,8 @@ class Lexicon(LIFTUtilsBase):
         :var str field: The field to be searched [default is "gloss"].
         :var str match_type: The kind comparison between the search term and
             the field's data. Possible values are "contains" [default],
-            "exact", or "regex".
+            "exact", or "regex". "exact" searches are looked up in an index;
+            see ``Lexicon``'s ``search_index``.
         """
         return self._find(text, field=field, match_type=match_type)
 
@@ -1013,10 +1114,180 @@ class Lexicon(LIFTUtilsBase):
         :var str field: The field to be searched [default is "gloss"].
         :var str match_type: The kind comparison between the search term and
             the field's data. Possible values are "contains" [default],
-            "exact", or "regex".
+            "exact", or "regex". "exact" searches are looked up in an index;
+            see ``Lexicon``'s ``search_index``.
         """
         return self._find(text, field=field, match_type=match_type, get_all=True)
 
+    def find_many(
+        self, texts: Iterable[str], field: str = "gloss", match_type: str = "exact"
+    ) -> Dict[str, List[Union[Entry, Sense]]]:
+        """Return all matching ``Entry`` or ``Sense`` items for each of the
+        given search terms, as ``find_all`` would, by search term. The
+        field's values are indexed once, and each term is then looked up in
+        the index; see ``Lexicon``'s ``search_index``.
+
+        :var Iterable[str] texts: The search terms.
+        :var str field: The field to be searched [default is "gloss"].
+        :var str match_type: The kind comparison between each search term and
+            the field's data. Possible values are "contains", "exact"
+            [default], or "regex".
+        """
+        index = self._field_index(field)
+        return {
+            text: index.find(text, match_type=match_type, get_all=True)
+            for text in texts
+        }
+
+    def iter_find(
+        self, text: str = "", field: str = "gloss", match_type: str = "contains"
+    ) -> Iterator[Union[Entry, Sense]]:
+        """Yield each matching ``Entry`` or ``Sense`` item in turn, in the
+        order in which ``find_all`` returns them. Searching stops when the
+        caller stops asking for items, e.g. when taking the first few with
+        ``itertools.islice``; the entries of a lazy lexicon are only built as
+        the search reaches them. If ``Lexicon``'s ``search_index`` is
+        ``True``, the field is searched in its index.
+
+        :var str text: The search term.
+        :var str field: The field to be searched [default is "gloss"].
+        :var str match_type: The kind comparison between the search term and
+            the field's data. Possible values are "contains" [default],
+            "exact", or "regex".
+        """
+        if self._uses_index(field):
+            index = self._field_index(field)
+            return index.iter_find(text, match_type=match_type)
+        return self._iter_matches(text, field, match_type, self.entry_items or ())
+
+    @classmethod
+    def iter_entries(
+        cls, path: Union[Path, str], load_ranges: bool = True
+    ) -> Iterator[Entry]:
+        """Yield each ``Entry`` of a LIFT file one at a time.
+        The file is read incrementally, and each ``entry`` element is
+        discarded once its ``Entry`` object has been built, so memory use
+        doesn't grow with the size of the file. The header and any external
+        ranges are parsed before the first entry is yielded; they are
+        available from each entry's ``parent_item``, which is a ``Lexicon``
+        with no ``entry_items``.
+
+        :var Union[Path, str] path: File path to a LIFT file to read.
+        :var bool load_ranges: Read external LIFT-RANGES files; see
+            ``Lexicon``.
+        """
+        path = Path(path).expanduser()
+        if strip_compression_suffix(path).suffix != ".lift":
+            raise InvalidExtensionError(path.name)
+        if not path.is_file():
+            raise FileNotFoundError
+        lexicon = cls()
+        lexicon.path = path
+        for event, elem in iterparse_elements(path, ("lift", "header", "entry")):
+            if event == "start":
+                if elem.tag == "lift":
+                    lexicon.version = elem.attrib.get("version")
+                    if "producer" in elem.attrib:
+                        lexicon.producer = elem.attrib.get("producer")
+                continue
+            if elem.tag == "header":
+                lexicon.header = Header(xml_tree=elem, parent_item=lexicon)
+                if load_ranges:
+                    lexicon._update_header_from_hrefs()
+            elif elem.tag == "entry":
+                yield Entry(xml_tree=elem, parent_item=lexicon)
+
+    @classmethod
+    def load_many(
+        cls,
+        paths: Iterable[Union[Path, str]],
+        func: Optional[Callable[["Lexicon"], Any]] = None,
+        workers: Optional[int] = None,
+        lazy: bool = False,
+        load_ranges: bool = True,
+    ) -> list:
+        """Load several LIFT files in parallel worker processes.
+        Returns the ``Lexicon`` of each file, in the order of ``paths``; or,
+        if ``func`` is given, the result of calling ``func`` with each
+        lexicon, in which case the lexicons stay in the worker processes.
+
+        External ranges files are parsed once per distinct content, before
+        the workers start, into the ranges cache (see
+        ``config.RANGES_CACHE``), which worker processes inherit on platforms
+        that fork them. Ranges that come from the cache aren't pickled when
+        lexicons are sent back from the workers.
+
+        :var Iterable[Union[Path, str]] paths: File paths to LIFT files.
+        :var Optional[Callable] func: A function to call with each lexicon.
+            It and its results need to be picklable.
+        :var Optional[int] workers: The number of worker processes [default
+            is one per file, up to the number of CPUs]. If 1, the files are
+            loaded one after the other in the calling process.
+        :var bool lazy: Build each lexicon's entries on first access; see
+            ``Lexicon``. Lexicons sent back from worker processes are built
+            in full in the workers, and each of their entries is sent back
+            pickled on its own and unpickled on first access, as in
+            ``load_snapshot``.
+        :var bool load_ranges: Read external LIFT-RANGES files; see
+            ``Lexicon``.
+        """
+        paths = [Path(p).expanduser() for p in paths]
+        for path in paths:
+            if strip_compression_suffix(path).suffix != ".lift":
+                raise InvalidExtensionError(path.name)
+            if not path.is_file():
+                raise FileNotFoundError
+        if workers is None:
+            workers = min(len(paths), os.cpu_count() or 1)
+        if load_ranges and config.RANGES_CACHE:
+            _cache_external_ranges(paths)
+        if workers <= 1:
+            results = []
+            for path in paths:
+                lexicon = cls(path, lazy=lazy, load_ranges=load_ranges)
+                results.append(lexicon if func is None else func(lexicon))
+            return results
+
+        init_args = (func, lazy, load_ranges)
+        with multiprocessing.Pool(workers, _init_load_worker, init_args) as pool:
+            results = pool.map(_load_in_worker, paths)
+        if func is None:
+            lexicons = []
+            for data, entries in results:
+                lexicon = _load_lexicon(pickle.loads(data), entries)
+                if load_ranges and config.RANGES_CACHE:
+                    lexicon._update_header_from_hrefs()
+                lexicons.append(lexicon)
+            results = lexicons
+        return results
+
+    @classmethod
+    def load_snapshot(cls, path: Union[Path, str]) -> "Lexicon":
+        """Load a ``Lexicon`` saved by ``save_snapshot``.
+        Each entry is only unpickled the first time it is accessed in
+        ``entry_items``. If the LIFT file or its LIFT-RANGES files have
+        changed since the snapshot was saved, or it was saved by another
+        version of LIFT-Utils, the LIFT file is loaded instead, and the
+        snapshot is saved again.
+
+        :var Union[Path, str] path: File path to the snapshot.
+        """
+        path = Path(path).expanduser()
+        with path.open("rb") as f:
+            if f.read(len(_SNAPSHOT_MAGIC)) != _SNAPSHOT_MAGIC:
+                raise InvalidSnapshotError(path.name)
+            info = pickle.load(f)
+            if info["format"] == _SNAPSHOT_FORMAT and _snapshot_is_current(info):
+                lexicon = pickle.load(f)
+                return _load_lexicon(lexicon, pickle.load(f))
+
+        if not info["sources"]:
+            raise InvalidSnapshotError(path.name)
+        lift_path = info["sources"][0][0]
+        lexicon = cls(lift_path)
+        lexicon.save_snapshot(path)
+        return lexicon
+
     def get_item_by_id(self, refid: str) -> Union[Entry, Sense, None]:
         """Return an entry or sense by its ``id`` attribute.
 
@@ -1030,17 +1301,114 @@ class Lexicon(LIFTUtilsBase):
 
         :var str range_name: The name of the header range.
         """
-        for r in self.header.ranges.range_items:
-            if r.id == range_name:
-                for e in r.range_element_items:
-                    yield e.id
+        yield from self.header.ranges.get_range_element_ids(range_name)
 
     def get_ranges(self):
         """Returns a generator object that lists all the range names defined in
         the header.
         """
-        for r in self.header.ranges.range_items:
-            yield r.id
+        yield from self.header.ranges.get_range_ids()
+
+    def refresh(self, path: Optional[Union[Path, str]] = None):
+        """Update the lexicon from a new export of its LIFT file.
+        The file is read incrementally, and only the entries that were added,
+        changed or deleted are rebuilt or removed; the other ``Entry`` objects
+        are kept as they are, in the file's order. Entries are matched by
+        their ``id``, and one counts as changed if its ``dateModified``
+        differs or, for entries without one, if its content hash differs from
+        when it was last read. An entry without a ``dateModified`` is always
+        rebuilt the first time it is refreshed, unless it hasn't been built
+        yet in a lazy lexicon. The header is read again. The search index of
+        each field (see ``search_index``) is kept, and only the rebuilt
+        entries are searched to update it.
+
+        :var Optional[Union[Path, str]] path: File path to the LIFT file
+            [default is the lexicon's ``path``].
+        """
+        if path is None:
+            path = self.path
+        path = Path(path).expanduser()
+        if strip_compression_suffix(path).suffix != ".lift":
+            raise InvalidExtensionError(path.name)
+        if not path.is_file():
+            raise FileNotFoundError
+
+        # Map current entries by id, without building unbuilt ones from XML.
+        if isinstance(self.entry_items, LazyItemList):
+            items = list(self.entry_items.iter_raw())
+        else:
+            items = list(self.entry_items or ())
+        old_items = dict()
+        for i, item in enumerate(items):
+            if isinstance(item, etree._Element):
+                refid = item.attrib.get("id")
+            else:
+                if not isinstance(item, LIFTUtilsBase):
+                    item = self.entry_items[i]
+                refid = item.id
+            if refid:
+                old_items[refid] = item
+
+        old_digests = self._entry_digests
+        self._entry_digests = dict()
+        new_items = []
+        search_index = self._search_index
+        if search_index:
+            old_header_fields = self._header_fields()
+        self.header = None
+        for event, elem in iterparse_elements(path, ("lift", "header", "entry")):
+            if event == "start":
+                if elem.tag == "lift":
+                    version = elem.attrib.get("version")
+                    if version != self.version:
+                        # Nodes of another version can't be kept.
+                        old_items.clear()
+                    self.version = version
+                    if "producer" in elem.attrib:
+                        self.producer = elem.attrib.get("producer")
+                continue
+            if elem.tag == "header":
+                self.header = Header(xml_tree=elem, parent_item=self)
+                continue
+            if elem.tag != "entry":
+                continue
+            refid = elem.attrib.get("id")
+            digest = None
+            if "dateModified" not in elem.attrib:
+                digest = _entry_digest(elem)
+                if refid:
+                    self._entry_digests[refid] = digest
+            old = old_items.pop(refid, None)
+            if old is not None and _entry_is_unchanged(old, elem, digest, old_digests):
+                new_items.append(old)
+            else:
+                entry = Entry(xml_tree=elem, parent_item=self)
+                if self._keep_xml:
+                    entry._source_xml = _entry_source_xml(elem)
+                new_items.append(entry)
+
+        self.path = path
+        self._search_index = None
+        if self.entry_items is None:
+            self.entry_items = new_items or None
+        else:
+            self.entry_items[:] = new_items
+        if search_index and self.header is not None:
+            header_fields = self._header_fields()
+            self._search_index = dict()
+            for field, index in search_index.items():
+                # A field that is now defined in the header, or no longer is,
+                # gives other values; it's indexed again when searched.
+                if (field in header_fields) == (field in old_header_fields):
+                    self._search_index[field] = index.refresh(
+                        self.entry_items or (), header_fields
+                    )
+        if self.header is not None and self._load_external_ranges:
+            self._update_header_from_hrefs()
+        self._analysis_writing_systems = None
+        self._vernacular_writing_systems = None
+        if not self._lazy:
+            self._find_writing_systems()
 
     def show(self):
         """Print an overview of the ``Lexicon`` in the terminal window."""
@@ -1051,85 +1419,315 @@ class Lexicon(LIFTUtilsBase):
             text = "\n".join(slist)
         print(text)
 
-    def to_lift(self, file_path: str):
+    def save_snapshot(self, path: Union[Path, str]):
+        """Save the ``Lexicon`` in a binary format that ``load_snapshot`` can
+        load much faster than the LIFT file. The snapshot records the size,
+        modification time and content hash of the LIFT file and its
+        LIFT-RANGES files, so that it can tell when it's out of date.
+
+        :var Union[Path, str] path: File path to the new snapshot.
+        """
+        path = Path(path).expanduser()
+        sources = []
+        if getattr(self, "path", None):
+            sources.append(_file_fingerprint(self.path))
+            if self.header and self.header.ranges:
+                for href in sorted(set(self.header.ranges._hrefs.values())):
+                    filepath = _ranges_file_path(href, self.path)
+                    sources.append(_file_fingerprint(filepath))
+        info = {
+            "format": _SNAPSHOT_FORMAT,
+            "lib_version": config.LIB_VERSION,
+            "sources": sources,
+        }
+        lexicon, entries = _dump_lexicon(self)
+
+        # Write to a temporary file first, so that a snapshot is never left
+        # partly written.
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with tmp_path.open("wb") as f:
+            f.write(_SNAPSHOT_MAGIC)
+            pickle.dump(info, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.write(lexicon)
+            pickle.dump(entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def to_lift(self, file_path: str, pretty_print: bool = True, workers: int = 1):
         """Save the ``Lexicon`` as a LIFT file.
         The LIFT-RANGES file will be automatically created in the same folder
-        as the LIFT file.
+        as the LIFT file. If the file path ends with a compression suffix,
+        e.g. "lexicon.lift.gz", both files are compressed as they are written;
+        see ``utils.COMPRESSION_OPENERS``. Entries are converted to XML and
+        written one at a time. If the ranges all come from one LIFT-RANGES
+        file, and none of them has been built since (see ``Ranges``), that
+        file is copied as it is instead, or left alone if it's the file to be
+        written. If the ranges weren't read (see ``Lexicon``'s
+        ``load_ranges``), their LIFT-RANGES file is always copied or left
+        alone in the same way, and no LIFT-RANGES file is written if the
+        ranges don't all refer to one that exists.
 
         :var str file_path: Full or relative path to new LIFT file.
+        :var bool pretty_print: If ``False``, the XML is written without line
+            breaks and indentation.
+        :var int workers: The number of worker processes that convert chunks
+            of entries to XML [default is 1, i.e. none]. The workers are
+            forked from the calling process, so this has no effect on
+            platforms that can't fork processes, e.g. Windows. The output is
+            the same as without workers.
         """
-        outfile = (
-            Path(file_path).expanduser().with_suffix(".lift")
-        )  # ensure suffix  # noqa: E501
-        ranges_file = outfile.with_suffix(".lift-ranges")
+        outfile = Path(file_path).expanduser()
+        compression = compression_suffix(outfile)
+        # Ensure suffix.
+        outfile = strip_compression_suffix(outfile).with_suffix(".lift")
+        ranges_file = outfile.with_suffix(f".lift-ranges{compression}")
+        outfile = outfile.with_suffix(f".lift{compression}")
 
         # Write LIFT file.
-        lift_tree = self._to_xml_tree()
-        for _range in lift_tree.find(".//ranges").getchildren():
-            for _range_element in _range:
-                _range.remove(_range_element)
-            for attrib in _range.attrib.keys():
-                if attrib not in ["id", "href"]:
-                    del _range.attrib[attrib]
-        outfile.write_text(self._to_xml(lift_tree))
-
-        # Write LIFT-RANGES file.
-        lift_ranges = self.header.ranges._to_xml_tree()
-        lift_ranges.tag = "lift-ranges"
-        for _range in list(lift_ranges):
-            del _range.attrib["href"]
-        ranges_file.write_text(self._to_xml(lift_ranges))
-
-    def _find(self, text, field="gloss", match_type="contains", get_all=False):
-        items = []
+        attrib = dict()
+        for xml_name, py_name, _ in self._schema.attributes:
+            val = getattr(self, py_name)
+            if val is not None:
+                attrib[xml_name] = str(val)
+        with open_file(outfile, "wb") as f:
+            fragments = self._iter_lift_fragments(pretty_print, workers)
+            write_xml_fragments(f, self.XML_TAG, attrib, fragments, pretty_print)
+
+        # Write LIFT-RANGES file, unless it would be the same as the one that
+        # the ranges were read from.
+        if self._load_external_ranges:
+            source_file = self._unchanged_ranges_file()
+        else:
+            # Without their data, the ranges can only be copied.
+            source_file = self._unread_ranges_file()
+            if source_file is None:
+                return
+        if source_file is None:
+            lift_ranges = self.header.ranges._to_xml_tree()
+            for _range in list(lift_ranges):
+                del _range.attrib["href"]
+            with open_file(ranges_file, "wb") as f:
+                write_xml(
+                    f, "lift-ranges", lift_ranges.attrib, lift_ranges, pretty_print
+                )
+        elif source_file.resolve() != ranges_file.resolve():
+            if compression_suffix(source_file) == compression:
+                shutil.copyfile(source_file, ranges_file)
+            else:
+                with open_file(source_file) as fsrc:
+                    with open_file(ranges_file, "wb") as fdst:
+                        shutil.copyfileobj(fsrc, fdst)
+
+    def _find(
+        self, text, field="gloss", match_type="contains", get_all=False, entries=None
+    ):
+        if entries is None and self._uses_index(field, match_type):
+            index = self._field_index(field)
+            return index.find(text, match_type=match_type, get_all=get_all)
+
+        if entries is None:
+            entries = self.entry_items or ()
+        items = self._iter_matches(text, field, match_type, entries)
+        if get_all:
+            return list(items)
+        return next(items, None)
+
+    def _iter_matches(self, text, field, match_type, entries):
+        """Yield each matching item of the given entries, searching them only
+        as far as the matches that have been taken."""
+        header_fields = self._header_fields()
         target_groups = ["entries", "senses"]
         entry_only_fields = ["lexical-unit", "variant"]
         sense_only_fields = ["gloss", "definition", "grammatical-info"]
-        header_fields = [f.tag for f in self.header.fields.field_items]
         if field in entry_only_fields:
             target_groups.remove("senses")
         elif field in sense_only_fields:
             target_groups.remove("entries")
 
-        for entry in self.entry_items:
-            result = search_entry(
-                entry, text, field, target_groups, header_fields, match_type, get_all
+        for entry in entries:
+            yield from search_entry(
+                entry, text, field, target_groups, header_fields, match_type
             )
-            if result is not None:
-                if not get_all:
-                    return result
-                else:
-                    items.extend(result)
-        if get_all:
-            return items
+
+    def _header_fields(self):
+        """Return the tag of each field defined in the header."""
+        return [f.tag for f in self.header.fields.field_items]
+
+    def _uses_index(self, field, match_type=None):
+        """Return whether a search of all entries for the field is looked up
+        in its index. An exact search only builds the index if building it
+        won't build the entries of a lazy lexicon, since ``find`` could
+        stop at the first match."""
+        if self._use_search_index:
+            return True
+        return match_type == "exact" and not isinstance(
+            self.entry_items, LazyItemList
+        )
+
+    def _field_index(self, field, entries=None):
+        """Return the ``FieldIndex`` of a field of the given entries, or of
+        all of the lexicon's entries. The index of all entries is kept until
+        one of them is modified; see ``_set_modified``.
+        """
+        header_fields = self._header_fields()
+        if entries is not None:
+            return FieldIndex(entries, field, header_fields)
+        if self._search_index is None:
+            self._search_index = dict()
+        entries = self.entry_items or ()
+        index = self._search_index.get(field)
+        if index is None:
+            index = FieldIndex(entries, field, header_fields)
+        elif not index.covers(entries):
+            # Entries were added to, removed from or replaced in
+            # ``entry_items``.
+            index = index.refresh(entries, header_fields)
+        self._search_index[field] = index
+        return index
 
     def _find_writing_systems(self):
-        """Infer the lexicon's writing systems (vernacular and analysis)."""
-        if self.vernacular_writing_systems is None:
-            self.vernacular_writing_systems = []
-        if self.analysis_writing_systems is None:
-            self.analysis_writing_systems = []
+        """Infer the lexicon's writing systems (vernacular and analysis),
+        unless they are already known, e.g. from building the entries in
+        worker processes."""
+        if (
+            self._vernacular_writing_systems is not None
+            and self._analysis_writing_systems is not None
+        ):
+            return
+        if self._vernacular_writing_systems is None:
+            self._vernacular_writing_systems = []
+        if self._analysis_writing_systems is None:
+            self._analysis_writing_systems = []
+        if not self.entry_items:
+            return
 
         for e in self.entry_items:
             writing_systems = get_writing_systems_from_entry(e)
             for lang in writing_systems.get("vernacular"):
-                if lang not in self.vernacular_writing_systems:
-                    self.vernacular_writing_systems.append(lang)
+                if lang not in self._vernacular_writing_systems:
+                    self._vernacular_writing_systems.append(lang)
             for lang in writing_systems.get("analysis"):
-                if lang not in self.analysis_writing_systems:
-                    self.analysis_writing_systems.append(lang)
+                if lang not in self._analysis_writing_systems:
+                    self._analysis_writing_systems.append(lang)
 
     def _from_lift(self, infile):
         infile = Path(infile)
         if not infile.is_file():
             raise FileNotFoundError
-        self._from_xml_tree(xmlfile_to_etree(infile))
-        self._find_writing_systems()
+        built = False
+        if (
+            self._parser_target
+            and not self._lazy
+            and not self._keep_xml
+            and self._workers <= 1
+        ):
+            built = self._from_parser_events(infile)
+        if not built:
+            self._from_xml_tree(xmlfile_to_etree(infile))
+        if not self._lazy:
+            self._find_writing_systems()
+
+    def _from_parser_events(self, infile):
+        """Build the lexicon's nodes while the file is being parsed; see
+        ``NodeBuilder``. Return ``False`` if the file's XML tree is needed
+        instead.
+        """
+        if not NodeBuilder.can_build(infile):
+            return False
+        # The version is set from the root element, if given.
+        self.version = None
+        parser = etree.XMLParser(remove_blank_text=True, target=NodeBuilder(self))
+        try:
+            if compression_suffix(infile):
+                with open_file(infile) as f:
+                    etree.parse(f, parser)
+            else:
+                etree.parse(str(infile), parser)
+        except AmbiguousTextError:
+            self.header = None
+            self.entry_items = None
+            return False
+        if self._load_external_ranges:
+            self._update_header_from_hrefs()
+        return True
+
+    def _iter_lift_fragments(self, pretty_print, workers=1):
+        """Yield the XML of each of the lexicon's entries and of its header,
+        in the same order as ``_to_xml_tree``, as written in the LIFT file;
+        see ``utils.iter_xml_fragments``. The header's ranges only keep
+        their ``id`` and ``href``; their contents go in the LIFT-RANGES file.
+        """
+        for xml_name, py_name, _ in self._schema.elements:
+            val = getattr(self, py_name)
+            if not val:
+                continue
+            if py_name == "entry_items":
+                if workers > 1 and len(val) > 1:
+                    yield from self._serialize_entries_in_workers(pretty_print, workers)
+                else:
+                    yield from iter_xml_fragments(self._iter_entry_xml(), pretty_print)
+                continue
+            if hasattr(val, "append"):  # list-like child element
+                elements = (o._to_xml_tree(tag=xml_name) for o in val)
+                yield from iter_xml_fragments(elements, pretty_print)
+                continue
+            xml_tree = val._to_lift_xml_tree(tag=xml_name)
+            yield from iter_xml_fragments((xml_tree,), pretty_print)
+
+    def _iter_entry_xml(self, start=0, stop=None):
+        """Yield the XML element of each entry from ``start`` to ``stop``,
+        each built only when it's needed. If ``keep_xml`` is set, unmodified
+        entries are yielded as the XML they were read from, either as
+        unbuilt elements or as bytes.
+        """
+        entries = self.entry_items
+        if stop is None:
+            stop = len(entries)
+        if self._keep_xml and isinstance(entries, LazyItemList):
+            items = islice(entries.iter_raw(), start, stop)
+        else:
+            items = (entries[i] for i in range(start, stop))
+        for i, item in enumerate(items, start):
+            if isinstance(item, etree._Element):
+                # An unbuilt entry can't have been modified.
+                yield item
+                continue
+            if not isinstance(item, LIFTUtilsBase):
+                item = entries[i]
+            source_xml = getattr(item, "_source_xml", None)
+            if source_xml is not None:
+                yield source_xml
+            else:
+                yield item._to_xml_tree(tag=Entry.XML_TAG)
+
+    def _serialize_entries_in_workers(self, pretty_print, workers):
+        """Yield the XML of the entries, in chunks converted in worker
+        processes, in document order; see ``_iter_lift_fragments``. The
+        workers are forked, so that they share the lexicon with this process
+        instead of having its nodes pickled. Where processes can't be forked,
+        the entries are converted in this process.
+        """
+        if "fork" not in multiprocessing.get_all_start_methods():
+            yield from iter_xml_fragments(self._iter_entry_xml(), pretty_print)
+            return
+        # Use several chunks per worker to even out the load.
+        count = len(self.entry_items)
+        chunk_size = math.ceil(count / (workers * 4))
+        chunks = [
+            (i, min(i + chunk_size, count), pretty_print)
+            for i in range(0, count, chunk_size)
+        ]
+        context = multiprocessing.get_context("fork")
+        with context.Pool(workers, _init_serialize_worker, (self,)) as pool:
+            yield from pool.imap(_serialize_entries, chunks)
 
     def _item_from_id(self, refid, item_type="self"):
         if not self.entry_items:
             return
-        for entry in self.entry_items:
+        if isinstance(self.entry_items, LazyItemList):
+            entries = self._iter_entries_with_id(refid)
+        else:
+            entries = self.entry_items
+        for entry in entries:
             if entry.id == refid:
                 if item_type == "self":
                     return entry
@@ -1150,39 +1748,396 @@ class Lexicon(LIFTUtilsBase):
                                 elif item_type == "parent":
                                     return sense
 
+    def _iter_entries_with_id(self, refid):
+        """Yield built entries, plus any unbuilt entries whose XML includes an
+        entry, sense, or subsense with the given ``id``. Other unbuilt entries
+        are skipped without being built.
+        """
+        encoded_id = refid.encode()
+        for i, item in enumerate(self.entry_items.iter_raw()):
+            if isinstance(item, LIFTUtilsBase):
+                yield item
+            elif isinstance(item, etree._Element):
+                if xml_has_id(item, refid):
+                    yield self.entry_items[i]
+            elif encoded_id in item:
+                # A pickled entry (see ``load_snapshot``) has its ids, and those
+                # of its senses, as UTF-8 text.
+                yield self.entry_items[i]
+
     def _from_xml_tree(self, xml_tree):
         self.version = xml_tree.attrib.get("version")
-        # Allow global access to version number.
-        config.LIFT_VERSION = self.version
+        detach_entries = self._lazy or self._workers > 1
+        if detach_entries or self._keep_xml:
+            entry_elements = xml_tree.findall("entry")
+        if detach_entries:
+            # Detach entry elements so that they are kept as-is, to be built
+            # on first access or by worker processes.
+            for elem in entry_elements:
+                xml_tree.remove(elem)
         # Update object attributes.
         super()._from_xml_tree(xml_tree)
-        # Update header range data from external file(s).
-        ext_hrefs = set()
-        for r in self.header.ranges.range_items:
-            if r.href:
-                ext_hrefs.add(r.href)
+        if self._lazy:
+            build = None
+            if self._keep_xml:
+                build = partial(_build_entry_keeping_xml, lexicon=self)
+            self.entry_items = LazyItemList(
+                Entry, entry_elements, parent_item=self, build=build
+            )
+        elif detach_entries and entry_elements:
+            self.entry_items = self._build_entries_in_workers(entry_elements)
+        if self._keep_xml and not detach_entries and self.entry_items:
+            for entry, elem in zip(self.entry_items, entry_elements):
+                entry._source_xml = _entry_source_xml(elem)
+        if self._load_external_ranges:
+            self._update_header_from_hrefs()
+
+    def _build_entries_in_workers(self, entry_elements):
+        """Build entries from their XML elements in worker processes.
+        The elements are sent in chunks, and each entry comes back pickled on
+        its own, in document order, to be unpickled on first access so that
+        it links to this lexicon. The workers also find each chunk's writing
+        systems, so that finding the lexicon's doesn't unpickle every entry.
+        """
+        # Use several chunks per worker to even out the load.
+        chunk_size = math.ceil(len(entry_elements) / (self._workers * 4))
+        chunks = []
+        for i in range(0, len(entry_elements), chunk_size):
+            chunk = etree.Element(self.XML_TAG)
+            chunk.extend(entry_elements[i : i + chunk_size])
+            chunks.append((self.version, etree.tostring(chunk), self._keep_xml))
+        entries = []
+        self._vernacular_writing_systems = []
+        self._analysis_writing_systems = []
+        with multiprocessing.Pool(self._workers) as pool:
+            for data, writing_systems in pool.imap(_build_entries, chunks):
+                entries.extend(data)
+                for lang in writing_systems["vernacular"]:
+                    if lang not in self._vernacular_writing_systems:
+                        self._vernacular_writing_systems.append(lang)
+                for lang in writing_systems["analysis"]:
+                    if lang not in self._analysis_writing_systems:
+                        self._analysis_writing_systems.append(lang)
+        return LazyItemList(
+            Entry, entries, parent_item=self, build=partial(load_nodes, root=self)
+        )
+
+    def _iter_range_hrefs(self):
+        """Yield the ``href`` of each of the header's ranges, without building
+        them."""
+        for item in self.header.ranges._iter_raw_ranges():
+            if isinstance(item, etree._Element):
+                yield item.attrib.get("href")
+            else:
+                yield item.href
+
+    def _update_header_from_hrefs(self):
+        """Update header range data from external file(s)."""
+        ext_hrefs = {href for href in self._iter_range_hrefs() if href}
+        self._ranges_sources = dict()
         for p in ext_hrefs:
             self._update_header_from_href(p)
-        # Update ranges xml_trees.
-        self.header.ranges._to_xml_tree()
 
     def _update_header_from_href(self, href: URL):
-        filepath = unquote(urlparse(href).path)
+        filepath = _ranges_file_path(href, getattr(self, "path", None))
+        if config.RANGES_CACHE:
+            xml_elements = _load_ranges(filepath, _RANGES_CACHE)
+        else:
+            xml_elements = _load_ranges(filepath, dict())
+        self._ranges_sources[href] = (_ranges_digest(filepath), set(xml_elements))
+        # Ranges are built from the XML on first access.
+        self.header.ranges._use_external_ranges(xml_elements, href)
+
+    def _unchanged_ranges_file(self):
+        """Return the path of the external ranges file that all of the
+        header's ranges come from, if that file and the ranges are unchanged
+        since it was read; otherwise return ``None``. A range that has been
+        built may have been changed.
+        """
+        if len(self._ranges_sources) != 1:
+            return None
+        [(href, (digest, range_ids))] = self._ranges_sources.items()
+        ranges = self.header.ranges
+        found_ids = set()
+        for item in ranges._iter_raw_ranges():
+            if not isinstance(item, etree._Element):
+                return None
+            range_id = item.attrib.get("id")
+            if ranges._hrefs.get(range_id) != href:
+                return None
+            found_ids.add(range_id)
+        if found_ids != range_ids:
+            return None
+        filepath = _ranges_file_path(href, getattr(self, "path", None))
         try:
-            xml_tree = xmlfile_to_etree(filepath)
+            if _ranges_digest(filepath) != digest:
+                return None
         except OSError:
-            # Probably absolute URI from a different device.
-            # Try same file name, but in same dir as current LIFT file.
-            relpath = self.path.parent / Path(filepath).name
-            xml_tree = xmlfile_to_etree(relpath)
-
-        # Update model data.
-        for _range in xml_tree.getchildren():
-            for i, r in enumerate(self.header.ranges.range_items[:]):
-                if _range.attrib.get("id") == r.id:
-                    if self.version == config.LIFT_VERSION_FIELDWORKS:
-                        self.header.ranges.range_items[i] = Range13(xml_tree=_range)  # noqa: E501
-                    else:
-                        self.header.ranges.range_items[i] = Range(xml_tree=_range)  # noqa: E501
-                    self.header.ranges.range_items[i].href = r.href  # add href
+            return None
+        return filepath
+
+    def _unread_ranges_file(self):
+        """Return the path of the external ranges file that all of the
+        header's ranges refer to, if it exists, when the ranges weren't read
+        from it; see ``load_ranges``. Otherwise return ``None``.
+        """
+        if not self.header or not self.header.ranges:
+            return None
+        hrefs = set(self._iter_range_hrefs())
+        if len(hrefs) != 1 or None in hrefs:
+            return None
+        filepath = _ranges_file_path(hrefs.pop(), getattr(self, "path", None))
+        if not filepath.is_file():
+            return None
+        return filepath
+
+
+# Snapshots start with a fixed header, then a pickled dict describing the
+# snapshot, the pickled lexicon without its entries, and a pickled list of
+# the entries, each pickled on its own; see ``Lexicon.save_snapshot``.
+_SNAPSHOT_MAGIC = b"LIFT-Utils snapshot\n"
+_SNAPSHOT_FORMAT = 3
+
+
+def _dump_lexicon(lexicon):
+    """Pickle a ``Lexicon`` without its entries or search index, and each of
+    its entries on its own, so that ``_load_lexicon`` can unpickle each entry
+    on its own."""
+    entries = dump_each_node(lexicon.entry_items or (), lexicon)
+    entry_items = lexicon.entry_items
+    search_index = lexicon._search_index
+    lexicon.entry_items = None
+    lexicon._search_index = None
+    try:
+        data = pickle.dumps(lexicon, protocol=pickle.HIGHEST_PROTOCOL)
+    finally:
+        lexicon.entry_items = entry_items
+        lexicon._search_index = search_index
+    return data, entries
+
+
+def _load_lexicon(lexicon, entries):
+    """Give a ``Lexicon`` unpickled from ``_dump_lexicon`` its pickled
+    entries, each of which is unpickled the first time it is accessed in
+    ``entry_items``."""
+    # Also make the lexicon's version the default one; see the ``version``
+    # setter.
+    lexicon.version = lexicon.version
+    if entries:
+        lexicon.entry_items = LazyItemList(
+            Entry, entries, parent_item=lexicon, build=partial(load_nodes, root=lexicon)
+        )
+    return lexicon
+
+
+def _entry_source_xml(elem):
+    """Return an entry element's XML, as kept by ``Lexicon``'s
+    ``keep_xml``."""
+    return etree.tostring(
+        elem, encoding="UTF-8", xml_declaration=False, with_tail=False
+    )
+
+
+def _build_entry_keeping_xml(elem, lexicon):
+    """Build an unbuilt entry of a lazy ``Lexicon`` with ``keep_xml`` set."""
+    entry = Entry(xml_tree=elem, parent_item=lexicon)
+    entry._source_xml = _entry_source_xml(elem)
+    return entry
+
+
+def _file_fingerprint(filepath):
+    """Return a file's path, modification time, size and content hash."""
+    stat = filepath.stat()
+    digest = hashlib.sha256(filepath.read_bytes()).hexdigest()
+    return (str(filepath.resolve()), stat.st_mtime_ns, stat.st_size, digest)
+
+
+def _snapshot_is_current(info):
+    """Return ``True`` if a snapshot's source files are unchanged."""
+    if info["lib_version"] != config.LIB_VERSION:
+        return False
+    for filepath, mtime_ns, size, digest in info["sources"]:
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return False
+        if stat.st_size != size:
+            return False
+        if stat.st_mtime_ns != mtime_ns:
+            # The file has been touched; only its content counts.
+            if _file_fingerprint(Path(filepath))[3] != digest:
+                return False
+    return True
+
+
+def _entry_digest(elem):
+    """Return a hash of an entry's XML that doesn't depend on its formatting."""
+    return hashlib.sha256(etree.tostring(elem, method="c14n")).digest()
+
+
+def _entry_is_unchanged(item, elem, digest, old_digests):
+    """Return ``True`` if an entry's new XML element has the same
+    ``dateModified`` as the current entry, given as a node or as its XML
+    element; or, without one, the same content hash.
+    """
+    if isinstance(item, etree._Element):
+        date_modified = item.attrib.get("dateModified")
+        if digest is not None:
+            return date_modified is None and _entry_digest(item) == digest
+    else:
+        date_modified = item.date_modified
+        if digest is not None:
+            return date_modified is None and old_digests.get(item.id) == digest
+    new_date_modified = elem.attrib.get("dateModified")
+    return date_modified is not None and str(date_modified) == new_date_modified
+
+
+def _ranges_file_path(href, lift_path=None):
+    """Return the path of the ranges file referred to by ``href``."""
+    filepath = Path(unquote(urlparse(href).path))
+    if not filepath.is_file() and lift_path is not None:
+        # Probably absolute URI from a different device.
+        # Try same file name, but in same dir as current LIFT file.
+        filepath = lift_path.parent / filepath.name
+        # A compressed LIFT file may come with a ranges file compressed the
+        # same way.
+        compression = compression_suffix(lift_path)
+        if compression and not filepath.is_file():
+            compressed_path = filepath.with_name(f"{filepath.name}{compression}")
+            if compressed_path.is_file():
+                filepath = compressed_path
+    return filepath
+
+
+# The XML of each range in a ranges file, by the file's digest, and the
+# latest digest of each ranges file, with the modification time and size it
+# was computed for, by path; see ``config.RANGES_CACHE``. The XML is never
+# modified, so it can be shared. Only the current content of each file is
+# kept, so that re-exporting a file doesn't leave its old XML behind.
+_RANGES_CACHE = dict()
+_RANGES_DIGESTS = dict()
+
+
+def _ranges_digest(filepath):
+    """Return the content hash of a ranges file, which is only computed
+    again if the file's modification time or size has changed."""
+    stat = filepath.stat()
+    path = str(filepath.resolve())
+    known = _RANGES_DIGESTS.get(path)
+    if known is not None and known[:2] == (stat.st_mtime_ns, stat.st_size):
+        return known[2]
+    digest = hashlib.sha256(filepath.read_bytes()).hexdigest()
+    _RANGES_DIGESTS[path] = (stat.st_mtime_ns, stat.st_size, digest)
+    if known is not None and known[2] != digest:
+        _forget_ranges(known[2])
+    return digest
+
+
+def _forget_ranges(digest):
+    """Drop the cached XML of a ranges file's previous content, unless
+    another file that still exists has the same content."""
+    for path, (_, _, other_digest) in list(_RANGES_DIGESTS.items()):
+        if other_digest != digest:
+            continue
+        if os.path.exists(path):
+            return
+        del _RANGES_DIGESTS[path]
+    _RANGES_CACHE.pop(digest, None)
+
+
+def _load_ranges(filepath, cache):
+    """Return the XML element of each range in a ranges file, by id. The XML
+    is taken from ``cache`` if a file with the same content has already been
+    parsed; otherwise it is parsed and added to ``cache``.
+    """
+    digest = _ranges_digest(filepath)
+    xml_elements = cache.get(digest)
+    if xml_elements is None:
+        xml_tree = xmlfile_to_etree(filepath)
+        xml_elements = {r.attrib.get("id"): r for r in xml_tree.iterfind("range")}
+        xml_elements = cache.setdefault(digest, xml_elements)
+    return xml_elements
+
+
+def _cache_external_ranges(paths):
+    """Parse the external ranges files of the given LIFT files into the
+    ranges cache. Only each file's header is read."""
+    for path in paths:
+        hrefs = set()
+        with closing(iterparse_elements(path, ("header", "entry"))) as events:
+            for event, elem in events:
+                if elem.tag == "header" and event == "end":
+                    for r in elem.iterfind("ranges/range"):
+                        if r.attrib.get("href"):
+                            hrefs.add(r.attrib.get("href"))
+                # The header comes before the entries, so stop there.
+                if event == "end" or elem.tag == "entry":
                     break
+        for href in hrefs:
+            filepath = _ranges_file_path(href, path)
+            if filepath.is_file():
+                _load_ranges(filepath, _RANGES_CACHE)
+
+
+# The arguments of ``Lexicon.load_many`` in each of its worker processes.
+_load_worker_args = None
+_serialize_worker_lexicon = None
+
+
+def _init_load_worker(*args):
+    global _load_worker_args
+    _load_worker_args = args
+
+
+def _load_in_worker(path):
+    """Load a LIFT file and return its ``Lexicon`` pickled by
+    ``_dump_lexicon``, or the result of the user's function. This runs in a
+    worker process; see ``Lexicon.load_many``."""
+    func, lazy, load_ranges = _load_worker_args
+    if func is not None:
+        return func(Lexicon(path, lazy=lazy, load_ranges=load_ranges))
+    lexicon = Lexicon(path, load_ranges=load_ranges)
+    if load_ranges and config.RANGES_CACHE and lexicon.header:
+        # The calling process has the same ranges in its cache.
+        lexicon.header.ranges._restore_external_ranges()
+    return _dump_lexicon(lexicon)
+
+
+def _init_serialize_worker(lexicon):
+    global _serialize_worker_lexicon
+    _serialize_worker_lexicon = lexicon
+
+
+def _serialize_entries(args):
+    """Return the XML of a chunk of entries of the forked ``Lexicon``, as
+    written in the LIFT file. This runs in a worker process; see
+    ``Lexicon._serialize_entries_in_workers``."""
+    start, stop, pretty_print = args
+    xml = _serialize_worker_lexicon._iter_entry_xml(start, stop)
+    return b"".join(iter_xml_fragments(xml, pretty_print))
+
+
+def _build_entries(args):
+    """Build the entries of a chunk of ``entry`` elements, and return each of
+    them pickled on its own, with the chunk's writing systems. This runs in a
+    worker process; see ``Lexicon._build_entries_in_workers``."""
+    version, xml, keep_xml = args
+    lexicon = Lexicon(version=version)
+    chunk = etree.fromstring(xml, config.XML_PARSER)
+    entries = []
+    for elem in chunk:
+        if keep_xml:
+            entries.append(_build_entry_keeping_xml(elem, lexicon))
+        else:
+            entries.append(Entry(xml_tree=elem, parent_item=lexicon))
+    lexicon.entry_items = entries
+    lexicon._find_writing_systems()
+    writing_systems = {
+        "vernacular": lexicon.vernacular_writing_systems,
+        "analysis": lexicon.analysis_writing_systems,
+    }
+    return dump_each_node(entries, lexicon), writing_systems
+
+
+# Build all node schemas for the known LIFT versions once at import time.
+build_schemas((config.LIFT_VERSION_FIELDWORKS, config.LIFT_VERSION_LATEST))
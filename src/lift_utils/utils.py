@@ -1,7 +1,12 @@
 """Various utility functions."""
 
+import bz2
+import gzip
+import lzma
 import re
 from datetime import datetime, timezone
+from itertools import chain
+from pathlib import Path
 
 import unidecode
 from lxml import etree
@@ -53,168 +58,238 @@ def sort_xml_elements(xml_tree):
             el[:] = sorted_children
 
 
+# Files whose names end with one of these suffixes, e.g. "lexicon.lift.gz",
+# are compressed, and are (de)compressed as they are read or written.
+COMPRESSION_OPENERS = {
+    ".bz2": bz2.open,
+    ".gz": gzip.open,
+    ".xz": lzma.open,
+}
+
+
+def compression_suffix(filepath):
+    """Return the file's compression suffix, or "" if it isn't compressed."""
+    suffix = Path(filepath).suffix
+    return suffix if suffix in COMPRESSION_OPENERS else ""
+
+
+def open_file(filepath, mode="rb", **kwargs):
+    """Open a file, which is compressed or decompressed on the fly if its
+    name has a compression suffix; see ``COMPRESSION_OPENERS``."""
+    opener = COMPRESSION_OPENERS.get(compression_suffix(filepath), open)
+    return opener(filepath, mode, **kwargs)
+
+
+def strip_compression_suffix(filepath):
+    """Return the file path without its compression suffix, if any."""
+    filepath = Path(filepath)
+    if compression_suffix(filepath):
+        filepath = filepath.with_suffix("")
+    return filepath
+
+
 def xmlfile_to_etree(filepath):
+    if compression_suffix(filepath):
+        with open_file(filepath) as f:
+            return etree.parse(f, config.XML_PARSER).getroot()
     xml_tree = etree.parse(str(filepath), config.XML_PARSER).getroot()
     return xml_tree
 
 
+def iterparse_elements(filepath, tags):
+    """Yield ("start", elem) and ("end", elem) events for the given tags.
+    Each element is cleared after its "end" event has been handled, along
+    with any earlier siblings, so that the tree never holds more than the
+    current element.
+    """
+    # The file is opened here so that it's closed even if the caller stops
+    # early and closes the generator.
+    with open_file(filepath) as f:
+        context = etree.iterparse(
+            f,
+            events=("start", "end"),
+            tag=tags,
+            remove_blank_text=True,
+        )
+        for event, elem in context:
+            yield event, elem
+            if event == "end":
+                elem.clear(keep_tail=True)
+                parent = elem.getparent()
+                if parent is not None:
+                    while elem.getprevious() is not None:
+                        del parent[0]
+        del context
+
+
+def write_xml(f, tag, attrib, children, pretty_print=True):
+    """Write an XML document to a binary file, one child element of its root
+    element at a time, so that the whole tree is never held in memory. The
+    output is the same as that of ``etree_to_xmlstring``, encoded as UTF-8,
+    or, if ``pretty_print`` is ``False``, the same without line breaks and
+    indentation.
+
+    :var f: A file object opened for writing bytes.
+    :var str tag: The root element's tag.
+    :var dict attrib: The root element's attributes.
+    :var Iterable children: The root element's children; see
+        ``iter_xml_fragments``.
+    :var bool pretty_print: Add line breaks and indentation.
+    """
+    fragments = iter_xml_fragments(children, pretty_print)
+    write_xml_fragments(f, tag, attrib, fragments, pretty_print)
+
+
+def write_xml_fragments(f, tag, attrib, fragments, pretty_print=True):
+    """Write an XML document to a binary file, given the XML of its root
+    element's children as made by ``iter_xml_fragments``; see
+    ``write_xml``.
+
+    :var f: A file object opened for writing bytes.
+    :var str tag: The root element's tag.
+    :var dict attrib: The root element's attributes.
+    :var Iterable[bytes] fragments: The XML of the root element's children.
+    :var bool pretty_print: Add line breaks and indentation.
+    """
+    root = etree.Element(tag, attrib)
+    empty = etree.tostring(root, encoding="UTF-8", xml_declaration=False)
+    f.write(b"<?xml version='1.0' encoding='UTF-8'?>\n")
+    fragments = iter(fragments)
+    fragment = next(fragments, None)
+    if fragment is None:
+        f.write(empty)
+        return
+    # The start tag is the empty element's tag without its "/".
+    f.write(empty[:-2] + b">")
+    if pretty_print:
+        f.write(b"\n")
+    for fragment in chain((fragment,), fragments):
+        f.write(fragment)
+    f.write(f"</{tag}>".encode())
+
+
+def iter_xml_fragments(children, pretty_print=True):
+    """Yield the XML of each of the given child elements of a root element,
+    as ``write_xml_fragments`` writes it in the document: encoded as UTF-8,
+    and, if ``pretty_print`` is ``True``, indented and followed by a line
+    break.
+
+    :var Iterable children: The child elements, each either an
+        ``etree._Element`` or its XML as UTF-8 ``bytes`` without line breaks
+        and indentation, which is yielded as it is if ``pretty_print`` is
+        ``False``.
+    :var bool pretty_print: Add line breaks and indentation.
+    """
+    # Each child is serialized inside an empty root element, so that libxml2
+    # indents it at its depth in the document.
+    root = etree.Element("_")
+    start = len(b"<_>")
+    end = len(b"</_>")
+    if pretty_print:
+        # Also leave out the line breaks after the root element's tags.
+        start += 1
+        end += 1
+    for child in children:
+        if isinstance(child, bytes):
+            if not pretty_print:
+                yield child
+                continue
+            child = etree.fromstring(child, config.XML_PARSER)
+        root.append(child)
+        data = etree.tostring(
+            root, encoding="UTF-8", xml_declaration=False, pretty_print=pretty_print
+        )
+        root.remove(child)
+        yield data[start:-end]
+
+
 def xmlstring_to_etree(xmlstring):
     xml_tree = etree.fromstring(xmlstring, config.XML_PARSER)
     return xml_tree
 
 
 def etree_to_xmlstring(xml_tree):
-    return (
-        etree.tostring(
-            xml_tree, encoding="UTF-8", pretty_print=True, xml_declaration=True
-        )
-        .decode()
-        .rstrip()
-    )
+    return etree_to_xmlbytes(xml_tree).decode()
 
 
-def search_entry(entry, text, field, target_groups, header_fields, match_type, get_all):
-    items = []
+def etree_to_xmlbytes(xml_tree):
+    """Return the same XML as ``etree_to_xmlstring``, encoded as UTF-8."""
+    return etree.tostring(
+        xml_tree, encoding="UTF-8", pretty_print=True, xml_declaration=True
+    ).rstrip()
+
+
+def search_entry(entry, text, field, target_groups, header_fields, match_type):
+    """Yield the entry, or each of its senses and subsenses, once for each of
+    its values of the given field that matches."""
     if "senses" in target_groups:
         if not entry.sense_items:
-            if not get_all:
-                return
-            else:
-                return items
+            return
         for sense in entry.sense_items:
-            result = search_sense(
-                sense, text, field, target_groups, header_fields, match_type, get_all
+            yield from search_sense(
+                sense, text, field, target_groups, header_fields, match_type
             )
-            if result is not None:
-                if not get_all:
-                    return result
-                else:
-                    items.extend(result)
-
             if not sense.subsense_items:
                 continue
             for subsense in sense.subsense_items:
-                result = search_sense(
-                    subsense,
-                    text,
-                    field,
-                    target_groups,
-                    header_fields,
-                    match_type,
-                    get_all,
+                yield from search_sense(
+                    subsense, text, field, target_groups, header_fields, match_type
                 )
-                if result is not None:
-                    if not get_all:
-                        return result
-                    else:
-                        items.extend(result)
 
     if "entries" in target_groups:
         if field == "lexical-unit":
             if not entry.lexical_unit or not entry.lexical_unit.form_items:
-                if not get_all:
-                    return
-                else:
-                    return items
+                return
             if form_items_has_match(entry.lexical_unit.form_items, text, match_type):
-                if not get_all:
-                    return entry
-                else:
-                    items.append(entry)
+                yield entry
         elif field == "variant":
             if not entry.variant_items:
-                if not get_all:
-                    return
-                else:
-                    return items
+                return
             for variant in entry.variant_items:
                 if not variant.form_items:
                     continue
                 if form_items_has_match(variant.form_items, text, match_type):
-                    if not get_all:
-                        return entry
-                    else:
-                        items.append(entry)
+                    yield entry
         elif field in header_fields:
             if not entry.field_items:
-                if not get_all:
-                    return
-                else:
-                    return items
+                return
             for field_item in entry.field_items:
                 if field_item.type == field and field_item.form_items:
                     if form_items_has_match(field_item.form_items, text, match_type):
-                        if not get_all:
-                            return entry
-                        else:
-                            items.append(entry)
-    if get_all:
-        return items
+                        yield entry
 
 
-def search_sense(sense, text, field, target_groups, header_fields, match_type, get_all):
-    items = []
+def search_sense(sense, text, field, target_groups, header_fields, match_type):
+    """Yield the sense once for each of its values of the given field that
+    matches."""
     if field == "gloss":
         if not sense.gloss_items:
-            if not get_all:
-                return
-            else:
-                return items
+            return
         for gloss in sense.gloss_items:
             if text in str(gloss.text):
-                if not get_all:
-                    return sense
-                else:
-                    items.append(sense)
+                yield sense
     elif field == "definition":
-        if not sense.definition or not sense.definition.form_items:  # noqa: E501
-            if not get_all:
-                return
-            else:
-                return items
+        if not sense.definition or not sense.definition.form_items:
+            return
         if form_items_has_match(sense.definition.form_items, text, match_type):
-            if not get_all:
-                return sense
-            else:
-                items.append(sense)
+            yield sense
     elif field == "grammatical-info":
         if not sense.grammatical_info:
-            if not get_all:
-                return
-            else:
-                return items
+            return
         if text in str(sense.grammatical_info):
-            if not get_all:
-                return sense
-            else:
-                items.append(sense)
+            yield sense
     elif field in header_fields:
         if not sense.field_items:
-            if not get_all:
-                return
-            else:
-                return items
+            return
         for field_item in sense.field_items:
             if field_item.type == field and field_item.form_items:
                 if form_items_has_match(field_item.form_items, text, match_type):
-                    if not get_all:
-                        return sense
-                    else:
-                        items.append(sense)
-    if get_all:
-        return items
+                    yield sense
 
 
 def form_items_has_match(form_items, text, match_type):
     for form in form_items:
-        if form.__class__.__name__ == "Span":
-            value = ""
-            if form.pcdata:
-                value += str(form.pcdata)
-            if form.tail:
-                value += str(form.tail)
-        else:
-            value = str(form.text)
+        value = form_text(form)
         if match_type == "contains":
             if text in value:
                 return True
@@ -226,6 +301,33 @@ def form_items_has_match(form_items, text, match_type):
                 return True
 
 
+def form_text(form):
+    """Return the text of a form item that ``form_items_has_match`` searches."""
+    if form.__class__.__name__ == "Span":
+        value = ""
+        if form.pcdata:
+            value += str(form.pcdata)
+        if form.tail:
+            value += str(form.tail)
+        return value
+    return str(form.text)
+
+
+def xml_has_id(entry_elem, refid):
+    """Return ``True`` if an ``entry`` element, or one of its senses or
+    subsenses, has the given ``id`` attribute.
+    """
+    if entry_elem.get("id") == refid:
+        return True
+    for sense in entry_elem.iterchildren("sense"):
+        if sense.get("id") == refid:
+            return True
+        for subsense in sense.iterchildren("subsense"):
+            if subsense.get("id") == refid:
+                return True
+    return False
+
+
 def get_current_timestamp():
     return datetime.strftime(datetime.now(timezone.utc), "%Y-%m-%dT%H:%M:%SZ")
 
@@ -0,0 +1,508 @@
+"""Time common operations on scaled-up copies of the test LIFT files.
+
+Usage: python -m tests.benchmarks [-n ENTRIES] [-r REPEAT] [BENCHMARK ...]
+"""
+
+import argparse
+import contextlib
+import gc
+import multiprocessing
+import os
+import tempfile
+import time
+import tracemalloc
+from itertools import islice
+from pathlib import Path
+
+from lxml import etree
+
+from lift_utils import config, demos, header, lexicon, utils
+
+from . import DATA_PATH, SANGO_LIFT
+from .utils import write_scaled_lift
+
+LIFT_GOOD = DATA_PATH / "lexicon_good_v0.13_FW.lift"
+SANGO_RANGES = SANGO_LIFT.with_suffix(".lift-ranges")
+BENCHMARKS = dict()
+
+
+def benchmark(func=None, unit="s"):
+    def register(func):
+        BENCHMARKS[func.__name__] = (func, unit)
+        return func
+
+    if func is None:
+        return register
+    return register(func)
+
+
+def best_time(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def traced_size(func):
+    """Return the result of ``func`` and the Python memory that it still
+    holds when it returns."""
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def peak_memory_growth(func, *args):
+    """Run ``func`` in a new process, and return how much it raised the
+    process's peak memory use (resident set size), in MB. Unlike
+    ``traced_size``, this includes memory used by lxml. Linux only."""
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(_peak_memory_growth, (func, *args))
+
+
+def _peak_memory_growth(func, *args):
+    before = _peak_memory()
+    func(*args)
+    return _peak_memory() - before
+
+
+def _reset_peak_memory():
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")
+
+
+def _peak_memory():
+    # VmHWM starts afresh in each new process, unlike ru_maxrss, which is
+    # kept across exec().
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+
+
+@benchmark
+def entry_construction(lift_path, repeat):
+    """Build every ``Entry`` from an already-parsed XML tree."""
+    xml_tree = etree.parse(str(lift_path), config.XML_PARSER).getroot()
+    config.LIFT_VERSION = xml_tree.get("version")
+    elements = xml_tree.findall("entry")
+
+    def run():
+        for elem in elements:
+            lexicon.Entry(xml_tree=elem)
+
+    return best_time(run, repeat)
+
+
+@benchmark
+def sense_construction(lift_path, repeat):
+    """Build every ``Sense`` from an already-parsed XML tree."""
+    xml_tree = etree.parse(str(lift_path), config.XML_PARSER).getroot()
+    config.LIFT_VERSION = xml_tree.get("version")
+    elements = xml_tree.findall("entry/sense")
+
+    def run():
+        for elem in elements:
+            lexicon.Sense(xml_tree=elem)
+
+    return best_time(run, repeat)
+
+
+@benchmark
+def lexicon_load(lift_path, repeat):
+    """Load a ``Lexicon`` from file, including its external ranges."""
+    return best_time(lambda: lexicon.Lexicon(lift_path), repeat)
+
+
+@benchmark
+def lexicon_load_parser_target(lift_path, repeat):
+    """Load a ``Lexicon`` from file, building nodes from the XML parser's
+    events."""
+    return best_time(lambda: lexicon.Lexicon(lift_path, parser_target=True), repeat)
+
+
+@benchmark(unit="MB")
+def lexicon_load_peak_memory(lift_path, repeat):
+    """Measure the peak memory used to load a ``Lexicon`` from file."""
+    return peak_memory_growth(lexicon.Lexicon, lift_path)
+
+
+@benchmark(unit="MB")
+def lexicon_load_parser_target_peak_memory(lift_path, repeat):
+    """Measure the peak memory used to load a ``Lexicon`` from file, building
+    nodes from the XML parser's events."""
+    return peak_memory_growth(_load_with_parser_target, lift_path)
+
+
+def _load_with_parser_target(lift_path):
+    lexicon.Lexicon(lift_path, parser_target=True)
+
+
+@benchmark
+def lexicon_save(lift_path, repeat):
+    """Save a ``Lexicon`` as a LIFT file."""
+    return save_time(lift_path, repeat, pretty_print=True)
+
+
+@benchmark
+def lexicon_save_compact(lift_path, repeat):
+    """Save a ``Lexicon`` as a LIFT file without line breaks and
+    indentation."""
+    return save_time(lift_path, repeat, pretty_print=False)
+
+
+@benchmark
+def lexicon_save_workers(lift_path, repeat):
+    """Save a ``Lexicon`` as a LIFT file, converting entries to XML in one
+    worker process per CPU."""
+    lex = lexicon.Lexicon(lift_path)
+    workers = os.cpu_count()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / lift_path.name
+        return best_time(lambda: lex.to_lift(path, workers=workers), repeat)
+
+
+@benchmark
+def lexicon_save_keep_xml(lift_path, repeat):
+    """Save a ``Lexicon`` that keeps its entries' XML as a LIFT file, after
+    modifying one entry in 50."""
+    lex = lexicon.Lexicon(lift_path, keep_xml=True)
+    for entry in lex.entry_items[::50]:
+        entry.set_date_modified()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / lift_path.name
+        return best_time(lambda: lex.to_lift(path), repeat)
+
+
+@benchmark
+def lexicon_save_unchanged_ranges(lift_path, repeat):
+    """Save a ``Lexicon`` whose ranges all come, unchanged, from its
+    LIFT-RANGES file, which is copied rather than written again."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "saved" / lift_path.name
+        path.parent.mkdir()
+        lexicon.Lexicon(lift_path).to_lift(path)
+        lex = lexicon.Lexicon(path)
+        path = Path(tmp) / lift_path.name
+        return best_time(lambda: lex.to_lift(path), repeat)
+
+
+@benchmark(unit="MB")
+def lexicon_save_peak_memory(lift_path, repeat):
+    """Measure the peak memory used to save a loaded ``Lexicon`` as a LIFT
+    file."""
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(_save_peak_memory_growth, (lift_path,))
+
+
+def save_time(lift_path, repeat, pretty_print):
+    lex = lexicon.Lexicon(lift_path)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / lift_path.name
+        return best_time(lambda: lex.to_lift(path, pretty_print), repeat)
+
+
+def _save_peak_memory_growth(lift_path):
+    lex = lexicon.Lexicon(lift_path)
+    # Leave out the memory used while loading.
+    gc.collect()
+    _reset_peak_memory()
+    with tempfile.TemporaryDirectory() as tmp:
+        return _peak_memory_growth(lex.to_lift, Path(tmp) / lift_path.name)
+
+
+@benchmark(unit="MB")
+def lexicon_print_peak_memory(lift_path, repeat):
+    """Measure the peak memory used to print a loaded ``Lexicon`` as XML."""
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(_print_peak_memory_growth, (lift_path,))
+
+
+def _print_peak_memory_growth(lift_path):
+    lex = lexicon.Lexicon(lift_path)
+    gc.collect()
+    _reset_peak_memory()
+    with open(os.devnull, "w") as f, contextlib.redirect_stdout(f):
+        return _peak_memory_growth(lex.print)
+
+
+@benchmark(unit="MB/s")
+def lexicon_read_throughput(lift_path, repeat):
+    """Load a ``Lexicon`` from an uncompressed LIFT file, in MB of LIFT per
+    second."""
+    return read_throughput(lift_path, "", repeat)
+
+
+@benchmark(unit="MB/s")
+def lexicon_read_throughput_gz(lift_path, repeat):
+    """Load a ``Lexicon`` from a gzip-compressed LIFT file."""
+    return read_throughput(lift_path, ".gz", repeat)
+
+
+@benchmark(unit="MB/s")
+def lexicon_read_throughput_bz2(lift_path, repeat):
+    """Load a ``Lexicon`` from a bzip2-compressed LIFT file."""
+    return read_throughput(lift_path, ".bz2", repeat)
+
+
+@benchmark(unit="MB/s")
+def lexicon_read_throughput_xz(lift_path, repeat):
+    """Load a ``Lexicon`` from an xz-compressed LIFT file."""
+    return read_throughput(lift_path, ".xz", repeat)
+
+
+@benchmark(unit="MB/s")
+def lexicon_write_throughput(lift_path, repeat):
+    """Save a ``Lexicon`` as an uncompressed LIFT file, in MB of LIFT per
+    second."""
+    return write_throughput(lift_path, "", repeat)
+
+
+@benchmark(unit="MB/s")
+def lexicon_write_throughput_gz(lift_path, repeat):
+    """Save a ``Lexicon`` as a gzip-compressed LIFT file."""
+    return write_throughput(lift_path, ".gz", repeat)
+
+
+@benchmark(unit="MB/s")
+def lexicon_write_throughput_bz2(lift_path, repeat):
+    """Save a ``Lexicon`` as a bzip2-compressed LIFT file."""
+    return write_throughput(lift_path, ".bz2", repeat)
+
+
+@benchmark(unit="MB/s")
+def lexicon_write_throughput_xz(lift_path, repeat):
+    """Save a ``Lexicon`` as an xz-compressed LIFT file."""
+    return write_throughput(lift_path, ".xz", repeat)
+
+
+def read_throughput(lift_path, suffix, repeat):
+    """Return the MB of uncompressed LIFT loaded per second from a copy of
+    the LIFT file compressed as given by ``suffix``."""
+    lex = lexicon.Lexicon(lift_path)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / f"{lift_path.name}{suffix}"
+        lex.to_lift(path)
+        seconds = best_time(lambda: lexicon.Lexicon(path), repeat)
+        with utils.open_file(path) as f:
+            size = len(f.read())
+    return size / 1e6 / seconds
+
+
+def write_throughput(lift_path, suffix, repeat):
+    """Return the MB of uncompressed LIFT saved per second to a file
+    compressed as given by ``suffix``."""
+    lex = lexicon.Lexicon(lift_path)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / f"{lift_path.name}{suffix}"
+        seconds = best_time(lambda: lex.to_lift(path), repeat)
+        with utils.open_file(path) as f:
+            size = len(f.read())
+    return size / 1e6 / seconds
+
+
+@benchmark
+def lexicon_load_workers(lift_path, repeat):
+    """Load a ``Lexicon`` from file, building entries in one worker process
+    per CPU."""
+    workers = os.cpu_count()
+    return best_time(lambda: lexicon.Lexicon(lift_path, workers=workers), repeat)
+
+
+@benchmark
+def lexicon_load_many(lift_path, repeat):
+    """Load three copies of a LIFT file with ``Lexicon.load_many``, in one
+    worker process per CPU, up to three."""
+    return best_time(lambda: lexicon.Lexicon.load_many([lift_path] * 3), repeat)
+
+
+@benchmark
+def lexicon_load_snapshot(lift_path, repeat):
+    """Load a ``Lexicon`` from an up-to-date snapshot of its LIFT file."""
+    snapshot_path = lift_path.with_suffix(".snapshot")
+    lexicon.Lexicon(lift_path).save_snapshot(snapshot_path)
+    return best_time(lambda: lexicon.Lexicon.load_snapshot(snapshot_path), repeat)
+
+
+@benchmark
+def lexicon_refresh(lift_path, repeat):
+    """Refresh a loaded ``Lexicon`` from a new export of its LIFT file in
+    which one entry in 100 has changed."""
+    lex = lexicon.Lexicon(lift_path)
+    entries = list(lex.entry_items)
+    xml_tree = etree.parse(str(lift_path), config.XML_PARSER)
+    for elem in xml_tree.getroot().findall("entry")[::100]:
+        elem.set("dateModified", "2000-01-01T00:00:00Z")
+    export_path = lift_path.with_name(f"export{lift_path.suffix}")
+    xml_tree.write(str(export_path), encoding="UTF-8", xml_declaration=True)
+
+    def run():
+        lex.refresh(export_path)
+        # Put the original entries back for the next run.
+        lex.entry_items[:] = entries
+
+    return best_time(run, repeat)
+
+
+@benchmark
+def lexicon_refresh_search_index(lift_path, repeat):
+    """Refresh a loaded ``Lexicon`` with a search index of its glosses from a
+    new export of its LIFT file in which one entry in 100 has changed, then
+    search the glosses."""
+    lex = lexicon.Lexicon(lift_path, search_index=True)
+    lex.find_all("a")
+    entries = list(lex.entry_items)
+    search_index = lex._search_index
+    xml_tree = etree.parse(str(lift_path), config.XML_PARSER)
+    for elem in xml_tree.getroot().findall("entry")[::100]:
+        elem.set("dateModified", "2000-01-01T00:00:00Z")
+    export_path = lift_path.with_name(f"export{lift_path.suffix}")
+    xml_tree.write(str(export_path), encoding="UTF-8", xml_declaration=True)
+
+    def run():
+        lex.refresh(export_path)
+        lex.find_all("a")
+        # Put the original entries and index back for the next run.
+        lex.entry_items[:] = entries
+        lex._search_index = search_index
+
+    return best_time(run, repeat)
+
+
+@benchmark
+def lexicon_find_cawl(lift_path, repeat):
+    """Find the senses with each of 1700 CAWL numbers, as in
+    demos/update_glosses_by_cawl_num.py, including the time to build the
+    search index."""
+    lex = lexicon.Lexicon(lift_path)
+    cawls = [f"{n:04d}" for n in range(1, 1701)]
+
+    def run():
+        # Start each run without an index.
+        lex._search_index = None
+        for cawl in cawls:
+            lex.find_all(cawl, field="CAWL", match_type="exact")
+
+    return best_time(run, repeat)
+
+
+@benchmark
+def lexicon_find_many_cawl(lift_path, repeat):
+    """Find the senses with each of 1700 CAWL numbers in one call, including
+    the time to build the search index."""
+    lex = lexicon.Lexicon(lift_path)
+    cawls = [f"{n:04d}" for n in range(1, 1701)]
+
+    def run():
+        lex._search_index = None
+        lex.find_many(cawls, field="CAWL")
+
+    return best_time(run, repeat)
+
+
+@benchmark
+def lexicon_find_cawl_contains(lift_path, repeat):
+    """Find the senses whose CAWL numbers contain each of 1700 CAWL numbers,
+    using a search index, including the time to build it."""
+    lex = lexicon.Lexicon(lift_path, search_index=True)
+    cawls = [f"{n:04d}" for n in range(1, 1701)]
+
+    def run():
+        lex._search_index = None
+        for cawl in cawls:
+            lex.find_all(cawl, field="CAWL")
+
+    return best_time(run, repeat)
+
+
+@benchmark
+def lexicon_find_all_unindexed(lift_path, repeat):
+    """Find all senses whose gloss contains "a", and all those whose CAWL
+    number contains "1", by walking all entries and senses."""
+    lex = lexicon.Lexicon(lift_path)
+
+    def run():
+        lex.find_all("a")
+        lex.find_all("1", field="CAWL")
+
+    return best_time(run, repeat)
+
+
+@benchmark
+def lexicon_iter_find_first_page(lift_path, repeat):
+    """Load a lazy ``Lexicon`` and take the first 20 senses whose gloss
+    contains "a", which only builds the entries that are searched."""
+
+    def run():
+        lex = lexicon.Lexicon(lift_path, lazy=True)
+        list(islice(lex.iter_find("a"), 20))
+
+    return best_time(run, repeat)
+
+
+@benchmark
+def demo_lexical_units_from_lift(lift_path, repeat):
+    """Find the lexical unit of each of 1700 CAWL numbers while streaming
+    entries from file, as in demos/compare_cawls.py."""
+    cawls = [f"{n:04d}" for n in range(1, 1701)]
+    return best_time(lambda: demos.lexical_units_from_lift(lift_path, cawls), repeat)
+
+
+@benchmark(unit="B/entry")
+def lexicon_memory(lift_path, repeat):
+    """Measure the Python memory held by a loaded ``Lexicon``, per entry."""
+    lex, size = traced_size(lambda: lexicon.Lexicon(lift_path))
+    return size / len(lex.entry_items)
+
+
+@benchmark(unit="kB")
+def ranges_memory(lift_path, repeat):
+    """Measure the Python memory held by the ranges in the sango test data."""
+    xml_tree = etree.parse(str(SANGO_RANGES), config.XML_PARSER).getroot()
+    lex = lexicon.Lexicon(version=config.LIFT_VERSION_FIELDWORKS)
+
+    def run():
+        return [header.Range13(xml_tree=r, parent_item=lex) for r in xml_tree]
+
+    return traced_size(run)[1] / 1000
+
+
+@benchmark
+def ranges_load(lift_path, repeat):
+    """Parse the ranges in the sango test data with an empty ranges cache."""
+    return best_time(lambda: lexicon._load_ranges(SANGO_RANGES, {}), repeat)
+
+
+@benchmark
+def ranges_load_cached(lift_path, repeat):
+    """Get the ranges in the sango test data from the ranges cache."""
+    cache = dict()
+    lexicon._load_ranges(SANGO_RANGES, cache)
+    return best_time(lambda: lexicon._load_ranges(SANGO_RANGES, cache), repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--entries", type=int, default=1000)
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    parser.add_argument("names", nargs="*", metavar="BENCHMARK")
+    args = parser.parse_args()
+    for name in args.names:
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark: {name}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        lift_path = write_scaled_lift(LIFT_GOOD, Path(tmp), args.entries)
+        for name in args.names or BENCHMARKS.keys():
+            func, unit = BENCHMARKS[name]
+            value = func(lift_path, args.repeat)
+            print(f"{name:30}{value:10.3f} {unit}  ({args.entries} entries)")
+
+
+if __name__ == "__main__":
+    main()
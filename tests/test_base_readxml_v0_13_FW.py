@@ -1,8 +1,10 @@
+import pickle
 import unittest
 
 from lxml import etree
 
 from lift_utils import base, config
+from lift_utils.errors import AmbiguousTextError
 
 from . import DATA_PATH
 from .utils import test_class_properties, test_properties
@@ -115,6 +117,95 @@ class TestMultitextForm(unittest.TestCase):
         config.LIFT_VERSION = None
 
 
+class TestNodeBuilder(unittest.TestCase):
+    def setUp(self):
+        config.LIFT_VERSION = LIFT_VERSION
+
+    def build(self, xml):
+        root = base.Text("")
+        parser = etree.XMLParser(remove_blank_text=True, target=base.NodeBuilder(root))
+        self.assertIs(etree.fromstring(xml, parser), root)
+        return root
+
+    def test_same_as_tree(self):
+        for xml in (
+            "<text>  <span>a</span> </text>",
+            "<text>\n  <span>a</span>\n</text>",
+            "<text>a <span>b</span> <span>c</span></text>",
+            "<text><span>a</span> <span>b</span>c</text>",
+            "<text><span lang='en'> <span>a</span> </span></text>",
+            "<text xml:space='preserve'> <span>a</span> </text>",
+            "<text>a&amp;<!-- comment --> <span>b</span></text>",
+        ):
+            with self.subTest(xml=xml):
+                expected = base.Text(xml_tree=etree.fromstring(xml, config.XML_PARSER))
+                self.assertEqual(self.build(xml)._to_xml(), expected._to_xml())
+
+    def test_ambiguous_text(self):
+        with self.assertRaises(AmbiguousTextError):
+            self.build(
+                "<text><span>a</span>&apos;<span>b</span>  <span>c</span></text>"
+            )
+
+    def tearDown(self):
+        config.LIFT_VERSION = None
+
+
+class TestNodeSchema(unittest.TestCase):
+    def setUp(self):
+        config.LIFT_VERSION = LIFT_VERSION
+
+    def test_shared(self):
+        obj1 = base.Trait(name="name", value="value")
+        obj2 = base.Trait(name="name", value="value")
+        self.assertIs(obj1._schema, obj2._schema)
+        self.assertIs(obj1._schema.tag_classes["annotation"], base.Annotation)
+        with self.assertRaises(TypeError):
+            obj1._schema.tag_classes["annotation"] = base.Multitext
+
+    def test_version(self):
+        self.assertEqual(base.Field._get_schema("0.13").attributes_required, ("type",))
+        self.assertEqual(base.Field._get_schema("0.15").attributes_required, ("name",))
+
+    def test_py_names(self):
+        self.assertEqual(base.Field._get_schema("0.13").py_names["type"], "type")
+        self.assertEqual(base.Field._get_schema("0.15").py_names["name"], "name")
+        self.assertEqual(base.Field._get_schema("0.15").py_name("type"), "name")
+        self.assertEqual(base.URLRef._get_schema("0.13").py_names["label"], "label")
+        self.assertEqual(
+            base.Form._get_schema("0.13").py_names["annotation"], "annotation_items"
+        )
+
+    def tearDown(self):
+        config.LIFT_VERSION = None
+
+
+class TestNodeSlots(unittest.TestCase):
+    def setUp(self):
+        config.LIFT_VERSION = LIFT_VERSION
+        self.obj = base.Form(lang="en", text="text")
+
+    def test_no_dict(self):
+        self.assertFalse(hasattr(self.obj, "__dict__"))
+        self.assertFalse(hasattr(self.obj.lang, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.obj.unknown = None
+
+    def test_get_properties(self):
+        props = self.obj.get_properties()
+        self.assertEqual(props.get("lang"), "en")
+        self.assertIs(props.get("text"), self.obj.text)
+        self.assertNotIn("_schema", props)
+
+    def test_pickle(self):
+        obj = pickle.loads(pickle.dumps(self.obj))
+        self.assertIs(obj._schema, self.obj._schema)
+        self.assertEqual(obj._to_xml(), self.obj._to_xml())
+
+    def tearDown(self):
+        config.LIFT_VERSION = None
+
+
 class TestSpan(unittest.TestCase):
     def setUp(self):
         config.LIFT_VERSION = LIFT_VERSION
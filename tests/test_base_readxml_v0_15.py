@@ -100,7 +100,7 @@ class TestSpan(unittest.TestCase):
             self.obj._elements_required,
         ):
             test_properties(self, group, optional=False)
-        elements_optional = self.obj._elements_optional.copy()
+        elements_optional = set(self.obj._elements_optional)
         elements_optional.discard("span")  # hard to test optional nested element
         for group in (
             self.obj._attributes_optional,
@@ -130,7 +130,7 @@ class TestText(unittest.TestCase):
             self.obj._elements_required,
         ):
             test_properties(self, group, optional=False)
-        elements_optional = self.obj._elements_optional.copy()
+        elements_optional = set(self.obj._elements_optional)
         elements_optional.discard("span")  # already tested in TestSpan
         for group in (
             self.obj._attributes_optional,
@@ -81,7 +81,7 @@ class TestRange(unittest.TestCase):
             self.obj._elements_required,
         ):
             test_properties(self, group, optional=False)
-        elem_optional = self.obj._elements_optional.copy()
+        elem_optional = set(self.obj._elements_optional)
         elem_optional.discard("annotation")
         elem_optional.discard("field")
         elem_optional.discard("trait")
@@ -107,7 +107,7 @@ class TestRangeElement(unittest.TestCase):
             self.obj._elements_required,
         ):
             test_properties(self, group, optional=False)
-        elem_optional = self.obj._elements_optional.copy()
+        elem_optional = set(self.obj._elements_optional)
         elem_optional.discard("annotation")
         elem_optional.discard("field")
         elem_optional.discard("trait")
@@ -1,11 +1,19 @@
+import shutil
+import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from itertools import islice
+from pathlib import Path
 
 from lxml import etree
 
-from lift_utils import config, lexicon
+from lift_utils import base, config, datatypes, index, lexicon, utils
+from lift_utils.errors import InvalidExtensionError, InvalidSnapshotError
+from lift_utils.header import Range, Range13
 
 from . import DATA_PATH
-from .utils import test_class_properties
+from .utils import test_class_properties, write_scaled_lift
 
 LIFT_GOOD = str(DATA_PATH / "lexicon_good_v0.13_FW.lift")
 LIFT_VERSION = "0.13"
@@ -64,7 +72,9 @@ class TestExample(unittest.TestCase):
 class TestGrammaticalInfo(unittest.TestCase):
     def setUp(self):
         config.LIFT_VERSION = LIFT_VERSION
-        self.xml_tree = etree.parse(LIFT_GOOD).getroot().find(".//grammatical-info")  # noqa: E501
+        self.xml_tree = (
+            etree.parse(LIFT_GOOD).getroot().find(".//grammatical-info")
+        )  # noqa: E501
         self.obj = lexicon.GrammaticalInfo(xml_tree=self.xml_tree)
 
     def test_properties(self):
@@ -93,6 +103,762 @@ class TestLexicon(unittest.TestCase):
         config.LIFT_VERSION = None
 
 
+class TestLexiconIterEntries(unittest.TestCase):
+    def setUp(self):
+        config.LIFT_VERSION = LIFT_VERSION
+        self.obj = lexicon.Lexicon(path=LIFT_GOOD)
+        self.entries = list(lexicon.Lexicon.iter_entries(LIFT_GOOD))
+
+    def test_entries(self):
+        self.assertEqual(
+            [e.id for e in self.entries], [e.id for e in self.obj.entry_items]
+        )
+        self.assertEqual(self.entries[0]._to_xml(), self.obj.entry_items[0]._to_xml())
+
+    def test_header(self):
+        lex = self.entries[0].parent_item
+        self.assertIsInstance(lex, lexicon.Lexicon)
+        self.assertEqual(lex.version, self.obj.version)
+        self.assertIsNone(lex.entry_items)
+        self.assertEqual(
+            list(lex.get_range_elements("grammatical-info")),
+            list(self.obj.get_range_elements("grammatical-info")),
+        )
+
+    def tearDown(self):
+        config.LIFT_VERSION = None
+
+
+class TestLexiconLazy(unittest.TestCase):
+    def setUp(self):
+        config.LIFT_VERSION = LIFT_VERSION
+        self.obj = lexicon.Lexicon(path=LIFT_GOOD)
+        self.lazy = lexicon.Lexicon(path=LIFT_GOOD, lazy=True)
+
+    def test_entry_items(self):
+        self.assertIsInstance(self.lazy.entry_items, base.LazyItemList)
+        self.assertEqual(len(self.lazy.entry_items), len(self.obj.entry_items))
+        self.assertFalse(self.lazy.entry_items.is_built(0))
+        entry = self.lazy.entry_items[0]
+        self.assertTrue(self.lazy.entry_items.is_built(0))
+        self.assertIs(self.lazy.entry_items[0], entry)
+        self.assertIs(entry.parent_item, self.lazy)
+        self.assertEqual(entry._to_xml(), self.obj.entry_items[0]._to_xml())
+
+    def test_get_item_by_id(self):
+        self.assertIsNone(self.lazy.get_item_by_id("missing-id"))
+        self.assertFalse(self.lazy.entry_items.is_built(0))
+        refid = self.obj.entry_items[0].sense_items[1].id
+        item = self.lazy.get_item_by_id(refid)
+        self.assertIsInstance(item, lexicon.Sense)
+        self.assertEqual(item.id, refid)
+
+    def test_writing_systems(self):
+        self.assertEqual(
+            self.lazy.vernacular_writing_systems, self.obj.vernacular_writing_systems
+        )
+        self.assertEqual(
+            self.lazy.analysis_writing_systems, self.obj.analysis_writing_systems
+        )
+
+    def tearDown(self):
+        config.LIFT_VERSION = None
+
+
+class TestLexiconWorkers(unittest.TestCase):
+    def setUp(self):
+        config.LIFT_VERSION = LIFT_VERSION
+        self.obj = lexicon.Lexicon(path=LIFT_GOOD)
+        self.parallel = lexicon.Lexicon(path=LIFT_GOOD, workers=2)
+
+    def test_entry_items(self):
+        self.assertEqual(len(self.parallel.entry_items), len(self.obj.entry_items))
+        self.assertEqual(self.parallel._to_xml(), self.obj._to_xml())
+
+    def test_parent_items(self):
+        entry = self.parallel.entry_items[-1]
+        self.assertIs(entry.parent_item, self.parallel)
+        self.assertIs(entry._context, self.parallel._context)
+        sense = entry.sense_items[0]
+        self.assertIs(sense.parent_item, entry)
+        self.assertIs(sense._context, self.parallel._context)
+        self.assertIs(self.parallel.get_item_by_id(sense.id), sense)
+
+    def test_writing_systems(self):
+        self.assertEqual(
+            self.parallel.vernacular_writing_systems,
+            self.obj.vernacular_writing_systems,
+        )
+        self.assertEqual(
+            self.parallel.analysis_writing_systems,
+            self.obj.analysis_writing_systems,
+        )
+        # Entries are only unpickled on first access.
+        self.assertFalse(self.parallel.entry_items.is_built(0))
+
+    def test_keep_xml(self):
+        parallel = lexicon.Lexicon(path=LIFT_GOOD, workers=2, keep_xml=True)
+        expected = lexicon.Lexicon(path=LIFT_GOOD, keep_xml=True)
+        self.assertEqual(
+            [e._source_xml for e in parallel.entry_items],
+            [e._source_xml for e in expected.entry_items],
+        )
+
+    def tearDown(self):
+        config.LIFT_VERSION = None
+
+
+def count_entries(lex):
+    return len(lex.entry_items)
+
+
+def get_raw_range(lex, range_id):
+    for item in lex.header.ranges.range_items.iter_raw():
+        if item.get("id") == range_id:
+            return item
+
+
+class TestLexiconLoadMany(unittest.TestCase):
+    def setUp(self):
+        config.LIFT_VERSION = LIFT_VERSION
+        # Copy the test file and its ranges file to another folder.
+        self.tmp = tempfile.TemporaryDirectory()
+        src_path = Path(LIFT_GOOD)
+        copy_path = Path(self.tmp.name) / src_path.name
+        shutil.copyfile(src_path, copy_path)
+        ranges_path = src_path.with_suffix(".lift-ranges")
+        shutil.copyfile(ranges_path, copy_path.with_suffix(".lift-ranges"))
+        self.paths = [LIFT_GOOD, copy_path]
+        self.expected = lexicon.Lexicon(path=LIFT_GOOD)._to_xml()
+
+    def check_lexicons(self, lexicons):
+        # Ranges files with the same content are only parsed once.
+        raw_0, raw_1 = [get_raw_range(lex, "grammatical-info") for lex in lexicons]
+        self.assertIs(raw_0, raw_1)
+        self.assertEqual([lex._to_xml() for lex in lexicons], [self.expected] * 2)
+        ranges = [lex.header.ranges for lex in lexicons]
+        for range_0, range_1 in zip(ranges[0].range_items, ranges[1].range_items):
+            self.assertIsNot(range_0, range_1)
+            self.assertIs(range_0.parent_item, ranges[0])
+            self.assertIs(range_1.parent_item, ranges[1])
+
+    def test_lexicons(self):
+        lexicons = lexicon.Lexicon.load_many(self.paths, workers=2)
+        # Entries are sent back pickled, and unpickled on first access.
+        self.assertFalse(lexicons[1].entry_items.is_built(0))
+        self.check_lexicons(lexicons)
+        entry = lexicons[1].entry_items[0]
+        self.assertIs(entry.parent_item, lexicons[1])
+
+    def test_lexicons_serial(self):
+        self.check_lexicons(lexicon.Lexicon.load_many(self.paths, workers=1))
+
+    def test_func(self):
+        counts = lexicon.Lexicon.load_many(self.paths, func=count_entries, workers=2)
+        self.assertEqual(counts, [count_entries(lexicon.Lexicon(LIFT_GOOD))] * 2)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+        config.LIFT_VERSION = None
+
+
+class TestLexiconRangesCache(unittest.TestCase):
+    def setUp(self):
+        config.LIFT_VERSION = LIFT_VERSION
+        # Copy the test file and its ranges file to another folder.
+        self.tmp = tempfile.TemporaryDirectory()
+        src_path = Path(LIFT_GOOD)
+        self.path = Path(self.tmp.name) / src_path.name
+        shutil.copyfile(src_path, self.path)
+        self.ranges_path = self.path.with_suffix(".lift-ranges")
+        shutil.copyfile(src_path.with_suffix(".lift-ranges"), self.ranges_path)
+
+    def get_xml(self, lex):
+        return get_raw_range(lex, "grammatical-info")
+
+    def test_shared(self):
+        lex = lexicon.Lexicon(LIFT_GOOD)
+        other = lexicon.Lexicon(self.path)
+        self.assertIs(self.get_xml(other), self.get_xml(lex))
+        self.assertIsNot(
+            other.header.ranges.range_items[0], lex.header.ranges.range_items[0]
+        )
+        self.assertEqual(other.header.ranges._to_xml(), lex.header.ranges._to_xml())
+
+    def test_modified(self):
+        lex = lexicon.Lexicon(self.path)
+        text = self.ranges_path.read_text().replace("<text>", "<text>x", 1)
+        self.ranges_path.write_text(text)
+        other = lexicon.Lexicon(self.path)
+        self.assertIsNot(self.get_xml(other), self.get_xml(lex))
+        self.assertNotEqual(other.header.ranges._to_xml(), lex.header.ranges._to_xml())
+
+    def test_replaced(self):
+        digests = []
+        for i in range(3):
+            text = self.ranges_path.read_text().replace("<text>", "<text>x", 1)
+            self.ranges_path.write_text(text)
+            lexicon.Lexicon(self.path)
+            digests.append(lexicon._ranges_digest(self.ranges_path))
+        # Only the file's current content is kept.
+        for digest in digests[:-1]:
+            self.assertNotIn(digest, lexicon._RANGES_CACHE)
+        self.assertIn(digests[-1], lexicon._RANGES_CACHE)
+        self.assertEqual(
+            lexicon._RANGES_DIGESTS[str(self.ranges_path.resolve())][2], digests[-1]
+        )
+
+    def test_disabled(self):
+        config.RANGES_CACHE = False
+        lex = lexicon.Lexicon(LIFT_GOOD)
+        other = lexicon.Lexicon(LIFT_GOOD)
+        self.assertIsNot(self.get_xml(other), self.get_xml(lex))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+        config.RANGES_CACHE = True
+        config.LIFT_VERSION = None
+
+
+class TestLexiconLazyRanges(unittest.TestCase):
+    def setUp(self):
+        config.LIFT_VERSION = LIFT_VERSION
+        self.obj = lexicon.Lexicon(LIFT_GOOD)
+        self.range_items = self.obj.header.ranges.range_items
+
+    def test_unbuilt(self):
+        self.assertIsInstance(self.range_items, base.LazyItemList)
+        ids = list(self.obj.get_ranges())
+        element_ids = list(self.obj.get_range_elements("grammatical-info"))
+        self.assertGreater(len(element_ids), 1)
+        for i in range(len(self.range_items)):
+            self.assertFalse(self.range_items.is_built(i))
+        self.assertEqual(ids, [r.id for r in self.range_items])
+        self.assertEqual(
+            element_ids, list(self.obj.get_range_elements("grammatical-info"))
+        )
+
+    def test_built(self):
+        # The range's XML is from the ranges file, which has no href.
+        self.assertIsNone(get_raw_range(self.obj, "grammatical-info").get("href"))
+        i = list(self.obj.get_ranges()).index("grammatical-info")
+        _range = self.range_items[i]
+        self.assertIsInstance(_range, Range13)
+        self.assertIs(_range.parent_item, self.obj.header.ranges)
+        self.assertIn(".lift-ranges", _range.href)
+        self.assertGreater(len(_range.range_element_items), 1)
+        self.assertIs(self.range_items[i], _range)
+
+    def test_load_ranges_false(self):
+        obj = lexicon.Lexicon(LIFT_GOOD, load_ranges=False)
+        self.assertEqual(list(obj.get_ranges()), list(self.obj.get_ranges()))
+        self.assertEqual(list(obj.get_range_elements("grammatical-info")), [])
+        self.assertIsNotNone(obj.header.ranges.range_items[0].href)
+
+    def tearDown(self):
+        config.LIFT_VERSION = None
+
+
+class TestLexiconSnapshot(unittest.TestCase):
+    def setUp(self):
+        config.LIFT_VERSION = LIFT_VERSION
+        # Copy the test file and its ranges file to another folder.
+        self.tmp = tempfile.TemporaryDirectory()
+        src_path = Path(LIFT_GOOD)
+        self.path = Path(self.tmp.name) / src_path.name
+        shutil.copyfile(src_path, self.path)
+        self.ranges_path = self.path.with_suffix(".lift-ranges")
+        shutil.copyfile(src_path.with_suffix(".lift-ranges"), self.ranges_path)
+        self.snapshot_path = Path(self.tmp.name) / "lexicon.snapshot"
+        self.obj = lexicon.Lexicon(self.path)
+        self.obj.save_snapshot(self.snapshot_path)
+
+    def test_load(self):
+        snapshot = lexicon.Lexicon.load_snapshot(self.snapshot_path)
+        self.assertIsInstance(snapshot.entry_items, base.LazyItemList)
+        self.assertFalse(snapshot.entry_items.is_built(0))
+        self.assertEqual(snapshot.path, self.obj.path)
+        self.assertEqual(snapshot._to_xml(), self.obj._to_xml())
+        entry = snapshot.entry_items[0]
+        self.assertIs(entry.parent_item, snapshot)
+        self.assertIs(entry.sense_items[0].parent_item, entry)
+
+    def test_get_item_by_id(self):
+        snapshot = lexicon.Lexicon.load_snapshot(self.snapshot_path)
+        self.assertIsNone(snapshot.get_item_by_id("missing-id"))
+        self.assertFalse(snapshot.entry_items.is_built(0))
+        refid = self.obj.entry_items[0].sense_items[1].id
+        item = snapshot.get_item_by_id(refid)
+        self.assertIsInstance(item, lexicon.Sense)
+        self.assertEqual(item.id, refid)
+
+    def test_touched(self):
+        # A new modification time alone doesn't make the snapshot stale.
+        self.path.write_bytes(self.path.read_bytes())
+        mtime_ns = self.snapshot_path.stat().st_mtime_ns
+        snapshot = lexicon.Lexicon.load_snapshot(self.snapshot_path)
+        self.assertFalse(snapshot.entry_items.is_built(0))
+        self.assertEqual(self.snapshot_path.stat().st_mtime_ns, mtime_ns)
+
+    def test_modified(self):
+        text = self.path.read_text().replace("<text>", "<text>x", 1)
+        self.path.write_text(text)
+        snapshot = lexicon.Lexicon.load_snapshot(self.snapshot_path)
+        self.assertNotIsInstance(snapshot.entry_items, base.LazyItemList)
+        self.assertEqual(snapshot._to_xml(), lexicon.Lexicon(self.path)._to_xml())
+        # The snapshot has been saved again from the modified file.
+        other = lexicon.Lexicon.load_snapshot(self.snapshot_path)
+        self.assertIsInstance(other.entry_items, base.LazyItemList)
+        self.assertEqual(other._to_xml(), snapshot._to_xml())
+
+    def test_ranges_modified(self):
+        text = self.ranges_path.read_text().replace("<text>", "<text>x", 1)
+        self.ranges_path.write_text(text)
+        snapshot = lexicon.Lexicon.load_snapshot(self.snapshot_path)
+        self.assertNotIsInstance(snapshot.entry_items, base.LazyItemList)
+        self.assertNotEqual(
+            snapshot.header.ranges._to_xml(), self.obj.header.ranges._to_xml()
+        )
+
+    def test_invalid(self):
+        self.snapshot_path.write_bytes(b"<lift/>")
+        with self.assertRaises(InvalidSnapshotError):
+            lexicon.Lexicon.load_snapshot(self.snapshot_path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+        config.LIFT_VERSION = None
+
+
+class TestLexiconParserTarget(unittest.TestCase):
+    def setUp(self):
+        config.LIFT_VERSION = LIFT_VERSION
+        self.tmp = tempfile.TemporaryDirectory()
+        self.expected = lexicon.Lexicon(LIFT_GOOD)
+        self.obj = lexicon.Lexicon(LIFT_GOOD, parser_target=True)
+
+    def write_copy(self, old, new):
+        src_path = Path(LIFT_GOOD)
+        path = Path(self.tmp.name) / src_path.name
+        path.write_text(src_path.read_text().replace(old, new, 1))
+        ranges_path = src_path.with_suffix(".lift-ranges")
+        shutil.copyfile(ranges_path, path.with_suffix(".lift-ranges"))
+        return path
+
+    def test_same_as_tree(self):
+        self.assertTrue(base.NodeBuilder.can_build(LIFT_GOOD))
+        self.assertEqual(self.obj.version, self.expected.version)
+        self.assertEqual(self.obj._to_xml(), self.expected._to_xml())
+        self.assertEqual(
+            self.obj.header.ranges._to_xml(), self.expected.header.ranges._to_xml()
+        )
+        self.assertEqual(
+            self.obj.analysis_writing_systems, self.expected.analysis_writing_systems
+        )
+        self.assertEqual(
+            self.obj.vernacular_writing_systems,
+            self.expected.vernacular_writing_systems,
+        )
+
+    def test_parents(self):
+        entry = self.obj.entry_items[0]
+        self.assertIs(entry.parent_item, self.obj)
+        self.assertIs(entry.sense_items[0].parent_item, entry)
+        self.assertIs(self.obj.header.parent_item, self.obj)
+
+    def test_interned(self):
+        langs = [
+            g.lang
+            for e in self.obj.entry_items
+            for s in e.sense_items
+            for g in s.gloss_items
+            if g.lang == "en"
+        ]
+        self.assertGreater(len(langs), 1)
+        for lang in langs:
+            self.assertIs(lang, langs[0])
+
+    def test_fallback(self):
+        # Files with CDATA or blank character references go to the tree
+        # parser.
+        for new in ("<text><![CDATA[x]]>", "<text>&#32;"):
+            path = self.write_copy("<text>", new)
+            self.assertFalse(base.NodeBuilder.can_build(path))
+            lex = lexicon.Lexicon(path, parser_target=True)
+            self.assertEqual(lex._to_xml(), lexicon.Lexicon(path)._to_xml())
+
+    def test_ambiguous_text(self):
+        # Whether the blank text is kept depends on whether the quote was
+        # written as an entity, which the parser's events don't show.
+        path = self.write_copy(
+            "<text>", "<text><span>a</span>'<span>b</span>  <span>c</span>"
+        )
+        self.assertTrue(base.NodeBuilder.can_build(path))
+        lex = lexicon.Lexicon(path, parser_target=True)
+        self.assertEqual(lex._to_xml(), lexicon.Lexicon(path)._to_xml())
+
+    def tearDown(self):
+        self.tmp.cleanup()
+        config.LIFT_VERSION = None
+
+
+class TestLexiconSearchIndex(unittest.TestCase):
+    def setUp(self):
+        config.LIFT_VERSION = LIFT_VERSION
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = write_scaled_lift(LIFT_GOOD, self.tmp.name, 20)
+        self.obj = lexicon.Lexicon(self.path)
+        self.indexed = lexicon.Lexicon(self.path, search_index=True)
+
+    def get_ids(self, items):
+        return [(type(i), getattr(i, "id", None)) for i in items]
+
+    def test_find_all(self):
+        searches = (
+            ("0005", "CAWL", "exact"),
+            ("00", "CAWL", "contains"),
+            ("00[12]5", "CAWL", "regex"),
+            ("", "gloss", "contains"),
+            ("a", "lexical-unit", "contains"),
+            ("a", "definition", "contains"),
+            ("Nom", "grammatical-info", "exact"),
+            ("", "variant", "contains"),
+        )
+        for text, field, match_type in searches:
+            expected = self.obj.find_all(text, field=field, match_type=match_type)
+            found = self.indexed.find_all(text, field=field, match_type=match_type)
+            self.assertEqual(self.get_ids(found), self.get_ids(expected))
+            self.assertEqual(
+                self.get_ids([self.indexed.find(text, field, match_type)]),
+                self.get_ids([self.obj.find(text, field, match_type)]),
+            )
+        self.assertIsNone(self.indexed.find("none", field="CAWL"))
+
+    def test_find_many(self):
+        cawls = ["0001", "0002", "0040", "none"]
+        for match_type in ("exact", "contains", "regex"):
+            found = self.obj.find_many(cawls, field="CAWL", match_type=match_type)
+            self.assertEqual(list(found), cawls)
+            for cawl in cawls:
+                expected = self.obj.find_all(cawl, "CAWL", match_type=match_type)
+                self.assertEqual(self.get_ids(found[cawl]), self.get_ids(expected))
+        self.assertEqual(len(found["0002"]), 1)
+        self.assertEqual(found["none"], [])
+
+    def test_iter_find(self):
+        searches = (
+            ("0005", "CAWL", "exact"),
+            ("00[12]5", "CAWL", "regex"),
+            ("", "gloss", "contains"),
+            ("a", "lexical-unit", "contains"),
+            ("", "variant", "contains"),
+        )
+        for text, field, match_type in searches:
+            expected = self.obj.find_all(text, field=field, match_type=match_type)
+            for lex in (self.obj, self.indexed):
+                found = lex.iter_find(text, field=field, match_type=match_type)
+                self.assertNotIsInstance(found, list)
+                self.assertEqual(self.get_ids(found), self.get_ids(expected))
+        self.assertEqual(list(self.obj.iter_find("none", field="CAWL")), [])
+
+    def test_iter_find_early_stop(self):
+        lex = lexicon.Lexicon(self.path, lazy=True)
+        found = list(islice(lex.iter_find(field="gloss"), 2))
+        expected = self.obj.find_all(field="gloss")[:2]
+        self.assertEqual(self.get_ids(found), self.get_ids(expected))
+        # Entries after the matches haven't been searched, so aren't built.
+        self.assertTrue(lex.entry_items.is_built(0))
+        self.assertFalse(lex.entry_items.is_built(len(lex.entry_items) - 1))
+        self.assertIsNone(lex._search_index)
+
+    def test_modified(self):
+        self.assertEqual(self.indexed.find_all("new gloss"), [])
+        sense = self.indexed.entry_items[3].sense_items[0]
+        sense.add_gloss("en", "new gloss")
+        self.assertEqual(self.indexed.find_all("new gloss"), [sense])
+
+    def test_exact_modified(self):
+        # Exact searches use an index even without ``search_index``.
+        sense = self.obj.entry_items[3].sense_items[0]
+        searches = (
+            ("new gloss", "gloss", lambda: sense.add_gloss("en", "new gloss")),
+            (
+                "9999",
+                "CAWL",
+                lambda: sense.add_field("CAWL").set_form_items({"en": "9999"}),
+            ),
+            ("new def", "definition", lambda: sense.set_definition({"en": "new def"})),
+            ("Zzz", "grammatical-info", lambda: sense.set_grammatical_info("Zzz")),
+        )
+        for text, field, modify in searches:
+            self.assertIsNone(self.obj.find(text, field, "exact"))
+            self.assertIsNotNone(self.obj._search_index)
+            modify()
+            self.assertIs(self.obj.find(text, field, "exact"), sense)
+
+    def test_exact_entries_changed(self):
+        entry = self.obj.entry_items[3]
+        sense = entry.sense_items[0]
+        gloss = str(sense.gloss_items[0].text)
+        self.assertIn(sense, self.obj.find_all(gloss, match_type="exact"))
+        self.obj.entry_items.remove(entry)
+        self.assertNotIn(sense, self.obj.find_all(gloss, match_type="exact"))
+        self.obj.entry_items.append(entry)
+        self.assertIn(sense, self.obj.find_all(gloss, match_type="exact"))
+        self.obj.entry_items = self.obj.entry_items[:3]
+        self.assertNotIn(sense, self.obj.find_all(gloss, match_type="exact"))
+
+    def test_exact_text_replaced(self):
+        entry = self.obj.entry_items[0]
+        form = entry.lexical_unit.form_items[0]
+        old = str(form.text)
+        self.assertIs(self.obj.find(old, "lexical-unit", "exact"), entry)
+        form.text.pcdata = datatypes.PCData("YYY")
+        self.assertIs(self.obj.find("YYY", "lexical-unit", "exact"), entry)
+        form.text = "ZZZ"
+        self.assertIs(self.obj.find("ZZZ", "lexical-unit", "exact"), entry)
+        self.assertIs(self.obj.find("ZZZ", "lexical-unit", "contains"), entry)
+        self.assertIsNot(self.obj.find(old, "lexical-unit", "exact"), entry)
+
+    def test_exact_entry_replaced(self):
+        sense = self.obj.entry_items[3].sense_items[0]
+        gloss = str(sense.gloss_items[0].text)
+        self.assertIn(sense, self.obj.find_all(gloss, match_type="exact"))
+        self.obj.entry_items[3] = self.obj.entry_items[4]
+        self.assertNotIn(sense, self.obj.find_all(gloss, match_type="exact"))
+
+    def test_contains_not_indexed(self):
+        # An exact search's index isn't used for other searches unless
+        # ``search_index`` is ``True``.
+        self.obj.find("0001", "CAWL", "exact")
+        # An index without any values, as if "CAWL" weren't a header field.
+        self.obj._search_index["CAWL"] = index.FieldIndex(
+            self.obj.entry_items, "CAWL", []
+        )
+        self.assertNotEqual(self.obj.find_all("00", "CAWL"), [])
+        self.assertNotEqual(list(self.obj.iter_find("00", "CAWL")), [])
+
+    def test_exact_lazy(self):
+        lex = lexicon.Lexicon(self.path, lazy=True)
+        expected = self.obj.find("0001", "CAWL", "exact")
+        self.assertEqual(
+            self.get_ids([lex.find("0001", "CAWL", "exact")]), self.get_ids([expected])
+        )
+        # The search stopped at the first match, without indexing the field.
+        self.assertFalse(lex.entry_items.is_built(len(lex.entry_items) - 1))
+        self.assertIsNone(lex._search_index)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+        config.LIFT_VERSION = None
+
+
+class TestLexiconRefresh(unittest.TestCase):
+    def setUp(self):
+        config.LIFT_VERSION = LIFT_VERSION
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = write_scaled_lift(LIFT_GOOD, self.tmp.name, 4)
+        self.xml_tree = etree.parse(str(self.path), etree.XMLParser())
+        self.elements = self.xml_tree.getroot().findall("entry")
+
+    def export(self):
+        # Change the second entry, delete the third, and add a new one.
+        changed, deleted = self.elements[1], self.elements[2]
+        changed.set("dateModified", "2024-01-01T00:00:00Z")
+        changed.find("lexical-unit/form/text").text = "changed"
+        deleted.getparent().remove(deleted)
+        added = deepcopy(self.elements[0])
+        added.set("id", "added")
+        self.xml_tree.getroot().append(added)
+        self.xml_tree.write(str(self.path), encoding="UTF-8")
+
+    def check_refreshed(self, lex, old_entries):
+        entries = list(lex.entry_items)
+        self.assertEqual(len(entries), 4)
+        self.assertIs(entries[0], old_entries[0])
+        self.assertIsNot(entries[1], old_entries[1])
+        self.assertEqual(str(entries[1].lexical_unit), "changed (sg)")
+        self.assertIs(entries[2], old_entries[3])
+        self.assertEqual(entries[3].id, "added")
+        self.assertIs(entries[3].parent_item, lex)
+        self.assertEqual(lex._to_xml(), lexicon.Lexicon(self.path)._to_xml())
+
+    def test_refresh(self):
+        lex = lexicon.Lexicon(self.path)
+        old_entries = list(lex.entry_items)
+        self.export()
+        lex.refresh()
+        self.check_refreshed(lex, old_entries)
+
+    def test_lazy(self):
+        lex = lexicon.Lexicon(self.path, lazy=True)
+        lex.entry_items[0]
+        self.export()
+        lex.refresh()
+        # Unchanged entries that weren't built yet still aren't.
+        self.assertTrue(lex.entry_items.is_built(0))
+        self.assertFalse(lex.entry_items.is_built(2))
+        self.assertEqual(lex._to_xml(), lexicon.Lexicon(self.path)._to_xml())
+
+    def test_search_index(self):
+        lex = lexicon.Lexicon(self.path, search_index=True)
+        searches = (
+            ("", "gloss", "contains"),
+            ("changed", "lexical-unit", "contains"),
+            ("0001", "CAWL", "exact"),
+        )
+        for text, field, match_type in searches:
+            lex.find_all(text, field=field, match_type=match_type)
+        gloss_index = lex._search_index["gloss"]
+        self.export()
+        lex.refresh()
+        # The indexes are kept, and updated from the rebuilt entries.
+        self.assertEqual(set(lex._search_index), {"gloss", "lexical-unit", "CAWL"})
+        self.assertIsNot(lex._search_index["gloss"], gloss_index)
+        expected = lexicon.Lexicon(self.path)
+        for text, field, match_type in searches:
+            found = lex.find_all(text, field=field, match_type=match_type)
+            self.assertEqual(
+                [(type(i), str(i)) for i in found],
+                [(type(i), str(i)) for i in expected.find_all(text, field, match_type)],
+            )
+        self.assertEqual(len(lex.find_all("changed", "lexical-unit")), 1)
+
+    def test_without_date_modified(self):
+        for elem in self.elements:
+            del elem.attrib["dateModified"]
+        self.xml_tree.write(str(self.path), encoding="UTF-8")
+        lex = lexicon.Lexicon(self.path)
+        lex.refresh()
+        old_entries = list(lex.entry_items)
+        # The changed entry has a new dateModified, but the others are
+        # compared by their content.
+        self.export()
+        lex.refresh()
+        self.check_refreshed(lex, old_entries)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+        config.LIFT_VERSION = None
+
+
+class TestLexiconCompressed(unittest.TestCase):
+    def setUp(self):
+        config.LIFT_VERSION = LIFT_VERSION
+        self.tmp = tempfile.TemporaryDirectory()
+        self.obj = lexicon.Lexicon(LIFT_GOOD)
+        self.expected = self.obj._to_xml()
+
+    def test_round_trip(self):
+        for suffix in utils.COMPRESSION_OPENERS:
+            with self.subTest(suffix=suffix):
+                # Keep the file name that the ranges' href refers to.
+                path = Path(self.tmp.name) / f"{Path(LIFT_GOOD).name}{suffix}"
+                self.obj.to_lift(path)
+                ranges_path = path.with_name(f"{path.stem[:-5]}.lift-ranges{suffix}")
+                self.assertTrue(ranges_path.is_file())
+                with utils.open_file(path) as f:
+                    self.assertTrue(f.read().startswith(b"<?xml"))
+
+                self.assertEqual(lexicon.Lexicon(path)._to_xml(), self.expected)
+                lex = lexicon.Lexicon(path, parser_target=True)
+                self.assertEqual(lex._to_xml(), self.expected)
+                self.assertEqual(
+                    lex.header.ranges._to_xml(), self.obj.header.ranges._to_xml()
+                )
+                entries = list(lexicon.Lexicon.iter_entries(path))
+                self.assertEqual(len(entries), len(self.obj.entry_items))
+
+    def test_invalid_extension(self):
+        with self.assertRaises(InvalidExtensionError):
+            lexicon.Lexicon(Path(self.tmp.name) / "lexicon.txt.gz")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+        config.LIFT_VERSION = None
+
+
+class TestLexiconInterning(unittest.TestCase):
+    def setUp(self):
+        config.LIFT_VERSION = LIFT_VERSION
+        self.obj = lexicon.Lexicon(path=LIFT_GOOD)
+
+    def test_shared(self):
+        langs = [
+            g.lang
+            for e in self.obj.entry_items
+            for s in e.sense_items
+            for g in s.gloss_items
+            if g.lang == "en"
+        ]
+        self.assertGreater(len(langs), 1)
+        for lang in langs:
+            self.assertIs(lang, langs[0])
+        self.assertIsInstance(langs[0], datatypes.Lang)
+
+    def test_scoped(self):
+        other = lexicon.Lexicon(path=LIFT_GOOD)
+        lang = self.obj.entry_items[0].sense_items[0].gloss_items[0].lang
+        other_lang = other.entry_items[0].sense_items[0].gloss_items[0].lang
+        self.assertEqual(lang, other_lang)
+        self.assertIsNot(lang, other_lang)
+        # IDs aren't interned.
+        self.assertNotIn(
+            (datatypes.Key, self.obj.header.ranges.range_items[0].id),
+            self.obj._context._interned,
+        )
+
+    def tearDown(self):
+        config.LIFT_VERSION = None
+
+
+class TestLexiconMixedVersions(unittest.TestCase):
+    def setUp(self):
+        # Write a copy of the test file that declares LIFT v0.15.
+        self.tmp = tempfile.TemporaryDirectory()
+        src_path = Path(LIFT_GOOD)
+        text = src_path.read_text().replace('version="0.13"', 'version="0.15"', 1)
+        self.path_15 = Path(self.tmp.name) / src_path.name
+        self.path_15.write_text(text)
+        ranges_path = src_path.with_suffix(".lift-ranges")
+        shutil.copyfile(ranges_path, self.path_15.with_suffix(".lift-ranges"))
+
+    def test_interleaved(self):
+        lex_13 = lexicon.Lexicon(LIFT_GOOD)
+        lex_15 = lexicon.Lexicon(self.path_15)
+        self.assertEqual(lex_13.version, LIFT_VERSION)
+        self.assertEqual(lex_15.version, "0.15")
+        gloss_13 = lex_13.entry_items[0].sense_items[0].gloss_items[0]
+        gloss_15 = lex_15.entry_items[0].sense_items[0].gloss_items[0]
+        self.assertIs(type(gloss_13), base.Form)
+        self.assertIs(type(gloss_15), base.Gloss)
+        self.assertIs(lex_13.header.ranges.range_items[0].__class__, Range13)
+        self.assertIs(lex_15.header.ranges.range_items[0].__class__, Range)
+
+        # Nodes added later keep their lexicon's version.
+        self.assertIsNotNone(lex_13.add_entry().add_field("test").type)
+        self.assertIsNotNone(lex_15.add_entry().add_field("test").name)
+
+    def test_iter_entries_interleaved(self):
+        for entry_13, entry_15 in zip(
+            lexicon.Lexicon.iter_entries(LIFT_GOOD),
+            lexicon.Lexicon.iter_entries(self.path_15),
+        ):
+            self.assertEqual(entry_13._schema.version, LIFT_VERSION)
+            self.assertEqual(entry_15._schema.version, "0.15")
+
+    def test_threads(self):
+        paths = [LIFT_GOOD, self.path_15] * 4
+        expected = [lexicon.Lexicon(p)._to_xml() for p in paths]
+        with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+            lexicons = list(executor.map(lexicon.Lexicon, paths))
+        self.assertEqual([lex._to_xml() for lex in lexicons], expected)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+        config.LIFT_VERSION = None
+
+
 class TestNote(unittest.TestCase):
     def setUp(self):
         config.LIFT_VERSION = LIFT_VERSION
@@ -102,6 +868,12 @@ class TestNote(unittest.TestCase):
     def test_properties(self):
         test_class_properties(self)
 
+    def test_slots(self):
+        self.assertFalse(hasattr(self.obj, "__dict__"))
+        self.assertIsInstance(self.obj, base.Multitext)
+        self.assertIsInstance(self.obj, base.ExtensibleMixin)
+        self.assertIsNotNone(self.obj.date_created)
+
     def tearDown(self):
         config.LIFT_VERSION = None
 
@@ -109,7 +881,9 @@ class TestNote(unittest.TestCase):
 class TestPhonetic(unittest.TestCase):
     def setUp(self):
         config.LIFT_VERSION = LIFT_VERSION
-        self.xml_tree = etree.parse(LIFT_GOOD).getroot().find(".//pronunciation")  # noqa: E501
+        self.xml_tree = (
+            etree.parse(LIFT_GOOD).getroot().find(".//pronunciation")
+        )  # noqa: E501
         self.obj = lexicon.Phonetic(xml_tree=self.xml_tree)
 
     def test_properties(self):
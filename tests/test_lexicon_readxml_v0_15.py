@@ -2,7 +2,7 @@ import unittest
 
 from lxml import etree
 
-from lift_utils import config, lexicon
+from lift_utils import base, config, lexicon
 
 from . import DATA_PATH
 from .utils import test_class_properties
@@ -76,6 +76,70 @@ class TestLexicon(unittest.TestCase):
         config.LIFT_VERSION = None
 
 
+class TestLexiconIterEntries(unittest.TestCase):
+    def setUp(self):
+        config.LIFT_VERSION = LIFT_VERSION
+        self.obj = lexicon.Lexicon(path=LIFT_GOOD)
+        self.entries = list(lexicon.Lexicon.iter_entries(LIFT_GOOD))
+
+    def test_entries(self):
+        self.assertEqual(
+            [e.id for e in self.entries], [e.id for e in self.obj.entry_items]
+        )
+        self.assertEqual(
+            self.entries[0]._to_xml(), self.obj.entry_items[0]._to_xml()
+        )
+
+    def test_header(self):
+        lex = self.entries[0].parent_item
+        self.assertIsInstance(lex, lexicon.Lexicon)
+        self.assertEqual(lex.version, self.obj.version)
+        self.assertIsNone(lex.entry_items)
+        self.assertEqual(
+            list(lex.get_range_elements("grammatical-info")),
+            list(self.obj.get_range_elements("grammatical-info")),
+        )
+
+    def tearDown(self):
+        config.LIFT_VERSION = None
+
+
+class TestLexiconLazy(unittest.TestCase):
+    def setUp(self):
+        config.LIFT_VERSION = LIFT_VERSION
+        self.obj = lexicon.Lexicon(path=LIFT_GOOD)
+        self.lazy = lexicon.Lexicon(path=LIFT_GOOD, lazy=True)
+
+    def test_entry_items(self):
+        self.assertIsInstance(self.lazy.entry_items, base.LazyItemList)
+        self.assertEqual(len(self.lazy.entry_items), len(self.obj.entry_items))
+        self.assertFalse(self.lazy.entry_items.is_built(0))
+        entry = self.lazy.entry_items[0]
+        self.assertTrue(self.lazy.entry_items.is_built(0))
+        self.assertIs(self.lazy.entry_items[0], entry)
+        self.assertIs(entry.parent_item, self.lazy)
+        self.assertEqual(entry._to_xml(), self.obj.entry_items[0]._to_xml())
+
+    def test_get_item_by_id(self):
+        self.assertIsNone(self.lazy.get_item_by_id("missing-id"))
+        self.assertFalse(self.lazy.entry_items.is_built(0))
+        refid = self.obj.entry_items[0].sense_items[1].id
+        item = self.lazy.get_item_by_id(refid)
+        self.assertIsInstance(item, lexicon.Sense)
+        self.assertEqual(item.id, refid)
+
+    def test_writing_systems(self):
+        self.assertEqual(
+            self.lazy.vernacular_writing_systems, self.obj.vernacular_writing_systems
+        )
+        self.assertEqual(
+            self.lazy.analysis_writing_systems, self.obj.analysis_writing_systems
+        )
+
+    def tearDown(self):
+        config.LIFT_VERSION = None
+
+
 class TestNote(unittest.TestCase):
     def setUp(self):
         config.LIFT_VERSION = LIFT_VERSION
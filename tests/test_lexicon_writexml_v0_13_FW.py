@@ -1,7 +1,16 @@
+import contextlib
+import io
+import tempfile
 import unittest
+from pathlib import Path
+
+from lxml import etree
 
 from lift_utils import base, config, datatypes, lexicon, utils
 
+from . import DATA_PATH
+
+LIFT_GOOD = str(DATA_PATH / "lexicon_good_v0.13_FW.lift")
 LIFT_VERSION = "0.13"
 
 
@@ -216,6 +225,162 @@ class TestLexicon(unittest.TestCase):
         config.LIFT_VERSION = None
 
 
+class TestLexiconWriteXml(unittest.TestCase):
+    def setUp(self):
+        config.LIFT_VERSION = LIFT_VERSION
+        self.obj = lexicon.Lexicon(LIFT_GOOD)
+
+    def test_write_xml(self):
+        f = io.BytesIO()
+        self.obj._write_xml(f)
+        self.assertEqual(f.getvalue(), self.obj._to_xml().encode())
+
+    def test_print(self):
+        stdout = io.TextIOWrapper(io.BytesIO(), encoding="UTF-8")
+        with contextlib.redirect_stdout(stdout):
+            self.obj.print()
+        self.assertEqual(stdout.buffer.getvalue(), f"{self.obj._to_xml()}\n".encode())
+
+    def tearDown(self):
+        config.LIFT_VERSION = None
+
+
+class TestLexiconToLift(unittest.TestCase):
+    def setUp(self):
+        config.LIFT_VERSION = LIFT_VERSION
+        self.tmp = tempfile.TemporaryDirectory()
+        self.obj = lexicon.Lexicon(LIFT_GOOD)
+        self.path = Path(self.tmp.name) / Path(LIFT_GOOD).name
+
+    def get_expected_tree(self):
+        xml_tree = self.obj._to_xml_tree()
+        for _range in xml_tree.find("header/ranges"):
+            _range[:] = []
+            for attrib in _range.attrib.keys():
+                if attrib not in ["id", "href"]:
+                    del _range.attrib[attrib]
+        return xml_tree
+
+    def test_pretty_print(self):
+        self.obj.to_lift(self.path)
+        expected = utils.etree_to_xmlstring(self.get_expected_tree())
+        self.assertEqual(self.path.read_bytes(), expected.encode())
+        ranges = self.obj.header.ranges._to_xml_tree()
+        ranges.tag = "lift-ranges"
+        for _range in ranges:
+            del _range.attrib["href"]
+        self.assertEqual(
+            self.path.with_suffix(".lift-ranges").read_text(),
+            utils.etree_to_xmlstring(ranges),
+        )
+
+    def test_compact(self):
+        self.obj.to_lift(self.path, pretty_print=False)
+        expected = etree.tostring(
+            self.get_expected_tree(), encoding="UTF-8", xml_declaration=True
+        )
+        self.assertEqual(self.path.read_bytes(), expected)
+        self.assertEqual(lexicon.Lexicon(self.path)._to_xml(), self.obj._to_xml())
+
+    def test_unchanged_ranges(self):
+        self.obj.to_lift(self.path, pretty_print=False)
+        ranges_path = self.path.with_suffix(".lift-ranges")
+        compact_ranges = ranges_path.read_bytes()
+        obj = lexicon.Lexicon(self.path)
+        other_dir = Path(self.tmp.name) / "other"
+        other_dir.mkdir()
+        other_path = other_dir / self.path.name
+        # The ranges file is copied as it is, not rewritten.
+        obj.to_lift(other_path)
+        self.assertEqual(
+            other_path.with_suffix(".lift-ranges").read_bytes(), compact_ranges
+        )
+        obj.to_lift(other_path.with_suffix(".lift.gz"))
+        with utils.open_file(other_path.with_suffix(".lift-ranges.gz")) as f:
+            self.assertEqual(f.read(), compact_ranges)
+        mtime = ranges_path.stat().st_mtime_ns
+        obj.to_lift(self.path)
+        self.assertEqual(ranges_path.stat().st_mtime_ns, mtime)
+        # A built range may have been changed.
+        obj.header.ranges.range_items[0]
+        obj.to_lift(other_path)
+        self.assertNotEqual(
+            other_path.with_suffix(".lift-ranges").read_bytes(), compact_ranges
+        )
+
+    def test_ranges_not_loaded(self):
+        self.obj.to_lift(self.path)
+        ranges_path = self.path.with_suffix(".lift-ranges")
+        expected = ranges_path.read_bytes()
+        obj = lexicon.Lexicon(self.path, load_ranges=False)
+        # The ranges file is left alone, and copied as it is.
+        obj.to_lift(self.path)
+        self.assertEqual(ranges_path.read_bytes(), expected)
+        other_path = self.path.with_name(f"other-{self.path.name}")
+        obj.to_lift(other_path)
+        self.assertEqual(other_path.with_suffix(".lift-ranges").read_bytes(), expected)
+        self.assertEqual(lexicon.Lexicon(other_path)._to_xml(), self.obj._to_xml())
+
+    def test_workers(self):
+        self.obj.add_entry()
+        workers_path = self.path.with_name(f"workers-{self.path.name}")
+        for pretty_print in (True, False):
+            self.obj.to_lift(self.path, pretty_print)
+            self.obj.to_lift(workers_path, pretty_print, workers=2)
+            self.assertEqual(workers_path.read_bytes(), self.path.read_bytes())
+
+    def tearDown(self):
+        self.tmp.cleanup()
+        config.LIFT_VERSION = None
+
+
+class TestLexiconToLiftKeepXml(unittest.TestCase):
+    def setUp(self):
+        config.LIFT_VERSION = LIFT_VERSION
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / Path(LIFT_GOOD).name
+        xml_tree = etree.parse(str(LIFT_GOOD), config.XML_PARSER).getroot()
+        self.source_entries = [etree.tostring(e) for e in xml_tree.iter("entry")]
+
+    def get_saved_entries(self):
+        xml_tree = etree.parse(str(self.path), config.XML_PARSER).getroot()
+        return [etree.tostring(e) for e in xml_tree.iter("entry")]
+
+    def test_unmodified(self):
+        for lazy in (False, True):
+            obj = lexicon.Lexicon(LIFT_GOOD, lazy=lazy, keep_xml=True)
+            for pretty_print in (True, False):
+                obj.to_lift(self.path, pretty_print)
+                self.assertEqual(self.get_saved_entries(), self.source_entries)
+
+    def test_modified(self):
+        obj = lexicon.Lexicon(LIFT_GOOD, keep_xml=True)
+        entry = obj.entry_items[0]
+        self.assertIsNotNone(entry._source_xml)
+        sense = entry.sense_items[0]
+        sense.add_gloss("fr", "bonjour")
+        self.assertIsNone(entry._source_xml)
+        obj.to_lift(self.path)
+        saved = lexicon.Lexicon(self.path)
+        glosses = saved.entry_items[0].sense_items[0].gloss_items
+        self.assertEqual(str(glosses[-1]), "bonjour")
+
+    def test_direct_change(self):
+        obj = lexicon.Lexicon(LIFT_GOOD, keep_xml=True)
+        entry = obj.entry_items[0]
+        entry.lexical_unit = lexicon.Multitext({"en": "changed"})
+        obj.to_lift(self.path)
+        self.assertEqual(self.get_saved_entries(), self.source_entries)
+        entry.set_date_modified()
+        obj.to_lift(self.path)
+        saved = lexicon.Lexicon(self.path)
+        self.assertEqual(str(saved.entry_items[0].lexical_unit), "changed (en)")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+        config.LIFT_VERSION = None
+
+
 class TestNote(unittest.TestCase):
     def setUp(self):
         config.LIFT_VERSION = LIFT_VERSION
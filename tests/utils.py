@@ -1,10 +1,14 @@
+import shutil
+from copy import deepcopy
+from pathlib import Path
+
 from lxml import etree
 
 
 def test_attribs(test_cls, obj, attribs):
     for attrib in attribs:
         try:
-            test_cls.assertIsNotNone(obj.__dict__.get(attrib))
+            test_cls.assertIsNotNone(obj.get_properties().get(attrib))
         except AssertionError as e:
             raise Exception(f'"{attrib}" {str(e)}')
 
@@ -12,7 +16,7 @@ def test_attribs(test_cls, obj, attribs):
 def test_elems(test_cls, obj, elems):
     for elem in elems:
         try:
-            test_cls.assertIsNotNone(obj.__dict__.get(elem))
+            test_cls.assertIsNotNone(obj.get_properties().get(elem))
         except AssertionError as e:
             raise Exception(f'"{elem}" {str(e)}')
 
@@ -54,3 +58,34 @@ def get_props(props, prop_type="attributes", optional=False):
         return [k for k, v in props.get(prop_type).items() if not v[-1]]
     else:
         return [k for k, v in props.get(prop_type).items() if v[-1]]
+
+
+def write_scaled_lift(src_path, dest_dir, entries):
+    """Write a copy of a LIFT file whose first entry is repeated ``entries``
+    times, with unique entry and sense IDs and CAWL numbers. Its ranges file
+    is copied alongside. Return the path of the new LIFT file.
+    """
+    src_path = Path(src_path)
+    dest_dir = Path(dest_dir)
+    xml_tree = etree.parse(str(src_path), etree.XMLParser(remove_blank_text=True))
+    root = xml_tree.getroot()
+    template = root.find("entry")
+    root.remove(template)
+    for i in range(entries):
+        entry = deepcopy(template)
+        guid = f"{i:08d}-0000-4000-8000-000000000000"
+        entry.set("id", f"entry {i}_{guid}")
+        entry.set("guid", guid)
+        for j, sense in enumerate(entry.iterchildren("sense")):
+            sense.set("id", f"{i:08d}-{j:04d}-4000-8000-000000000000")
+            for field in sense.iterchildren("field"):
+                if field.get("type") == "CAWL":
+                    cawl = (len(template.findall("sense")) * i + j) % 1700 + 1
+                    field.find("form/text").text = f"{cawl:04d}"
+        root.append(entry)
+    dest_path = dest_dir / src_path.name
+    xml_tree.write(str(dest_path), encoding="UTF-8", xml_declaration=True)
+    ranges_path = src_path.with_suffix(".lift-ranges")
+    if ranges_path.is_file():
+        shutil.copyfile(ranges_path, dest_dir / ranges_path.name)
+    return dest_path